@@ -1,69 +1,130 @@
+"""
+df_eda tabanlı 3D CO2 globe'ları (plotly choropleth, orthographic projeksiyon).
+
+Import edildiğinde veri okunmaz ve dosya yazılmaz; plotly sadece globe üretilirken yüklenir.
+
+Kullanım:
+    python "3D görselleştirme.py" --metrics co2,co2_per_capita --year-min 2000
+    df_eda = load_globe_data(); make_3d_globes_batch(df_eda)
+"""
 
 import pandas as pd
-import plotly.express as px
+import numpy as np
+import argparse
 import os
+import sys
 
-# Veri setini yükle
-try:
-    df = pd.read_csv("Datasets/owid-co2-data.csv")
-except FileNotFoundError:
-    df = pd.read_csv("Nature-Pollution/Datasets/owid-co2-data.csv")
+from data_loader import load_owid
+from imputation import impute_by_group
+from html_export import write_streaming_html
 
-# df_eda hazırla - eksik değerleri doldur
-df_eda = df.sort_values(["country", "year"])
-cols_to_interpolate = ["co2", "co2_per_capita", "gdp", "population", "energy_per_capita"]
-cols_to_interpolate = [c for c in cols_to_interpolate if c in df_eda.columns]
+# Toplu modda işlenen metrikler
+GLOBE_METRICS = ["co2", "co2_per_capita", "co2_per_gdp"]
 
-def fill_group(group):
-    group[cols_to_interpolate] = group[cols_to_interpolate].interpolate(
-        method="linear", limit_direction="both"
-    )
-    return group
+# Globe için gereken sütunlar ve ülke içinde doldurulanlar
+GLOBE_COLUMNS = ["country", "iso_code", "year", "co2", "co2_per_capita", "co2_per_gdp", "gdp", "population", "energy_per_capita"]
+INTERPOLATE_COLUMNS = ["co2", "co2_per_capita", "co2_per_gdp", "gdp", "population", "energy_per_capita"]
 
-df_eda = df_eda.groupby("country", group_keys=False).apply(fill_group)
 
-def make_3d_globe_from_df_eda(
-    df_eda: pd.DataFrame,
-    metric: str = "co2_per_capita",
-    year_min: int = 1990,
-    year_max: int = 2024,
-    output_html: str = "img/co2_globe_df_eda.html",
-):
+def load_globe_data() -> pd.DataFrame:
+    """Veri setini yükler (sadece globe sütunları) ve df_eda'yı hazırlar: eksik değerler doldurulur."""
+    df = load_owid(columns=GLOBE_COLUMNS)
+    cols_to_interpolate = [c for c in INTERPOLATE_COLUMNS if c in df.columns]
+    return impute_by_group(df, cols_to_interpolate, mode="both")
+
+
+def is_headless() -> bool:
+    """Ekran yoksa (CI, sunucu) True; bu durumda fig.show() çağrılmaz."""
+    if os.environ.get("CI"):
+        return True
+    if sys.platform.startswith("linux"):
+        return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return False
+
+
+def _iso3_mask(iso: pd.Series) -> np.ndarray:
+    """Gerçek ülke satırları (ISO-3 kodlu); kategorik sütunda kontrol kategoriler üzerinde yapılır."""
+    if isinstance(iso.dtype, pd.CategoricalDtype):
+        valid = iso.cat.categories.astype(str).str.len().to_numpy() == 3
+        codes = iso.cat.codes.to_numpy()
+        return (codes >= 0) & valid[np.maximum(codes, 0)]
+    return (iso.notna() & (iso.astype(str).str.len() == 3)).to_numpy()
+
+
+def globe_rows(df_eda: pd.DataFrame, year_min: int, year_max: int) -> tuple[np.ndarray, np.ndarray]:
     """
-    3D globe visualization STRICTLY based on df_eda output.
-    - No fabricated years
-    - No fabricated countries
-    - Only real OWID country ISO codes
+    Globe'a girecek satırların konumları (yıl sırasında, yıl içinde panel sırası korunur) ve
+    her yılın [başlangıç, bitiş) aralığı. df_eda kopyalanmaz; sadece konum dizisi tutulur.
+
+    Dönüş: (positions, bounds) - bounds: (yıl, başlangıç, bitiş) satırları
     """
+    years = df_eda["year"].to_numpy()
+    mask = _iso3_mask(df_eda["iso_code"]) & (years >= year_min) & (years <= year_max)
+    positions = np.flatnonzero(mask)
+    positions = positions[np.argsort(years[positions], kind="stable")]
+
+    sorted_years = years[positions]
+    unique_years, starts = np.unique(sorted_years, return_index=True)
+    ends = np.append(starts[1:], len(positions))
+    return positions, np.column_stack([unique_years, starts, ends])
 
-    required = {"iso_code", "country", "year", metric}
-    missing = required - set(df_eda.columns)
-    if missing:
-        raise ValueError(f"Missing required columns: {missing}")
 
-    df_map = df_eda.copy()
+def iter_year_payloads(df_eda: pd.DataFrame, metric: str, positions: np.ndarray, bounds: np.ndarray):
+    """
+    Her yıl için (yıl, iso_code, country, değer) dizilerini sırayla üretir; sadece metriğin
+    gerçekten bulunduğu satırlar. Bellekte aynı anda tek bir yılın verisi bulunur.
+    """
+    values = df_eda[metric].to_numpy()
+    for year, start, end in bounds:
+        rows = positions[start:end]
+        rows = rows[~pd.isna(values[rows])]
+        if len(rows) == 0:
+            continue
+        yield (
+            int(year),
+            df_eda["iso_code"].iloc[rows].astype(str).to_numpy(),
+            df_eda["country"].iloc[rows].astype(str).to_numpy(),
+            values[rows].astype(np.float64),
+        )
 
-    # 1) Only real countries (ISO-3)
-    df_map = df_map[df_map["iso_code"].notna()]
-    df_map = df_map[df_map["iso_code"].astype(str).str.len() == 3]
 
-    # 2) Year window (NO creation of missing years)
-    df_map = df_map[df_map["year"].between(year_min, year_max)]
+def _choropleth_frame(metric: str, year: int, iso: np.ndarray, country: np.ndarray, values: np.ndarray) -> dict:
+    """px.choropleth(animation_frame="year") karesiyle aynı yapıda tek yıllık kare."""
+    return {
+        "name": str(year),
+        "data": [
+            {
+                "type": "choropleth",
+                "coloraxis": "coloraxis",
+                "geo": "geo",
+                "name": "",
+                "locations": iso,
+                "z": values,
+                "hovertext": country,
+                "hovertemplate": (
+                    f"<b>%{{hovertext}}</b><br><br>year={year}<br>iso_code=%{{location}}<br>{metric}=%{{z}}<extra></extra>"
+                ),
+            }
+        ],
+    }
 
-    # 3) Only rows where metric truly exists
-    df_map = df_map.dropna(subset=[metric])
 
-    print("3D Globe Coverage Check:")
-    print("Years:", df_map["year"].min(), "-", df_map["year"].max())
-    print("Countries:", df_map["country"].nunique())
+def _globe_layout(metric: str, years: list[int], value_range: tuple[float, float]) -> dict:
+    """
+    px.choropleth'in animasyon düzeni (slider, oynat/durdur, renk ekseni, başlık); her yıl için
+    tek satırlık küçük bir tablo üzerinden üretilir, renk aralığı tüm yıllar üzerindendir.
+    """
+    import plotly.express as px
 
+    stub = pd.DataFrame({"iso_code": "USA", "country": "", "year": years, metric: value_range[0]})
     fig = px.choropleth(
-        df_map,
+        stub,
         locations="iso_code",
         color=metric,
         hover_name="country",
         animation_frame="year",
         color_continuous_scale="Viridis",
+        range_color=value_range,
         title=(
             f"{metric} by Country (df_eda based)<br>"
             "<sup>Countries shown only where data exists</sup>"
@@ -83,22 +144,154 @@ def make_3d_globe_from_df_eda(
     fig.update_layout(
         margin=dict(l=0, r=0, t=70, b=0),
     )
+    return fig.layout.to_plotly_json()
+
+
+def _frame_summary() -> dict:
+    """Kareler akarken toplanan özet: yıllar, ülkeler, renk aralığı ve ilk karenin izleri."""
+    return {"years": [], "countries": set(), "min": np.inf, "max": -np.inf, "first": None}
+
+
+def _globe_frames(df_eda: pd.DataFrame, metric: str, positions: np.ndarray, bounds: np.ndarray, seen: dict):
+    """Yıl karelerini sırayla üretir ve seen özetini günceller."""
+    for year, iso, country, values in iter_year_payloads(df_eda, metric, positions, bounds):
+        seen["years"].append(year)
+        seen["countries"].update(country)
+        seen["min"] = min(seen["min"], float(values.min()))
+        seen["max"] = max(seen["max"], float(values.max()))
+        frame = _choropleth_frame(metric, year, iso, country, values)
+        if seen["first"] is None:
+            seen["first"] = frame["data"]
+        yield frame
+
+
+def _summary_figure(metric: str, seen: dict, year_min: int, year_max: int) -> tuple[list, dict]:
+    """Tüm kareler üretildikten sonra (data, layout): ilk karenin izleri ve animasyon düzeni."""
+    if not seen["years"]:
+        raise ValueError(f"No data for {metric} in {year_min}-{year_max}")
+    return seen["first"], _globe_layout(metric, seen["years"], (seen["min"], seen["max"]))
+
+
+def globe_figure(
+    df_eda: pd.DataFrame,
+    metric: str = "co2_per_capita",
+    year_min: int = 1990,
+    year_max: int = 2024,
+    rows: tuple[np.ndarray, np.ndarray] | None = None,
+) -> dict:
+    """
+    make_3d_globe_from_df_eda ile aynı figür, dosyaya yazmadan plotly figür sözlüğü olarak
+    ({"data", "layout", "frames"}); ör. bir servisin JSON yanıtı için.
+    """
+    if metric not in df_eda.columns:
+        raise ValueError(f"Missing required columns: {{{metric!r}}}")
+    positions, bounds = rows if rows is not None else globe_rows(df_eda, year_min, year_max)
+    seen = _frame_summary()
+    frames = list(_globe_frames(df_eda, metric, positions, bounds, seen))
+    data, layout = _summary_figure(metric, seen, year_min, year_max)
+    return {"data": data, "layout": layout, "frames": frames}
+
+
+def make_3d_globe_from_df_eda(
+    df_eda: pd.DataFrame,
+    metric: str = "co2_per_capita",
+    year_min: int = 1990,
+    year_max: int = 2024,
+    output_html: str = "img/co2_globe_df_eda.html",
+    show: bool | None = None,
+    rows: tuple[np.ndarray, np.ndarray] | None = None,
+):
+    """
+    3D globe visualization STRICTLY based on df_eda output.
+    - No fabricated years
+    - No fabricated countries
+    - Only real OWID country ISO codes
+
+    Kareler yıl yıl üretilip doğrudan HTML'e (ve .gz kopyasına) yazılır; tüm kareler bellekte
+    tutulmaz. plotly.js, çıktı dizininde paylaşılan yerel dosyadan yüklenir.
+
+    show : True ise tarayıcıda açılır (None -> sadece ekran varsa)
+    rows : globe_rows(df_eda, year_min, year_max) sonucu (toplu modda metrikler arasında paylaşılır)
+    """
+
+    required = {"iso_code", "country", "year", metric}
+    missing = required - set(df_eda.columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    positions, bounds = rows if rows is not None else globe_rows(df_eda, year_min, year_max)
+    seen = _frame_summary()
+
+    def build_figure():
+        return _summary_figure(metric, seen, year_min, year_max)
 
     os.makedirs(os.path.dirname(output_html), exist_ok=True)
-    fig.write_html(output_html)
-    fig.show()
+    frames = _globe_frames(df_eda, metric, positions, bounds, seen)
+    sizes = write_streaming_html(output_html, frames, build_figure)
+
+    print("3D Globe Coverage Check:")
+    print("Years:", seen["years"][0], "-", seen["years"][-1])
+    print("Countries:", len(seen["countries"]))
+
+    if show if show is not None else not is_headless():
+        import webbrowser
 
-    print(f"✅ 3D globe saved to: {output_html}")
+        webbrowser.open("file://" + os.path.abspath(output_html))
 
+    print(f"✅ 3D globe saved to: {output_html} ({sizes['frames']} frames, {sizes['html'] / 1024:,.0f} KB)")
 
-make_3d_globe_from_df_eda(
-    df_eda=df_eda,
-    metric="co2_per_capita",
-    year_min=1990,
-    year_max=2024,
-    output_html="img/co2_per_capita_globe_df_eda.html",
-)
+
+def make_3d_globes_batch(
+    df_eda: pd.DataFrame,
+    metrics: list[str] = GLOBE_METRICS,
+    year_min: int = 1990,
+    year_max: int = 2024,
+    output_dir: str = "img",
+    show: bool | None = False,
+) -> list[str]:
+    """
+    Birden çok metrik için globe HTML'lerini üretir. Satır seçimi (ISO-3 + yıl penceresi) bir
+    kez yapılır ve tüm metrikler tarafından paylaşılır; veri setinde olmayan metrikler atlanır.
+
+    Dönüş: yazılan HTML dosyaları
+    """
+    rows = globe_rows(df_eda, year_min, year_max)
+    outputs = []
+    for metric in metrics:
+        if metric not in df_eda.columns:
+            print(f"Skipping {metric}: not in dataset")
+            continue
+        output_html = os.path.join(output_dir, f"{metric}_globe_df_eda.html")
+        make_3d_globe_from_df_eda(df_eda, metric, year_min, year_max, output_html, show=show, rows=rows)
+        outputs.append(output_html)
+    return outputs
 
 
+def main(argv: list[str] | None = None) -> list[str]:
+    """Komut satırı girişi; argv None ise sys.argv kullanılır. Dönüş: yazılan HTML dosyaları."""
+    parser = argparse.ArgumentParser(description="df_eda based 3D CO2 globes")
+    parser.add_argument("--metrics", default=",".join(GLOBE_METRICS), help="comma-separated metrics to render")
+    parser.add_argument("--year-min", type=int, default=1990)
+    parser.add_argument("--year-max", type=int, default=2024)
+    parser.add_argument("--output-dir", default="img")
+    parser.add_argument(
+        "--show",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="open the globes in a browser (default: only when a display is available)",
+    )
+    args = parser.parse_args(argv)
+
+    df_eda = load_globe_data()
+    return make_3d_globes_batch(
+        df_eda=df_eda,
+        metrics=[m.strip() for m in args.metrics.split(",") if m.strip()],
+        year_min=args.year_min,
+        year_max=args.year_max,
+        output_dir=args.output_dir,
+        show=args.show,
+    )
 
 
+if __name__ == "__main__":
+    main()
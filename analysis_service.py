@@ -0,0 +1,421 @@
+"""
+Uzun omurlu analiz servisi: veri bir kez yuklenip doldurulur, indekslenmis panel bellekte
+tutulur ve tahmin / backtest / korelasyon / globe istekleri HTTP (veya Unix soketi) uzerinden
+JSON olarak yanitlanir.
+
+Uc noktalar (GET, parametreler query string ile):
+    /health                                   panel boyutu, calisma suresi
+    /stats                                    istek sayilari, onbellek isabetleri
+    /forecast?country=China                   predict_co2_multivariate (country yoksa global)
+    /forecast?country=China&interval=bootstrap&samples=1000&block=1&seed=0
+                                              bootstrap tahmin araliklari (varsayilan: analitik)
+    /backtest?origin_start=2005&origin_end=2020&max_horizon=6
+    /correlation?since=1990                   korelasyon matrisi
+    /drivers?country=India&method=spearman&window=20
+                                              co2-surucu korelasyonlari (window: kayan pencere)
+    /scenarios?target_years=2040,2050&reductions=0.5,0.9&country=Turkey
+                                              gereken yillik azaltim oranlari (country yoksa tumu)
+    /globe?metric=co2&year_min=1990&year_max=2024   plotly figur JSON'u
+
+Yanitlar (serilestirilmis govde) istek duzeyinde LRU onbellekte tutulur; ayni anda gelen
+ayni istekler tek hesaplamayi paylasir. Hesaplamalar tek bir arka plan thread'inde sirayla
+calisir; olay dongusu bu sirada onbellekten yanit vermeye devam eder.
+
+Doldurulmus panel varsayilan olarak panel deposuna (bkz. panel_store) bir kez yazilir; ayni
+makinedeki diger servis kopyalari doldurmayi tekrarlamaz ve paneli diskten eslenmis olarak
+paylasir.
+
+Kullanim:
+    python analysis_service.py --port 8765
+    python analysis_service.py --unix /tmp/co2.sock
+    python load_generator.py --url http://127.0.0.1:8765     # yuk testi
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from grouped_correlation import METHODS, NAN_POLICIES, group_corr, rolling_group_corr
+from panel_store import DEFAULT_STORE_DIR, PanelStore
+from scenarios import reduction_scenarios
+from script_import import import_script
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+CACHE_SIZE = 256
+MAX_HEADER_BYTES = 64 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """Istemci hatasi (HTTP 4xx)."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(obj):
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return None if not np.isfinite(obj) else float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"JSON'a cevrilemeyen tip: {type(obj).__name__}")
+
+
+def _finite(values) -> list:
+    """NaN / inf -> null (JSON'da gecerli degil)."""
+    return [None if v is None or not np.isfinite(v) else float(v) for v in np.asarray(values, dtype=np.float64)]
+
+
+def _int_param(params: dict, name: str, default: int) -> int:
+    value = params.get(name, default)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"{name} tamsayi olmali: {value!r}")
+
+
+class AnalysisService:
+    """
+    Bellekteki panel ve onbellekli uc nokta fonksiyonlari. HTTP katmanindan bagimsizdir;
+    handle(path, params) -> (durum kodu, JSON govde, onbellek isabeti).
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame | None = None,
+        cache_size: int = CACHE_SIZE,
+        backtest_jobs: int | None = 1,
+        panel_store: PanelStore | None = None,
+    ):
+        self.report = import_script("co2-data.py")
+        self.globe = import_script("3D görselleştirme.py")
+        self.backtest_jobs = backtest_jobs
+
+        t0 = time.perf_counter()
+        self.data = data if data is not None else self.report.load(columns=self.report.REPORT_COLUMNS)
+        with contextlib.redirect_stdout(io.StringIO()):  # veri kalitesi raporu servis logunu doldurmasin
+            eda = self.report._prepare_eda({"df": self.data, "panel_store": panel_store})
+        self.panel = eda["panel"]
+        self.df_eda = eda["df_eda"]
+        self._globe_rows: dict = {}
+        self.load_seconds = time.perf_counter() - t0
+        self.started = time.time()
+
+        self.routes = {
+            "/health": self.health,
+            "/stats": self.stats,
+            "/forecast": self.forecast,
+            "/backtest": self.backtest,
+            "/correlation": self.correlation,
+            "/drivers": self.drivers,
+            "/scenarios": self.scenarios,
+            "/globe": self.globe_json,
+        }
+        self.uncached = {"/health", "/stats"}
+        self.cache: OrderedDict = OrderedDict()
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.requests: dict = {}
+
+    # --- uc noktalar ---------------------------------------------------------------------
+
+    def health(self, params: dict) -> dict:
+        return {
+            "status": "ok",
+            "rows": len(self.panel),
+            "countries": len(self.panel.countries),
+            "years": [int(self.panel.years[0]), int(self.panel.years[-1])] if len(self.panel.years) else None,
+            "load_seconds": round(self.load_seconds, 3),
+            "uptime_seconds": round(time.time() - self.started, 1),
+        }
+
+    def stats(self, params: dict) -> dict:
+        return {
+            "requests": dict(self.requests),
+            "cache": {"entries": len(self.cache), "hits": self.hits, "misses": self.misses},
+            "model_store": self.report.MODEL_STORE.stats(),
+        }
+
+    def forecast(self, params: dict) -> dict:
+        country = params.get("country") or None
+        if country is not None and country not in self.panel:
+            raise RequestError(f"Bilinmeyen ulke: {country!r}", status=404)
+        interval = params.get("interval", "analytic")
+        if interval not in self.report.INTERVAL_MODES:
+            raise RequestError(f"interval {self.report.INTERVAL_MODES} icinden olmali: {interval!r}")
+        bootstrap = None
+        if interval == "bootstrap":
+            bootstrap = {
+                "n_boot": _int_param(params, "samples", 1000),
+                "block": _int_param(params, "block", 1),
+                "seed": _int_param(params, "seed", 0),
+                "jobs": self.backtest_jobs,
+            }
+            if bootstrap["n_boot"] < 2 or bootstrap["block"] < 1:
+                raise RequestError("samples >= 2 ve block >= 1 olmali")
+        with contextlib.redirect_stdout(io.StringIO()):
+            df_train, years, predictions, model, ci_lower, ci_upper = self.report.predict_co2_multivariate(
+                self.panel, country, interval=interval, bootstrap=bootstrap
+            )
+        if df_train is None:
+            raise RequestError(f"Yetersiz veri: {country or 'global'}", status=404)
+        return {
+            "country": country or "global",
+            "interval": interval,
+            "history": {"year": df_train["year"].astype(int).tolist(), "co2": _finite(df_train["co2"])},
+            "forecast": {
+                "year": [int(y) for y in years],
+                "co2": _finite(predictions),
+                "ci_lower": _finite(ci_lower),
+                "ci_upper": _finite(ci_upper),
+            },
+        }
+
+    def backtest(self, params: dict) -> dict:
+        origin_start = _int_param(params, "origin_start", 2005)
+        origin_end = _int_param(params, "origin_end", 2020)
+        max_horizon = _int_param(params, "max_horizon", 6)
+        if origin_end < origin_start or max_horizon < 1:
+            raise RequestError("origin_start <= origin_end ve max_horizon >= 1 olmali")
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = self.report.backtest_multivariate_time_safe(
+                self.data,
+                origins=range(origin_start, origin_end + 1),
+                horizons=range(1, max_horizon + 1),
+                max_workers=self.backtest_jobs,
+                output_path=None,
+            )
+        summary = results.groupby("horizon")[["rmse", "mae", "r2"]].mean() if not results.empty else pd.DataFrame()
+        return {
+            "folds": json.loads(results.to_json(orient="records")),
+            "by_horizon": json.loads(summary.reset_index().to_json(orient="records")),
+        }
+
+    def correlation(self, params: dict) -> dict:
+        since = _int_param(params, "since", 1990)
+        matrix = self.report.correlation_matrix(self.df_eda, since=since)
+        if matrix is None:
+            return {"since": since, "columns": [], "values": []}
+        return {"since": since, "columns": list(matrix.columns), "values": [_finite(row) for row in matrix.to_numpy()]}
+
+    def drivers(self, params: dict) -> dict:
+        method = params.get("method", "pearson")
+        nan_policy = params.get("nan_policy", "listwise")
+        if method not in METHODS or nan_policy not in NAN_POLICIES:
+            raise RequestError(f"method {METHODS}, nan_policy {NAN_POLICIES} icinden olmali")
+        country = params.get("country") or None
+        if country is not None and country not in self.panel:
+            raise RequestError(f"Bilinmeyen ulke: {country!r}", status=404)
+        countries = None if country is None else [country]
+        drivers = self.report.DRIVER_COLUMNS
+        if "window" in params:
+            window = _int_param(params, "window", 20)
+            if window < 2:
+                raise RequestError("window >= 2 olmali")
+            table = rolling_group_corr(self.panel, "co2", drivers, window, method, nan_policy, countries=countries)
+        else:
+            table = group_corr(self.panel, "co2", drivers, method, nan_policy, countries=countries)
+        return {"method": method, "nan_policy": nan_policy, "rows": json.loads(table.to_json(orient="records"))}
+
+    def scenarios(self, params: dict) -> dict:
+        current_year = _int_param(params, "current_year", 2024)
+        try:
+            target_years = [int(v) for v in str(params.get("target_years", "2050")).split(",")]
+            reductions = [float(v) for v in str(params.get("reductions", "0.5")).split(",")]
+        except ValueError:
+            raise RequestError("target_years tamsayi, reductions ondalik listesi olmali (virgulle ayrilmis)")
+        country = params.get("country") or None
+        if country is not None and country not in self.panel:
+            raise RequestError(f"Bilinmeyen ulke: {country!r}", status=404)
+        table = reduction_scenarios(self.panel, target_years, reductions, current_year, countries=None if country is None else [country])
+        return {"current_year": current_year, "rows": json.loads(table.to_json(orient="records"))}
+
+    def globe_json(self, params: dict) -> str:
+        metric = params.get("metric", "co2_per_capita")
+        if metric not in self.globe.GLOBE_METRICS or metric not in self.df_eda.columns:
+            raise RequestError(f"Desteklenmeyen metrik: {metric!r} (mevcut: {self.globe.GLOBE_METRICS})")
+        year_min = _int_param(params, "year_min", 1990)
+        year_max = _int_param(params, "year_max", 2024)
+
+        # Satir secimi (ISO-3 + yil penceresi) metrikler arasinda paylasilir
+        key = (year_min, year_max)
+        if key not in self._globe_rows:
+            self._globe_rows[key] = self.globe.globe_rows(self.df_eda, year_min, year_max)
+        try:
+            figure = self.globe.globe_figure(self.df_eda, metric, year_min, year_max, rows=self._globe_rows[key])
+        except ValueError as exc:
+            raise RequestError(str(exc), status=404)
+
+        import plotly.io as pio
+
+        return pio.json.to_json_plotly(figure)
+
+    # --- dagitim ve onbellek --------------------------------------------------------------
+
+    @staticmethod
+    def cache_key(path: str, params: dict) -> tuple:
+        return (path, tuple(sorted(params.items())))
+
+    def cached(self, key: tuple) -> bytes | None:
+        body = self.cache.get(key)
+        if body is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+        return body
+
+    def store(self, key: tuple, body: bytes) -> None:
+        self.misses += 1
+        self.cache[key] = body
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def compute(self, path: str, params: dict) -> tuple[int, bytes]:
+        """Uc noktayi calistirir ve yaniti serilestirir (onbellek disinda)."""
+        handler = self.routes.get(path)
+        if handler is None:
+            raise RequestError(f"Bilinmeyen uc nokta: {path} (mevcut: {sorted(self.routes)})", status=404)
+        result = handler(params)
+        body = result if isinstance(result, str) else json.dumps(result, default=_json_default)
+        return 200, body.encode("utf-8")
+
+
+class _HTTPServer:
+    """asyncio uzerinde minimal HTTP/1.1 (keep-alive, sadece GET) sunucu."""
+
+    def __init__(self, service: AnalysisService, log: bool = False):
+        self.service = service
+        self.log = log
+        # Hesaplamalar tek thread'de: model onbellegi ve matplotlib durumu paylasilmaz
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis")
+        self.inflight: dict = {}
+
+    async def respond(self, path: str, params: dict) -> tuple[int, bytes, str]:
+        service = self.service
+        service.requests[path] = service.requests.get(path, 0) + 1
+        if path in service.uncached:
+            return (*service.compute(path, params), "bypass")
+
+        key = service.cache_key(path, params)
+        body = service.cached(key)
+        if body is not None:
+            return 200, body, "hit"
+
+        # Ayni istek zaten hesaplaniyorsa sonucunu bekle
+        future = self.inflight.get(key)
+        if future is not None:
+            status, body = await asyncio.shield(future)
+            return status, body, "coalesced"
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, service.compute, path, params)
+        self.inflight[key] = future
+        try:
+            status, body = await future
+        finally:
+            del self.inflight[key]
+        service.store(key, body)
+        return status, body, "miss"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.send(writer, 400, json.dumps({"error": "istek basligi cok buyuk"}).encode(), "bypass", False)
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self.send(writer, 400, json.dumps({"error": "gecersiz istek satiri"}).encode(), "bypass", False)
+                    break
+                headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                t0 = time.perf_counter()
+                url = urlsplit(target)
+                if method != "GET":
+                    status, body, cache = 405, json.dumps({"error": "sadece GET"}).encode(), "bypass"
+                else:
+                    try:
+                        status, body, cache = await self.respond(url.path, dict(parse_qsl(url.query)))
+                    except RequestError as exc:
+                        status, body, cache = exc.status, json.dumps({"error": str(exc)}).encode(), "bypass"
+                    except Exception as exc:  # servis ayakta kalmali
+                        status, body, cache = 500, json.dumps({"error": f"{type(exc).__name__}: {exc}"}).encode(), "bypass"
+
+                await self.send(writer, status, body, cache, keep_alive)
+                if self.log:
+                    ms = (time.perf_counter() - t0) * 1000
+                    print(f"{method} {target} {status} {cache} {len(body)}B {ms:.1f}ms", file=sys.stderr)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def send(writer: asyncio.StreamWriter, status: int, body: bytes, cache: str, keep_alive: bool) -> None:
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"X-Cache: {cache}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(service: AnalysisService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix: str | None = None, log: bool = False) -> None:
+    """Servisi (TCP veya Unix soketi) durdurulana kadar calistirir."""
+    server = _HTTPServer(service, log=log)
+    if unix:
+        listener = await asyncio.start_unix_server(server.handle, path=unix, limit=MAX_HEADER_BYTES)
+        where = f"unix:{unix}"
+    else:
+        listener = await asyncio.start_server(server.handle, host, port, limit=MAX_HEADER_BYTES)
+        where = f"http://{host}:{port}"
+    print(f"Analysis service ready on {where} (panel: {len(service.panel)} rows, loaded in {service.load_seconds:.1f}s)", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="long-lived CO2 analysis service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="cached responses (LRU)")
+    parser.add_argument("--backtest-jobs", type=int, default=1, help="worker processes for /backtest")
+    parser.add_argument("--log", action="store_true", help="log each request to stderr")
+    parser.add_argument("--panel-dir", default=DEFAULT_STORE_DIR, help="memory-mapped store for the imputed panel (shared by replicas)")
+    parser.add_argument("--no-panel-store", action="store_true", help="impute the panel in memory instead")
+    args = parser.parse_args()
+
+    store = None if args.no_panel_store else PanelStore(args.panel_dir)
+    service = AnalysisService(cache_size=args.cache_size, backtest_jobs=args.backtest_jobs, panel_store=store)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(service, args.host, args.port, args.unix, args.log))
@@ -0,0 +1,468 @@
+"""
+Rapor ciktilari (img/ altindaki PNG'ler, metrics*.json / .csv) icin icerik adresli onbellek.
+
+Bir artifact'in anahtari, onu ureten fonksiyonun kod surumu, parametreleri ve girdi veri
+diliminin ozetinden olusur:
+
+    key = artifact_key("task:correlation", code_version(section_correlation), params, inputs)
+    entry = cache.get(key)
+    if entry is None:
+        ... uret ...
+        entry = cache.put(key, files={"img/correlation_matrix.png": path}, payload=..., meta=...)
+    else:
+        cache.restore(entry)            # dosya farkliysa / yoksa nesne deposundan kopyalanir
+
+- Dosya icerikleri objects/<ozet[:2]>/<ozet> altinda icerik ozetiyle saklanir; ayni icerik
+  birden fazla anahtar tarafindan paylasilir.
+- Anahtar kayitlari entries/<anahtar>.json'dur (uretici, kod surumu, parametreler, girdi
+  ozetleri, dosyalar); her kayit ayri dosya oldugundan paralel worker'lar kilitsiz yazar.
+  Kaydin mtime'i son kullanim zamanidir (get dokunur).
+- code_version: fonksiyonun ve ayni proje dizinindeki modullerden cagirdigi fonksiyonlarin
+  (gecisli) bytecode'u ile kullandigi JSON'a cevrilebilir sabitler (FEATURES gibi).
+- evict: yasi asan kayitlar, sonra boyut siniri asiliyorsa en eski kullanilanlar silinir;
+  hicbir kayda ait olmayan nesneler temizlenir.
+- Bu calismada uretilen / yeniden kullanilan ciktilarin kaynagi (provenance) manifest.json'a
+  yazilir (cikti yolu -> anahtar, uretici, girdiler, icerik ozeti, durum).
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+import types
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = ".cache/artifacts"
+DEFAULT_MAX_BYTES = 512 * 2**20
+DEFAULT_MAX_AGE_DAYS = 30.0
+MANIFEST_NAME = "manifest.json"
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bu process'te kaydedilen kaynak bilgileri (worker'lardan ana process'e tasinir)
+_RECORDS: list = []
+
+
+# --- ozetler ---------------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=None)
+def library_versions(packages: tuple = ("numpy", "pandas", "scikit-learn", "matplotlib", "seaborn")) -> str:
+    """Kutuphane surumleri (anahtarlara eklenir: surum degisirse ciktilar yeniden uretilir)."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions = []
+    for package in packages:
+        try:
+            versions.append(f"{package}={version(package)}")
+        except PackageNotFoundError:
+            versions.append(f"{package}=-")
+    return ",".join(versions)
+
+
+def _update_hash(h, value) -> None:
+    if isinstance(value, pd.DataFrame):
+        h.update(b"frame")
+        h.update(repr([(str(c), str(t)) for c, t in value.dtypes.items()]).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(f"series:{value.name}:{value.dtype}".encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        arr = np.ascontiguousarray(value)
+        h.update(f"array:{arr.dtype}:{arr.shape}".encode())
+        h.update(arr.tobytes() if arr.dtype != object else repr(arr.tolist()).encode())
+    elif isinstance(value, dict):
+        h.update(b"dict")
+        for key in sorted(value, key=str):
+            h.update(repr(key).encode())
+            _update_hash(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        h.update(f"seq:{len(value)}".encode())
+        for item in value:
+            _update_hash(h, item)
+    else:
+        h.update(f"{type(value).__name__}:{value!r}".encode())
+
+
+def fingerprint(*values) -> str:
+    """Degerlerin (DataFrame, Series, ndarray, dict / list / skaler) icerik ozeti."""
+    h = hashlib.blake2b(digest_size=16)
+    for value in values:
+        _update_hash(h, value)
+    return h.hexdigest()
+
+
+def _is_project_module(module) -> bool:
+    path = getattr(module, "__file__", None)
+    return path is not None and os.path.dirname(os.path.abspath(path)) == _PROJECT_DIR
+
+
+def _is_project(obj) -> bool:
+    return _is_project_module(sys.modules.get(getattr(obj, "__module__", None) or ""))
+
+
+def _code_objects(code: types.CodeType):
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_objects(const)
+
+
+def _update_code_hash(h, code: types.CodeType) -> None:
+    """Bytecode, adlar ve sabitler; satir numaralari / dosya yolu haric (kod kaymasi anahtari bozmaz)."""
+    h.update(code.co_code)
+    h.update(repr((code.co_names, code.co_varnames, code.co_freevars, code.co_argcount, code.co_kwonlyargcount)).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code_hash(h, const)
+        elif isinstance(const, frozenset):
+            h.update(repr(sorted(map(repr, const))).encode())
+        else:
+            h.update(repr(const).encode())
+
+
+def _referenced(fn) -> list:
+    """Fonksiyonun global adlarla eristigi proje fonksiyonlari / siniflari ve sabitleri."""
+    names = sorted({name for code in _code_objects(fn.__code__) for name in code.co_names})
+    found = []
+    for name in names:
+        if name not in fn.__globals__:
+            continue
+        value = fn.__globals__[name]
+        if isinstance(value, functools.partial):
+            value = value.func
+        if isinstance(value, types.ModuleType):
+            # modul.fonksiyon erisimleri (ornegin instrumentation.extend)
+            if _is_project_module(value):
+                found.extend(getattr(value, n) for n in names if inspect.isfunction(getattr(value, n, None)))
+        elif inspect.isfunction(value) or inspect.isclass(value):
+            if _is_project(value):
+                found.append(value)
+        elif name.isupper() and not name.startswith("_"):
+            try:
+                found.append((name, json.dumps(value, sort_keys=True, default=_reject)))
+            except TypeError:
+                pass
+    return found
+
+
+def _stable_repr(value) -> str:
+    """Varsayilan argumanlar icin: bellek adresi iceren repr'ler yerine tip adi."""
+    text = repr(value)
+    return type(value).__qualname__ if " at 0x" in text else text
+
+
+def _reject(value):
+    raise TypeError(type(value).__name__)
+
+
+def _functions(obj) -> list:
+    if inspect.isclass(obj):
+        return [f for _, f in sorted(vars(obj).items()) if inspect.isfunction(f)]
+    return [obj]
+
+
+def code_version(*objects) -> str:
+    """
+    Fonksiyon / siniflarin kod surumu: kendileri ve proje modullerinden gecisli olarak
+    eristikleri fonksiyonlarin bytecode'u + kullandiklari BUYUK_HARFLI sabitler.
+    Proje disi nesneler (ornegin pd.DataFrame) yok sayilir.
+    """
+    return _code_version(tuple(obj for obj in objects if _is_project(obj)))
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version(objects: tuple) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    seen, stack = set(), [f for obj in objects for f in _functions(obj)]
+    while stack:
+        fn = stack.pop()
+        if id(fn) in seen:
+            continue
+        seen.add(id(fn))
+        h.update(fn.__qualname__.encode())  # modul adi degil: betik __main__ veya import ile calisabilir
+        _update_code_hash(h, fn.__code__)
+        h.update(json.dumps([fn.__defaults__, fn.__kwdefaults__], sort_keys=True, default=_stable_repr).encode())
+        for ref in _referenced(fn):
+            if isinstance(ref, tuple):
+                h.update(f"{ref[0]}={ref[1]}".encode())
+            else:
+                stack.extend(_functions(ref))
+    return h.hexdigest()
+
+
+def artifact_key(producer: str, code: str, params=None, inputs=None) -> str:
+    """Uretici adi, kod surumu, parametreler ve girdi ozetlerinden anahtar."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{producer}\0{code}\0{library_versions()}\0".encode())
+    _update_hash(h, params)
+    _update_hash(h, inputs)
+    return h.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# --- kaynak (provenance) kayitlari -----------------------------------------------------------
+
+
+def record(path: str, entry: dict, status: str) -> None:
+    """Bu calismada path'in hangi kayittan geldigini not eder (status: produced / reused / restored)."""
+    _RECORDS.append(
+        {
+            "path": path,
+            "status": status,
+            "key": entry["key"],
+            "producer": entry["producer"],
+            "code_version": entry["code_version"],
+            "params": entry["params"],
+            "inputs": entry["inputs"],
+            "hash": entry["files"][path]["hash"],
+            "size": entry["files"][path]["size"],
+            "created": entry["created"],
+            "time": time.time(),
+        }
+    )
+
+
+def take_records() -> list[dict]:
+    """Kayitlari dondurur ve listeyi bosaltir (worker -> ana process)."""
+    records = list(_RECORDS)
+    _RECORDS.clear()
+    return records
+
+
+def extend_records(records: list[dict]) -> None:
+    """Worker'lardan gelen kayitlari ekler."""
+    _RECORDS.extend(records)
+
+
+# --- depo ------------------------------------------------------------------------------
+
+
+class ArtifactCache:
+    """
+    Icerik adresli artifact deposu (bkz. modul aciklamasi).
+
+    root: depo dizini (objects/, entries/, manifest.json)
+    """
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR):
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.root, "entries", f"{key}.json")
+
+    def _store_object(self, source: str | None = None, data: bytes | None = None) -> tuple[str, int]:
+        """Dosyayi veya baytlari nesne deposuna ekler (varsa dokunulmaz); (ozet, boyut) dondurur."""
+        if data is not None:
+            digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+            size = len(data)
+        else:
+            digest = file_digest(source)
+            size = os.path.getsize(source)
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            if data is not None:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+            else:
+                shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, path)
+        return digest, size
+
+    def get(self, key: str) -> dict | None:
+        """Kaydi dondurur (nesneleri eksikse None); son kullanim zamani guncellenir."""
+        path = self._entry_path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        objects = [info["hash"] for info in entry["files"].values()] + ([entry["payload"]] if entry.get("payload") else [])
+        if not all(os.path.exists(self._object_path(digest)) for digest in objects):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, producer: str, code: str, files: dict | None = None, payload=None, params=None, inputs=None) -> dict:
+        """
+        Ciktilari depoya ekler ve kaydi yazar.
+
+        files   : cikti yolu -> uretilen dosya (genelde ayni yol)
+        payload : dosya olmayan sonuc (ornegin yakalanan stdout); pickle ile saklanir
+        """
+        stored = {}
+        for path, source in (files or {}).items():
+            digest, size = self._store_object(source=source)
+            stored[path] = {"hash": digest, "size": size}
+        payload_hash = None
+        if payload is not None:
+            payload_hash, _ = self._store_object(data=pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+        entry = {
+            "key": key,
+            "producer": producer,
+            "code_version": code,
+            "params": params,
+            "inputs": inputs,
+            "files": stored,
+            "payload": payload_hash,
+            "created": time.time(),
+        }
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_path, path)
+        return entry
+
+    def load_payload(self, entry: dict):
+        if not entry.get("payload"):
+            return None
+        with open(self._object_path(entry["payload"]), "rb") as f:
+            return pickle.load(f)
+
+    def restore(self, entry: dict) -> dict:
+        """
+        Kayittaki dosyalari yerine koyar: mevcut dosyanin icerigi ayniysa dokunulmaz, yoksa /
+        farkliysa nesne deposundan kopyalanir. Donus: yol -> "reused" | "restored".
+        """
+        status = {}
+        for path, info in entry["files"].items():
+            if os.path.exists(path) and os.path.getsize(path) == info["size"] and file_digest(path) == info["hash"]:
+                status[path] = "reused"
+                continue
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            shutil.copyfile(self._object_path(info["hash"]), tmp_path)
+            os.replace(tmp_path, path)
+            status[path] = "restored"
+        return status
+
+    # --- boyut / tahliye ------------------------------------------------------------------
+
+    def _entries(self) -> list[tuple[str, float, dict]]:
+        directory = os.path.join(self.root, "entries")
+        entries = []
+        if not os.path.isdir(directory):
+            return entries
+        for name in os.listdir(directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path) as f:
+                    entries.append((path, os.path.getmtime(path), json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def _objects(self) -> dict:
+        """nesne ozeti -> (yol, boyut)"""
+        directory = os.path.join(self.root, "objects")
+        objects = {}
+        if not os.path.isdir(directory):
+            return objects
+        for prefix in os.listdir(directory):
+            for name in os.listdir(os.path.join(directory, prefix)):
+                path = os.path.join(directory, prefix, name)
+                if ".tmp-" not in name:
+                    objects[name] = (path, os.path.getsize(path))
+        return objects
+
+    def stats(self) -> dict:
+        objects = self._objects()
+        return {
+            "entries": len(self._entries()),
+            "objects": len(objects),
+            "bytes": sum(size for _, size in objects.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def evict(self, max_bytes: int | None = DEFAULT_MAX_BYTES, max_age_days: float | None = DEFAULT_MAX_AGE_DAYS) -> dict:
+        """
+        Son kullanimi max_age_days'ten eski kayitlari, sonra toplam nesne boyutu max_bytes'i
+        asiyorsa en eski kullanilanlari siler; sahipsiz nesneleri temizler.
+        Donus: {"entries": silinen kayit, "objects": silinen nesne, "bytes": bosaltilan bayt}
+        """
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        objects = self._objects()
+        removed_entries = 0
+
+        def refs(entry: dict) -> set:
+            digests = {info["hash"] for info in entry["files"].values()}
+            return digests | ({entry["payload"]} if entry.get("payload") else set())
+
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            while entries and entries[0][1] < cutoff:
+                os.remove(entries.pop(0)[0])
+                removed_entries += 1
+
+        if max_bytes is not None:
+            live = {d for _, _, e in entries for d in refs(e)}
+            total = sum(objects[d][1] for d in live if d in objects)
+            while entries and total > max_bytes:
+                path, _, entry = entries.pop(0)
+                os.remove(path)
+                removed_entries += 1
+                still_used = {d for _, _, e in entries for d in refs(e)}
+                total -= sum(objects[d][1] for d in refs(entry) - still_used if d in objects)
+
+        live = {d for _, _, e in entries for d in refs(e)}
+        removed_objects = removed_bytes = 0
+        for digest, (path, size) in objects.items():
+            if digest not in live:
+                os.remove(path)
+                removed_objects += 1
+                removed_bytes += size
+        return {"entries": removed_entries, "objects": removed_objects, "bytes": removed_bytes}
+
+    # --- manifest -------------------------------------------------------------------------
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_NAME)
+
+    def write_manifest(self, records: list[dict]) -> None:
+        """Cikti yolu -> son kaynak kaydi; onceki manifest'teki diger ciktilar korunur."""
+        manifest = {}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                manifest = {}
+        for rec in records:
+            manifest[rec["path"]] = rec
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True, default=str)
+        os.replace(tmp_path, self.manifest_path)
@@ -0,0 +1,146 @@
+"""
+Yigin (batch) halindeki kucuk en kucuk kareler problemlerini NumPy ile tek seferde cozer.
+
+Her ulke icin ayri bir sklearn LinearRegression fit etmek yerine, ulkelerin tasarim
+matrisleri (B, n, p) seklinde bir yigina doldurulur (gecersiz satirlar maske ile
+disarida birakilir) ve tum problemler tek bir toplu pseudo-inverse ile cozulur.
+
+LinearRegression(fit_intercept=True) ile ayni cozum: X ve y maskeli ortalamalarla
+merkezlenir, katsayilar minimum-norm en kucuk kareler cozumudur.
+"""
+
+import numpy as np
+
+
+def fit_ols_batched(
+    X: np.ndarray,
+    y: np.ndarray,
+    mask: np.ndarray | None = None,
+    fit_intercept: bool = True,
+    rcond: float | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    X    : (B, n, p) tasarim matrisleri
+    y    : (B, n) hedefler
+    mask : (B, n) bool, True = satir fit'e dahil (None -> tumu)
+
+    Donus: coef (B, p), intercept (B,)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if mask is None:
+        mask = np.ones(y.shape, dtype=bool)
+
+    w = mask.astype(np.float64)
+    count = np.maximum(w.sum(axis=1), 1.0)
+
+    X = np.where(mask[..., None], X, 0.0)
+    y = np.where(mask, y, 0.0)
+
+    if fit_intercept:
+        X_mean = X.sum(axis=1) / count[:, None]
+        y_mean = y.sum(axis=1) / count
+        X = np.where(mask[..., None], X - X_mean[:, None, :], 0.0)
+        y = np.where(mask, y - y_mean[:, None], 0.0)
+    else:
+        X_mean = np.zeros(X.shape[::2])
+        y_mean = np.zeros(len(y))
+
+    if rcond is None:
+        rcond = np.finfo(np.float64).eps
+
+    coef = np.matmul(np.linalg.pinv(X, rcond=rcond), y[..., None])[..., 0]
+    intercept = y_mean - np.einsum("bp,bp->b", X_mean, coef)
+    return coef, intercept
+
+
+def predict_batched(X: np.ndarray, coef: np.ndarray, intercept: np.ndarray) -> np.ndarray:
+    """X (B, m, p) icin tahminler (B, m)."""
+    return np.einsum("bmp,bp->bm", np.asarray(X, dtype=np.float64), coef) + intercept[:, None]
+
+
+def stack_groups(
+    values: np.ndarray, group_codes: np.ndarray, n_groups: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gruplara gore sirali (n, ...) diziyi (n_groups, n_max, ...) yiginina doldurur.
+
+    group_codes sirali olmalidir (ayni grubun satirlari ardisik).
+    Donus: yigin, mask (n_groups, n_max), her satirin grup ici pozisyonu.
+    """
+    counts = np.bincount(group_codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    pos = np.arange(len(group_codes)) - starts[group_codes]
+    n_max = int(counts.max()) if len(counts) else 0
+
+    stacked = np.zeros((n_groups, n_max) + values.shape[1:], dtype=np.float64)
+    stacked[group_codes, pos] = values
+    mask = np.zeros((n_groups, n_max), dtype=bool)
+    mask[group_codes, pos] = True
+    return stacked, mask, pos
+
+
+def stack_series(
+    years: np.ndarray, values: np.ndarray, group_codes: np.ndarray, n_groups: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (n,) yil ve (n, k) deger dizilerini seri yiginina cevirir: her (grup, sutun) bir seridir.
+
+    Donus: T (S, n_max) yillar, Y (S, n_max) degerler, valid (S, n_max) maske; S = n_groups * k,
+    seri sirasi grup-ana (g * k + sutun).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_cols = values.shape[1]
+
+    Y, row_mask, _ = stack_groups(values, group_codes, n_groups)  # (G, n_max, k)
+    T, _, _ = stack_groups(np.asarray(years, dtype=np.float64), group_codes, n_groups)  # (G, n_max)
+    n_max = Y.shape[1]
+
+    valid = (row_mask[..., None] & ~np.isnan(Y)).transpose(0, 2, 1).reshape(-1, n_max)
+    Y = Y.transpose(0, 2, 1).reshape(-1, n_max)
+    T = np.repeat(T, n_cols, axis=0)
+    return T, Y, valid
+
+
+def fit_polynomial_trends(
+    T: np.ndarray, Y: np.ndarray, valid: np.ndarray, degree: int = 2, min_points: int = 5
+) -> dict:
+    """
+    Seri yigini (bkz. stack_series) uzerinde year -> deger polinom trendlerini tek seferde fit eder.
+
+    - Yil, her seri icin gecerli yillarin ortalamasina gore merkezlenir; boylece ham yillarin
+      (2024**2 gibi) yol actigi kotu kosullu tasarim matrisi olusmaz.
+    - Gecerli nokta sayisi min_points'ten az olan seriler icin son gecerli deger (yoksa 0)
+      kullanilir (fallback).
+
+    Donus: center, coef (S, degree), intercept, fallback (bool), last_value dizileri.
+    """
+    n_series, n_max = Y.shape
+    count = valid.sum(axis=1)
+    center = np.where(valid, T, 0.0).sum(axis=1) / np.maximum(count, 1)
+
+    powers = np.arange(1, degree + 1)
+    X = (T - center[:, None])[..., None] ** powers
+    coef, intercept = fit_ols_batched(X, Y, valid)
+
+    last_pos = n_max - 1 - np.argmax(valid[:, ::-1], axis=1) if n_max else np.zeros(n_series, dtype=np.intp)
+    last_value = np.where(count > 0, Y[np.arange(n_series), last_pos] if n_max else 0.0, 0.0)
+
+    return {
+        "center": center,
+        "coef": coef,
+        "intercept": intercept,
+        "fallback": count < min_points,
+        "last_value": last_value,
+    }
+
+
+def predict_polynomial_trends(trends: dict, future_years: np.ndarray) -> np.ndarray:
+    """fit_polynomial_trends sonucu icin (S, m) tahminler."""
+    future_years = np.asarray(future_years, dtype=np.float64).ravel()
+    powers = np.arange(1, trends["coef"].shape[1] + 1)
+    X_future = (future_years[None, :] - trends["center"][:, None])[..., None] ** powers
+    forecasts = predict_batched(X_future, trends["coef"], trends["intercept"])
+    return np.where(trends["fallback"][:, None], trends["last_value"][:, None], forecasts)
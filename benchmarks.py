@@ -0,0 +1,687 @@
+"""
+Asama asama benchmark: yukleme, doldurma, toplama, tahmin, rapor bolumleri ve gorsellestirme
+fonksiyonlari; OWID biciminde sentetik veri ile 1x / 10x / 100x olcekte.
+
+- Sentetik veri gercek OWID dosyasinin sekline uyar (~50 bin satir, 79 sutun, ulke basina
+  farkli baslangic yili, bastaki / araliktaki eksik degerler, iso_code'suz bolgeler).
+  Olcek, ulke (varlik) sayisini carpar; CSV'ler .cache/bench/ altinda bir kez uretilir.
+- Her (olcek, asama) ayri bir Python process'inde calisir: hazirlik (setup) olculmez,
+  asama repeat kez calistirilir; en iyi / tum sureler ve tepe RSS (hazirliktan sonra
+  sifirlanan VmHWM) kaydedilir.
+- Sonuclar JSON olarak yazilir; --compare ile iki sonuc dosyasi karsilastirilir.
+- --micro: asama modeline uymayan karsilastirmalar (yukleyici onbellegi soguk / sicak,
+  olcege gore animasyonlu globe, taze process'te betik importu, panel deposu ile worker
+  baslatma). Hepsi ayni zamanlama (best_of) ve tablo (print_table) yardimcilarini kullanir.
+
+Kullanim:
+    python benchmarks.py                                  # tum asamalar, 1x / 10x / 100x
+    python benchmarks.py --scales 1,10 --stages load,clean_and_balance --repeat 3
+    python benchmarks.py --scales 1,10 --stages eda_prep:frame,eda_prep:compact   # tepe RSS: pandas / kompakt
+    python benchmarks.py --compare eski.json yeni.json
+    python benchmarks.py --micro loader --data Datasets/owid-co2-data.csv
+    python benchmarks.py --micro imports --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(".cache", "bench")
+RESULTS_DIR = "benchmark_results"
+
+# Gercek OWID CO2 veri setinin boyutu (yaklasik)
+REAL_ROWS = 50_000
+REAL_ENTITIES = 255
+REAL_COLUMNS = 79
+FIRST_YEAR, LAST_YEAR = 1750, 2024
+
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_REPEAT = 3
+DEFAULT_WARMUP = 1
+DEFAULT_TIMEOUT = 1800
+BOOTSTRAP_SAMPLES = 1000
+
+# Rapor ulkeleri ve ISO kodlari (sentetik panelin ilk varliklari)
+NAMED_ENTITIES = {
+    "China": "CHN",
+    "United States": "USA",
+    "Russia": "RUS",
+    "Turkey": "TUR",
+    "Germany": "DEU",
+    "India": "IND",
+}
+
+# Sentetik CSV bu kadar varliklik parcalar halinde uretilir (100x olcekte bellek sinirli kalir)
+CHUNK_ENTITIES = 2000
+
+
+# --- sentetik veri ------------------------------------------------------------------------
+
+def _iso_codes(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Benzersiz 3 harfli kodlar; ~%10 varlik (bolgeler) ve kod kapasitesini asanlar NaN."""
+    codes = np.full(n, None, dtype=object)
+    named = list(NAMED_ENTITIES.values())
+    codes[: len(named)] = named[:n]
+
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    pool = np.array([a + b + c for a in letters for b in letters for c in letters], dtype=object)
+    pool = rng.permutation(pool[~np.isin(pool, named)])
+
+    rest = np.arange(len(named), n)
+    rest = rest[rng.random(len(rest)) >= 0.1]  # bolgeler / toplamlar
+    rest = rest[: len(pool)]
+    codes[rest] = pool[: len(rest)]
+    return codes
+
+
+def iter_synthetic_owid(scale: float = 1, seed: int = 0, chunk_entities: int = CHUNK_ENTITIES):
+    """
+    OWID CO2 bicimde sentetik panel, varlik parcalari halinde: toplam ~REAL_ROWS * scale
+    satir, REAL_COLUMNS sutun.
+
+    Degerler ulke basina log-uzayda buyuyen trendler ve gurultudur; eksiklik deseni
+    (bastaki bosluklar, %15 rastgele delik, consumption_co2 1990 oncesi, gdp 2022 sonrasi)
+    doldurma motorlarinin gercek veriye yakin is yapmasi icindir.
+    """
+    rng = np.random.default_rng(seed)
+    n_total = max(len(NAMED_ENTITIES), int(round(REAL_ENTITIES * scale)))
+    all_names = np.array(
+        list(NAMED_ENTITIES) + [f"Country {i:06d}" for i in range(n_total - len(NAMED_ENTITIES))], dtype=object
+    )
+    all_codes = _iso_codes(n_total, rng)
+
+    for k, lo in enumerate(range(0, n_total, chunk_entities)):
+        rng = np.random.default_rng([seed, k])
+        names, codes = all_names[lo : lo + chunk_entities], all_codes[lo : lo + chunk_entities]
+        n = len(names)
+
+        # Ortalama seri uzunlugu ~ REAL_ROWS / REAL_ENTITIES
+        start = rng.integers(FIRST_YEAR, 1909, n)
+        lengths = LAST_YEAR - start + 1
+        entity = np.repeat(np.arange(n), lengths)
+        offsets = np.arange(len(entity)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        year = start[entity] + offsets
+        t = (year - FIRST_YEAR) / (LAST_YEAR - FIRST_YEAR + 1)
+
+        data = {"country": names[entity], "year": year, "iso_code": codes[entity]}
+        base = rng.uniform(1, 1000, n)[entity]
+        population = 1e6 * base * (1 + t) * rng.lognormal(0, 0.02, len(year))
+        gdp = 1e9 * base * (1 + t**2) * rng.lognormal(0, 0.05, len(year))
+        co2 = base * t ** rng.uniform(1, 3, n)[entity] * rng.lognormal(0, 0.05, len(year))
+        energy = 5 * co2 * rng.lognormal(0, 0.05, len(year))
+        shares = rng.dirichlet([4, 3, 2, 0.5, 0.2], len(year))
+        values = {
+            "population": population,
+            "gdp": gdp,
+            "co2": co2,
+            "co2_per_capita": co2 * 1e6 / population,
+            "co2_per_gdp": co2 * 1e9 / gdp,
+            "coal_co2": co2 * shares[:, 0],
+            "oil_co2": co2 * shares[:, 1],
+            "gas_co2": co2 * shares[:, 2],
+            "cement_co2": co2 * shares[:, 3],
+            "flaring_co2": co2 * shares[:, 4],
+            "methane": 0.3 * co2 * rng.lognormal(0, 0.1, len(year)),
+            "nitrous_oxide": 0.1 * co2 * rng.lognormal(0, 0.1, len(year)),
+            "primary_energy_consumption": energy,
+            "energy_per_capita": energy * 1e9 / population,
+            "consumption_co2": co2 * rng.lognormal(0, 0.1, len(year)),
+        }
+
+        for col, v in values.items():
+            lead = (rng.random(n) * lengths * 0.5).astype(np.int64)
+            missing = (offsets < lead[entity]) | (rng.random(len(year)) < 0.15)
+            if col == "consumption_co2":
+                missing |= year < 1990
+            if col == "gdp":
+                missing |= year > 2022
+            data[col] = np.where(missing, np.nan, v)
+
+        for i in range(REAL_COLUMNS - 3 - len(values)):  # dosya genisligi (projeksiyonun etkisi icin)
+            data[f"extra_{i}"] = np.where(rng.random(len(year)) < 0.5, np.nan, rng.random(len(year)))
+        yield pd.DataFrame(data)
+
+
+def synthetic_owid(scale: float = 1, seed: int = 0) -> pd.DataFrame:
+    """Sentetik panelin tamami (bkz. iter_synthetic_owid)."""
+    return pd.concat(iter_synthetic_owid(scale, seed), ignore_index=True)
+
+
+def dataset_path(scale: float, seed: int = 0, directory: str = BENCH_DIR) -> str:
+    """Olcegin sentetik CSV'si (yoksa uretilir)."""
+    path = os.path.join(directory, f"owid-co2-data-{scale:g}x-{seed}.csv")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        for i, chunk in enumerate(iter_synthetic_owid(scale, seed)):
+            chunk.to_csv(tmp_path, index=False, mode="w" if i == 0 else "a", header=i == 0)
+        os.replace(tmp_path, path)
+    return path
+
+
+# --- asamalar -----------------------------------------------------------------------------
+# Her asama: setup(path) -> state (olculmez), run(state) (olculur). Moduller child process'te
+# import edilir; boylece bir asamanin import / bellek maliyeti digerine karismaz.
+
+def _report():
+    from script_import import import_script
+
+    return import_script("co2-data.py")
+
+
+def _quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def _raw(path: str) -> pd.DataFrame:
+    report = _report()
+    return report.load_owid(columns=report.REPORT_COLUMNS, path=path, categorical=False)
+
+
+def _eda(path: str) -> dict:
+    report = _report()
+    data = _raw(path)
+    ctx = _quiet(report._prepare_eda, {"df": data})
+    ctx.update(df=data, output_dir=".")
+    return ctx
+
+
+def _setup_load(path: str) -> dict:
+    _raw(path)  # onbellegi isit
+    return {"path": path}
+
+
+def _setup_split(path: str) -> dict:
+    report = _report()
+    data = _raw(path)
+    cols = [c for c in (report.FEATURES + ["co2"]) if c in data.columns and c not in ["year", "country"]]
+    train = data[(data["year"] >= 2000) & (data["year"] <= 2018)].copy()
+    test = data[(data["year"] >= 2019) & (data["year"] <= 2024)].copy()
+    return {"train": train, "test": test, "cols": cols}
+
+
+def _run_forecast_features(ctx: dict) -> None:
+    report = _report()
+    future_years = np.arange(2025, 2029)
+    for country in report.REPORT_COUNTRIES:
+        report.forecast_features(ctx["panel"].country(country), future_years, store=None)
+
+
+def _run_predict(ctx: dict) -> None:
+    report = _report()
+    report.MODEL_STORE.clear()
+    for country in report.REPORT_COUNTRIES + [None]:
+        _quiet(report.predict_co2_multivariate, ctx["panel"], country)
+
+
+def _run_bootstrap(ctx: dict) -> None:
+    report = _report()
+    report.MODEL_STORE.clear()
+    report.predict_co2_multivariate_many(ctx["panel"], interval="bootstrap", bootstrap={"n_boot": BOOTSTRAP_SAMPLES})
+
+
+def _section_stage(name: str) -> dict:
+    def run(ctx: dict) -> None:
+        from figure_render import render_spec, take_pending
+
+        report = _report()
+        report.MODEL_STORE.clear()
+        _quiet(report.REPORT_TASKS[name]["func"], ctx)
+        for spec in take_pending():
+            render_spec(spec)
+
+    return {"setup": _eda, "run": run}
+
+
+def _gorsellestirme_stage(builder: str) -> dict:
+    def setup(path: str) -> dict:
+        from script_import import import_script
+
+        g = import_script("gorsellestirme.py")
+        countries = list(g.COUNTRY_COORDS)
+        # gorsellestirme.main ile ayni hazirlik, verilen CSV'den
+        prepared = g.prepare_country_data(g.load_owid(columns=g.GLOBE_COLUMNS, path=path), countries)
+        return {"g": g, "panel": g.PanelIndex(prepared), "countries": countries}
+
+    calls = {
+        "build_globe_frames": lambda s: s["g"].build_globe_frames(s["panel"], s["countries"], range(2000, 2025)),
+        "create_animated_globe": lambda s: s["g"].create_animated_globe(s["panel"], 2000, 2024),
+        "create_3d_globe_visualization": lambda s: s["g"].create_3d_globe_visualization(s["panel"], 2024),
+        "create_country_comparison_chart": lambda s: s["g"].create_country_comparison_chart(s["panel"], s["countries"], 2024),
+    }
+    return {"setup": setup, "run": calls[builder]}
+
+
+def _setup_globe_3d(path: str) -> dict:
+    from script_import import import_script
+
+    globe = import_script("3D görselleştirme.py")
+    data = globe.load_owid(columns=globe.GLOBE_COLUMNS, path=path)
+    cols = [c for c in globe.INTERPOLATE_COLUMNS if c in data.columns]
+    return {"globe": globe, "df_eda": globe.impute_by_group(data, cols, mode="both")}
+
+
+def _run_eda_frame(ctx: dict) -> None:
+    """Mevcut EDA hazirligi: load + copy + clean_and_balance + yillik ortalamalar."""
+    report = _report()
+    data = _raw(ctx["path"])
+    df_eda = _quiet(report.clean_and_balance_data_for_eda, data.copy())
+    report._build_global_avg(df_eda)
+
+
+def _run_eda_compact(ctx: dict) -> None:
+    """Ayni hazirlik CompactPanel uzerinde: kompakt yukleme + doldurma + yillik ortalamalar."""
+    from data_loader import load_owid_compact
+
+    report = _report()
+    panel = load_owid_compact(columns=report.REPORT_COLUMNS, path=ctx["path"])
+    cols = [c for c in set(report.FEATURES + ["co2"]) if c in panel]
+    report._build_global_avg(report.impute_by_group(panel, cols, mode="both"))
+
+
+def _stages() -> dict:
+    report_load = lambda s: _report().load_owid(columns=_report().REPORT_COLUMNS, path=s["path"], categorical=False, use_cache=False)
+    stages = {
+        "load_csv": {"setup": lambda p: {"path": p}, "run": report_load},
+        "load": {"setup": _setup_load, "run": lambda s: _raw(s["path"])},
+        "clean_and_balance": {
+            "setup": lambda p: {"df": _raw(p)},
+            "run": lambda s: _quiet(_report().clean_and_balance_data_for_eda, s["df"].copy()),
+        },
+        "time_safe_impute": {
+            "setup": _setup_split,
+            "run": lambda s: _report()._country_time_safe_impute_after_split(s["train"], s["test"], cols=s["cols"]),
+        },
+        "build_global_avg": {"setup": _eda, "run": lambda s: _report()._build_global_avg(s["df_eda"])},
+        "eda_prep:frame": {"setup": _setup_load, "run": _run_eda_frame},
+        "eda_prep:compact": {"setup": _setup_load, "run": _run_eda_compact},
+        "forecast_features": {"setup": _eda, "run": _run_forecast_features},
+        "predict_co2_multivariate": {"setup": _eda, "run": _run_predict},
+        "bootstrap_intervals": {"setup": _eda, "run": _run_bootstrap},
+    }
+    for name, task in _report().REPORT_TASKS.items():
+        if not task.get("local"):
+            stages[f"section:{name}"] = _section_stage(name)
+    for builder in ("build_globe_frames", "create_animated_globe", "create_3d_globe_visualization", "create_country_comparison_chart"):
+        stages[f"gorsellestirme:{builder}"] = _gorsellestirme_stage(builder)
+    stages["globe_3d:globe_figure"] = {
+        "setup": _setup_globe_3d,
+        "run": lambda s: s["globe"].globe_figure(s["df_eda"], "co2_per_capita", 1990, 2024),
+    }
+    return stages
+
+
+# --- olcum --------------------------------------------------------------------------------
+
+def _status_kb(field: str) -> int | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    """Linux'ta VmHWM'yi (tepe RSS) mevcut RSS'e sifirlar."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def timings(fn, repeat: int) -> list[float]:
+    """fn'i repeat kez calistirir; her calismanin suresi (saniye)."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def best_of(fn, repeat: int = DEFAULT_REPEAT) -> float:
+    """repeat calismanin en iyisi (saniye)."""
+    return min(timings(fn, repeat))
+
+
+def print_table(rows: list[dict]) -> None:
+    """Ayni anahtarli satirlari hizali tablo olarak yazar: ilk sutun sola, digerleri saga yaslanir."""
+    if not rows:
+        return
+    headers = list(rows[0])
+    cells = [[f"{v:,.1f}" if isinstance(v, float) else str(v) for v in row.values()] for row in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+
+    def line(values: list[str]) -> str:
+        return "  ".join(v.ljust(w) if i == 0 else v.rjust(w) for i, (v, w) in enumerate(zip(values, widths)))
+
+    print(line(headers))
+    for c in cells:
+        print(line(c))
+
+
+def _measure(stage: str, path: str, repeat: int, warmup: int) -> dict:
+    """
+    Child process: asamayi hazirlar, warmup kez olcmeden calistirir (ilk cagri import /
+    onbellek maliyetleri) ve olcer.
+    """
+    spec = _stages()[stage]
+    state = spec["setup"](path)
+    for _ in range(warmup):
+        spec["run"](state)
+
+    baseline_kb = _status_kb("VmRSS")
+    reset = _reset_peak_rss()
+    times = timings(lambda: spec["run"](state), repeat)
+
+    peak_kb = _status_kb("VmHWM") if reset else None
+    if peak_kb is None:
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Linux: KB, sifirlanamaz
+    return {
+        "seconds": min(times),
+        "seconds_all": times,
+        "peak_rss_mb": peak_kb / 1024,
+        "rss_delta_mb": (peak_kb - baseline_kb) / 1024 if baseline_kb is not None else None,
+        "children_peak_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+
+
+def run_stage(
+    stage: str, path: str, repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP, timeout: float = DEFAULT_TIMEOUT
+) -> dict:
+    """Asamayi taze bir process'te olcer; zaman asimi / cokme durum olarak kaydedilir."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", stage, "--data", os.path.abspath(path)]
+    cmd += ["--repeat", str(repeat), "--warmup", str(warmup)]
+    env = dict(os.environ, MPLBACKEND="Agg", PYTHONPATH=os.pathsep.join([_HERE, os.environ.get("PYTHONPATH", "")]))
+    with tempfile.TemporaryDirectory(prefix="co2-bench-") as workdir:  # bolumlerin yazdigi dosyalar
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, cwd=workdir, env=env)
+        except subprocess.TimeoutExpired:
+            return {"status": "timeout", "timeout": timeout}
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-5:]
+        if proc.returncode < 0:  # sinyal ile olduruldu (SIGKILL: buyuk olasilikla bellek yetersiz)
+            error.append(f"killed by signal {-proc.returncode}" + (" (likely out of memory)" if proc.returncode == -9 else ""))
+        return {"status": "failed", "returncode": proc.returncode, "error": error}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["status"] = "ok"
+    return result
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=_HERE, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, cwd=_HERE)
+        return out.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    scales=DEFAULT_SCALES,
+    stages: list[str] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+    warmup: int = DEFAULT_WARMUP,
+    timeout: float = DEFAULT_TIMEOUT,
+    seed: int = 0,
+) -> dict:
+    """Secilen asamalari her olcekte calistirir; sonuc sozlugunu (JSON'a hazir) dondurur."""
+    names = list(_stages())
+    stages = stages or names
+    unknown = [s for s in stages if s not in names]
+    if unknown:
+        raise ValueError(f"Bilinmeyen asama(lar): {unknown} (mevcut: {names})")
+
+    results = []
+    for scale in scales:
+        t0 = time.perf_counter()
+        path = dataset_path(scale, seed)
+        rows = sum(1 for _ in open(path)) - 1
+        print(f"\n== {scale:g}x: {rows:,} satir ({os.path.getsize(path) / 2**20:,.0f} MB CSV, hazirlik {time.perf_counter() - t0:.1f}s)", flush=True)
+        for stage in stages:
+            r = run_stage(stage, path, repeat, warmup, timeout)
+            results.append({"scale": scale, "rows": rows, "stage": stage, **r})
+            if r["status"] == "ok":
+                print(f"  {stage:<48} {r['seconds'] * 1000:>11.1f} ms {r['peak_rss_mb']:>9.0f} MB", flush=True)
+            else:
+                print(f"  {stage:<48} {r['status']}: {(r.get('error') or [''])[-1]}", flush=True)
+
+    return {
+        "meta": {
+            "revision": _git_revision(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "warmup": warmup,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+# --- ozel karsilastirmalar (--micro) -------------------------------------------------------
+# Her biri (path, repeat) alir ve print_table satirlari dondurur; path: OWID CSV'si (None ->
+# data_loader.DATA_PATHS), gerekmeyenlerde yok sayilir.
+
+def _micro_loader(path: str | None, repeat: int) -> list[dict]:
+    """Ham pd.read_csv ile onbellekli yukleyici: soguk (onbellek olusturma) ve sicak yuklemeler."""
+    from data_loader import _cache_path, file_fingerprint, find_data_path, load_owid
+
+    csv_path = find_data_path(path)
+    projection = ["country", "year", "co2", "gdp", "population", "co2_per_capita"]
+    shutil.rmtree(_cache_path(csv_path, file_fingerprint(csv_path)), ignore_errors=True)
+    cold = timings(lambda: load_owid(path=csv_path), 1)[0]
+
+    print(f"Kaynak: {csv_path}")
+    runs = {
+        "pd.read_csv (mevcut yol)": best_of(lambda: pd.read_csv(csv_path), repeat),
+        "load_owid - soguk (onbellek olusturma)": cold,
+        "load_owid - sicak, tum sutunlar": best_of(lambda: load_owid(path=csv_path), repeat),
+        "load_owid - sicak, projeksiyon": best_of(lambda: load_owid(columns=projection, path=csv_path), repeat),
+        "load_owid - sicak, float32": best_of(lambda: load_owid(path=csv_path, float32=True), repeat),
+    }
+    return [{"yol": name, "sure (ms)": seconds * 1000} for name, seconds in runs.items()]
+
+
+def _synthetic_globe_data(n_countries: int, start_year: int = 1900, end_year: int = 2024, seed: int = 0) -> tuple[pd.DataFrame, dict]:
+    """n ulkelik sentetik globe paneli ve koordinatlar."""
+    rng = np.random.default_rng(seed)
+    countries = [f"Country {i:03d}" for i in range(n_countries)]
+    years = np.arange(start_year, end_year + 1)
+    n = n_countries * len(years)
+    df = pd.DataFrame({
+        "country": np.repeat(countries, len(years)),
+        "year": np.tile(years, n_countries),
+        "co2": rng.lognormal(5, 2, n),
+        "co2_per_capita": rng.lognormal(1, 1, n),
+        "population": rng.lognormal(16, 1.5, n),
+        "gdp": rng.lognormal(24, 1.5, n),
+    })
+    coords = {c: {"lat": float(rng.uniform(-60, 70)), "lon": float(rng.uniform(-180, 180))} for c in countries}
+    return df, coords
+
+
+def _micro_globe(path: str | None, repeat: int, sizes=(6, 50, 200), start_year: int = 1900, end_year: int = 2024) -> list[dict]:
+    """gorsellestirme: animasyonlu globe'un 6 / 50 / 200 ulke icin olusturma suresi (1900-2024 kareleri)."""
+    from script_import import import_script
+
+    g = import_script("gorsellestirme.py")
+    print(f"Yillar: {start_year}-{end_year} ({end_year - start_year + 1} kare)")
+    rows = []
+    for n in sizes:
+        df, coords = _synthetic_globe_data(n, start_year, end_year)
+        panel = g.PanelIndex(df)
+        frames = best_of(lambda: g.build_globe_frames(panel, list(coords), range(start_year, end_year + 1)), repeat)
+        figure = best_of(lambda: g.create_animated_globe(panel, start_year, end_year, coords=coords), repeat)
+        rows.append({"ulke": n, "build_globe_frames (ms)": frames * 1000, "create_animated_globe (ms)": figure * 1000})
+    return rows
+
+
+_IMPORT_CODE = """
+import json, sys, time
+sys.path.insert(0, {here!r})
+t0 = time.perf_counter()
+import numpy, pandas
+t1 = time.perf_counter()
+from script_import import import_script
+import_script({filename!r})
+t2 = time.perf_counter()
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"base": t1 - t0, "script": t2 - t1, "heavy": heavy}}))
+"""
+
+
+def _micro_imports(path: str | None, repeat: int) -> list[dict]:
+    """Betiklerin import suresi (numpy + pandas haric), her olcum taze bir Python process'inde."""
+    from script_import import HEAVY_MODULES, SCRIPTS
+
+    rows = []
+    for filename in SCRIPTS.values():
+        code = _IMPORT_CODE.format(here=_HERE, filename=filename, heavy=HEAVY_MODULES)
+        runs = []
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=_HERE)
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        best = min(runs, key=lambda r: r["script"])
+        rows.append({"betik": filename, "sure (ms)": best["script"] * 1000, "agir kutuphaneler": ", ".join(best["heavy"]) or "-"})
+    return rows
+
+
+def _probe(data, queue) -> None:
+    """panel_store worker'i: tum sayisal sutunlari okur, bellek durumunu bildirir."""
+    from panel_store import StoredPanel
+
+    frame = data.frame() if isinstance(data, StoredPanel) else data
+    for col in frame.select_dtypes("number").columns:
+        float(np.nansum(frame[col].to_numpy()))
+    queue.put((_status_kb("RssAnon"), _status_kb("RssFile")))
+
+
+def _start_workers(data, n: int) -> tuple[float, list]:
+    """n spawn worker'i baslatir (veri arguman olarak pickle edilir); tumu bitene kadar gecen sure."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    t0 = time.perf_counter()
+    workers = [context.Process(target=_probe, args=(data, queue)) for _ in range(n)]
+    for worker in workers:
+        worker.start()
+    results = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - t0, results
+
+
+def _micro_panel_store(path: str | None, repeat: int, workers=(1, 2, 4, 8)) -> list[dict]:
+    """
+    Doldurulmus paneli worker'lara pickle edilmis DataFrame olarak vermek ile StoredPanel
+    tutamaci vermeyi karsilastirir: toplam baslatma suresi ve worker basina anonim / dosya
+    eslemeli RSS (spawn; fork'ta DataFrame yazilinca kopyalanir).
+    """
+    from data_loader import load_owid
+    from imputation import impute_by_group
+    from panel_store import PanelStore
+
+    data = load_owid(path=path, categorical=False)
+    df_eda = impute_by_group(data, list(data.select_dtypes("float").columns), mode="both")
+    rows = []
+    with tempfile.TemporaryDirectory() as root:
+        stored = PanelStore(root).put("bench", df_eda)
+        print(f"Panel: {len(df_eda):,} satir x {df_eda.shape[1]} sutun, diskte {stored.nbytes() / 2**20:.1f} MB")
+        for n in workers:
+            for name, payload in (("DataFrame", df_eda), ("StoredPanel", stored)):
+                seconds, results = _start_workers(payload, n)
+                rows.append({
+                    "worker": n,
+                    "yol": name,
+                    "sure (ms)": seconds * 1000,
+                    "RssAnon/worker (MB)": float(np.mean([r[0] for r in results])) / 1024,
+                    "RssFile/worker (MB)": float(np.mean([r[1] for r in results])) / 1024,
+                })
+    return rows
+
+
+MICRO_BENCHMARKS = {
+    "loader": _micro_loader,
+    "globe": _micro_globe,
+    "imports": _micro_imports,
+    "panel_store": _micro_panel_store,
+}
+
+
+def compare(old: dict, new: dict) -> pd.DataFrame:
+    """Iki sonuc dosyasini (olcek, asama) bazinda karsilastirir: sure ve tepe RSS oranlari."""
+    def frame(result: dict) -> pd.DataFrame:
+        rows = [r for r in result["results"] if r["status"] == "ok"]
+        return pd.DataFrame(rows, columns=["scale", "stage", "seconds", "peak_rss_mb"]).set_index(["scale", "stage"])
+
+    merged = frame(old).join(frame(new), lsuffix="_old", rsuffix="_new", how="outer")
+    merged["time_ratio"] = merged["seconds_new"] / merged["seconds_old"]
+    merged["rss_ratio"] = merged["peak_rss_mb_new"] / merged["peak_rss_mb_old"]
+    return merged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="stage-by-stage benchmark suite on synthetic OWID-shaped data")
+    parser.add_argument("--scales", default=",".join(f"{s:g}" for s in DEFAULT_SCALES), help="comma-separated scale factors")
+    parser.add_argument("--stages", help="comma-separated stages (default: all, see --list-stages)")
+    parser.add_argument("--list-stages", action="store_true")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per stage (best is reported)")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="untimed runs before timing")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per stage process")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help=f"result JSON path (default: {RESULTS_DIR}/<revision>-<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    parser.add_argument("--micro", choices=list(MICRO_BENCHMARKS), help="run one standalone comparison instead of the stage suite")
+    parser.add_argument("--data", help="OWID CSV for --micro (default: the dataset under Datasets/)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, _HERE)
+        print(json.dumps(_measure(args.child, args.data, args.repeat, args.warmup)))
+    elif args.micro:
+        rows = MICRO_BENCHMARKS[args.micro](args.data, args.repeat)
+        print_table(rows)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(rows, f, indent=2)
+    elif args.list_stages:
+        print("\n".join(_stages()))
+    elif args.compare:
+        with open(args.compare[0]) as f_old, open(args.compare[1]) as f_new:
+            table = compare(json.load(f_old), json.load(f_new))
+        with pd.option_context("display.max_rows", None, "display.max_columns", None, "display.width", 200, "display.float_format", "{:.3f}".format):
+            print(table)
+    else:
+        scales = [float(s) for s in args.scales.split(",") if s.strip()]
+        stages = [s.strip() for s in args.stages.split(",") if s.strip()] if args.stages else None
+        suite = run_suite(scales, stages, args.repeat, args.warmup, args.timeout, args.seed)
+        output = args.output or os.path.join(RESULTS_DIR, f"{suite['meta']['revision'] or 'local'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(suite, f, indent=2)
+        print(f"\nResults saved to {output}")
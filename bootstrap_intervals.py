@@ -0,0 +1,322 @@
+"""
+Artik (residual) / blok bootstrap ile tahmin araliklari: feature trendleri ve CO2 modeli her
+yeniden ornekte yeniden fit edilir; tum ulkeler ve tum ornekler toplu olarak cozulur.
+
+Analitik bant (1.96 * std_error * sqrt(h)) sadece CO2 modelinin artiklarina bakar; gelecek
+feature degerleri (polinom trend tahminleri) kesin kabul edilir. Burada her bootstrap ornegi:
+
+1. Her (ulke, feature) serisine trend artiklari yeniden orneklenerek eklenir, trend yeniden
+   fit edilir ve gelecege uzatilir; ustune yeniden orneklenmis artiklarin ufuk boyunca
+   kumulatif toplami eklenir (gelecek yol, yeniden fit edilmis trend etrafinda bir rastgele
+   yuruyustur).
+2. CO2 modelinin egitim hedefleri ayni sekilde yeniden orneklenir, model yeniden fit edilir
+   ve 1. adimdaki feature yollariyla tahmin yapilir (+ yeniden orneklenmis artiklarin
+   kumulatif toplami).
+
+Artiklar ufuk boyunca biriktigi icin bant, analitik bant (sqrt(h)) gibi ufukla genisler;
+trend yeniden fit'inin belirsizligi buna eklenir. Aralik, orneklerin (1 - level) / 2 ve
+(1 + level) / 2 yuzdelikleridir.
+
+Hiz:
+- Artik bootstrap'inda tasarim matrisi degismez; merkezlenmis tasarimin pseudo-inverse'u
+  (fit_ols_batched ile ayni cozum) her seri icin bir kez hesaplanir, her ornek icin yeniden
+  fit sadece bir matris-vektor carpimidir. Ornekler ve ulkeler tek einsum'da cozulur.
+- Rastgele akislar gruba (ulkeye) ozeldir: grubun SAMPLE_BLOCK orneklik j. blogu
+  SeedSequence((seed, grup etiketi), spawn_key=(j,)) ile cekilir. Bir ulkenin bandi, ayni
+  seed ile tek basina ya da baska ulkelerle birlikte hesaplandiginda aynidir; sonuc worker
+  sayisindan ve parca boyundan da bagimsizdir.
+- Gruplar ve ornek bloklari bellek butcesine (CHUNK_ELEMENTS) gore parcalara bolunur.
+- jobs > 1 ise parcalar bir process pool'da calisir (durum worker basina bir kez aktarilir).
+
+block > 1: dairesel blok bootstrap'i; artiklar zaman sirasinda block uzunlugunda ardisik
+bloklar halinde cekilir (seri korelasyonu korunur). block = 1: klasik artik bootstrap'i.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from instrumentation import span
+
+# Parca basina yaklasik eleman sayisi (yeniden orneklenmis artik yiginlari icin)
+CHUNK_ELEMENTS = 1 << 22
+
+# Grup basina bir rastgele akistan cekilen ornek sayisi; parcalar bu bloklarin katidir
+SAMPLE_BLOCK = 64
+
+# Worker basina paylasilan durum (bkz. _init_worker)
+_STATE: dict = {}
+
+# Durumun grup basina (G, ...) ve seri basina (G * k, ...) dizileri; parcalar grup araliklarini alir
+_GROUP_KEYS = ("f_width", "X_future", "mask", "y_count", "y_fitted", "y_resid", "y_n", "P_y", "X_mean", "entropy")
+_SERIES_KEYS = ("f_count", "f_resid", "W")
+
+
+def _compact(valid: np.ndarray, *arrays: np.ndarray) -> tuple:
+    """
+    Her satirda gecerli konumlari (sira korunarak) basa toplar; gecerli maske bir onek olur.
+    Donus: (valid, count, *arrays) yeniden dizilmis halleriyle.
+    """
+    order = np.argsort(~valid, axis=1, kind="stable")
+    count = valid.sum(axis=1)
+    prefix = np.arange(valid.shape[1])[None, :] < count[:, None]
+    moved = [np.take_along_axis(a, order.reshape(order.shape + (1,) * (a.ndim - 2)), axis=1) for a in arrays]
+    return (prefix, count, *moved)
+
+
+def _centred_pinv(D: np.ndarray, mask: np.ndarray, rcond: float | None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merkezlenmis tasarimin pseudo-inverse'u (fit_ols_batched ile ayni cozum):
+    beta = P @ (y - ortalama(y)), tahmin(x) = ortalama(y) + (x - ortalama(D)) @ beta.
+    Donus: P (S, p, n), ortalama(D) (S, p), gecerli satir sayisi (S,).
+    """
+    count = np.maximum(mask.sum(axis=1), 1).astype(np.float64)
+    D = np.where(mask[..., None], D, 0.0)
+    mean = D.sum(axis=1) / count[:, None]
+    Dc = np.where(mask[..., None], D - mean[:, None, :], 0.0)
+    if rcond is None:
+        rcond = np.finfo(np.float64).eps
+    return np.linalg.pinv(Dc, rcond=rcond), mean, count
+
+
+def _centred_fit(P: np.ndarray, count: np.ndarray, y: np.ndarray, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """_centred_pinv sonucu ile (..., n) hedefler icin ortalama ve katsayilar (son eksen: satirlar)."""
+    y_mean = np.where(mask, y, 0.0).sum(axis=-1) / count.reshape(count.shape + (1,) * (y.ndim - 2))
+    yc = np.where(mask, y - y_mean[..., None], 0.0)
+    if y.ndim == 2:
+        return y_mean, np.einsum("spn,sn->sp", P, yc)
+    return y_mean, np.einsum("spn,sbn->sbp", P, yc)
+
+
+def _resample_positions(rng: np.random.Generator, count: np.ndarray, length: int, size: int, block: int) -> np.ndarray:
+    """
+    Her seri icin [0, count) araliginda size x length konum. Dairesel blok bootstrap'i:
+    baslangiclar esit olasilikli, bloklar seri sonunda basa sarar (count < block olan kisa
+    seriler de ayni kuralla orneklenir). Donus: (S, size, length)
+    """
+    count = np.maximum(count, 1).astype(np.int32)[:, None, None]
+    n_blocks = -(-length // block)
+    # float32 tekduze sayilar (uretimi float64'un yarisi); yuvarlama count'a tasirsa kirpilir
+    starts = (rng.random((len(count), size, n_blocks), dtype=np.float32) * count).astype(np.int32)
+    np.minimum(starts, count - 1, out=starts)
+    if block == 1:
+        return starts
+    j = np.arange(length, dtype=np.int32)
+    return (starts[:, :, j // block] + j % block) % count
+
+
+def _group_entropy(seed: int | None, keys) -> list[list[int]]:
+    """Her grubun SeedSequence entropisi: (seed, etiketin UTF-8 baytlari)."""
+    seed = np.random.SeedSequence(seed).entropy  # None -> rastgele, tum gruplar icin ortak
+    return [[seed, *str(key).encode()] for key in keys]
+
+
+def _gather(values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """values (S, n) ve konumlar (S, b, L) -> (S, b, L)."""
+    flat = positions + (np.arange(len(values), dtype=np.int64) * values.shape[1])[:, None, None]
+    return values.ravel()[flat]
+
+
+def _prepare(X, y, mask, T, Y, valid, future_years, feature_slots, year_slot, degree, min_points, rcond) -> dict:
+    """Orneklerden bagimsiz her seyi (pseudo-inverse'ler, artiklar, nokta tahminleri) hesaplar."""
+    n_groups, _, n_params = X.shape
+    n_features = len(feature_slots)
+    future_years = np.asarray(future_years, dtype=np.float64).ravel()
+
+    # Feature trendleri: fit_polynomial_trends ile ayni model (yil, seri ortalamasina gore merkezli)
+    valid, f_count, T, Y = _compact(valid, T, Y)
+    center = np.where(valid, T, 0.0).sum(axis=1) / np.maximum(f_count, 1)
+    powers = np.arange(1, degree + 1)
+    D = (T - center[:, None])[..., None] ** powers
+    D_future = (future_years[None, :] - center[:, None])[..., None] ** powers
+    P_f, D_mean, f_n = _centred_pinv(D, valid, None)
+    f_mean, f_beta = _centred_fit(P_f, f_n, Y, valid)
+
+    fallback = f_count < min_points
+    last_value = np.where(f_count > 0, Y[np.arange(len(Y)), np.maximum(f_count - 1, 0)], 0.0)
+    fitted = f_mean[:, None] + np.einsum("snd,sd->sn", np.where(valid[..., None], D - D_mean[:, None, :], 0.0), f_beta)
+    f_resid = np.where(valid & ~fallback[:, None], Y - fitted, 0.0)
+    f_point = f_mean[:, None] + np.einsum("smd,sd->sm", D_future - D_mean[:, None, :], f_beta)
+    f_point = np.where(fallback[:, None], last_value[:, None], f_point)
+
+    # Gelecek feature degerinin artiklara gore dogrusal agirliklari: tahmin* = nokta + W @ artik*
+    W = 1.0 / f_n[:, None, None] + np.einsum("smd,sdn->smn", D_future - D_mean[:, None, :], P_f)
+    W = np.where(valid[:, None, :] & ~fallback[:, None, None], W, 0.0)
+
+    # CO2 modeli: nokta tahmini icin gelecek tasarimi (yil + feature trend tahminleri)
+    X_future = np.zeros((n_groups, len(future_years), n_params))
+    if year_slot is not None:
+        X_future[..., year_slot] = future_years
+    X_future[..., feature_slots] = f_point.reshape(n_groups, n_features, -1).transpose(0, 2, 1)
+
+    mask, y_count, X, y = _compact(mask, X, y)
+    P_y, X_mean, y_n = _centred_pinv(X, mask, rcond)
+    y_mean, beta = _centred_fit(P_y, y_n, y, mask)
+    y_fitted = y_mean[:, None] + np.einsum("gnp,gp->gn", np.where(mask[..., None], X - X_mean[:, None, :], 0.0), beta)
+    y_resid = np.where(mask, y - y_fitted, 0.0)
+
+    return {
+        "n_features": n_features,
+        # Grubun kendi serilerinin uzunlugu: cekilen sayi adedi diger gruplara bagli olmasin
+        "f_width": np.maximum(f_count.reshape(n_groups, n_features).max(axis=1, initial=0), 1),
+        "feature_slots": np.asarray(feature_slots, dtype=np.intp),
+        "f_count": np.where(fallback, 0, f_count),
+        "f_resid": f_resid,
+        "W": W,
+        "X_future": X_future,
+        "mask": mask,
+        "y_count": y_count,
+        "y_fitted": y_fitted,
+        "y_resid": y_resid,
+        "y_n": y_n,
+        "P_y": P_y,
+        "X_mean": X_mean,
+    }
+
+
+def _init_worker(state: dict) -> None:
+    _STATE.clear()
+    _STATE.update(state)
+
+
+def _group_slice(start: int, stop: int) -> dict:
+    """Paylasilan durumun [start, stop) gruplarina ait gorunumu (diziler kopyalanmaz)."""
+    st, k = _STATE, _STATE["n_features"]
+    out = dict(st)
+    out.update({key: st[key][start:stop] for key in _GROUP_KEYS})
+    out.update({key: st[key][start * k : stop * k] for key in _SERIES_KEYS})
+    return out
+
+
+def _chunk_positions(st: dict, blocks: list[tuple[int, int]], block: int) -> tuple[np.ndarray, ...]:
+    """
+    Parcanin ornek bloklari ((blok no, boyut) listesi) icin yeniden ornekleme konumlari. Her
+    (grup, blok) kendi akisindan ve grubun kendi seri uzunluklariyla cekilir; dolgu konumlari 0.
+    Donus: feature yeniden fit / gelecek, CO2 yeniden fit / gelecek konumlari.
+    """
+    n_groups, m, _ = st["X_future"].shape
+    k = st["n_features"]
+    f_count, y_count = st["f_count"], st["y_count"]
+    size = sum(n for _, n in blocks)
+    f_fit = np.zeros((n_groups * k, size, st["f_resid"].shape[1]), dtype=np.int32)
+    f_future = np.zeros((n_groups * k, size, m), dtype=np.int32)
+    y_fit = np.zeros((n_groups, size, st["y_resid"].shape[1]), dtype=np.int32)
+    y_future = np.zeros((n_groups, size, m), dtype=np.int32)
+
+    for g, entropy in enumerate(st["entropy"]):
+        series = slice(g * k, (g + 1) * k)
+        f_width, y_width = st["f_width"][g], max(int(y_count[g]), 1)
+        start = 0
+        for j, n in blocks:
+            rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(j,)))
+            samples = slice(start, start + n)
+            f_fit[series, samples, :f_width] = _resample_positions(rng, f_count[series], f_width, n, block)
+            f_future[series, samples] = _resample_positions(rng, f_count[series], m, n, block)
+            y_fit[g, samples, :y_width] = _resample_positions(rng, y_count[g : g + 1], y_width, n, block)[0]
+            y_future[g, samples] = _resample_positions(rng, y_count[g : g + 1], m, n, block)[0]
+            start += n
+    return f_fit, f_future, y_fit, y_future
+
+
+def _run_chunk(task: tuple) -> np.ndarray:
+    """Tek parca: [start, stop) gruplari ve ornek bloklari icin (stop - start, size, m) CO2 tahminleri."""
+    start, stop, blocks, block = task
+    st = _group_slice(start, stop)
+    n_groups, m, _ = st["X_future"].shape
+    k = st["n_features"]
+    size = sum(n for _, n in blocks)
+    f_fit, f_future, y_fit, y_future = _chunk_positions(st, blocks, block)
+
+    # 1) Feature yollari: yeniden fit edilmis trend + gelecek artiklarinin kumulatif toplami
+    f_resid = st["f_resid"]
+    delta = np.einsum("smn,sbn->sbm", st["W"], _gather(f_resid, f_fit))
+    delta += np.cumsum(_gather(f_resid, f_future), axis=-1)
+    X_future = np.repeat(st["X_future"][:, None], size, axis=1)
+    X_future[..., st["feature_slots"]] += delta.reshape(n_groups, k, size, m).transpose(0, 2, 3, 1)
+
+    # 2) CO2 modeli: yeniden orneklenmis hedeflerle yeniden fit + gelecek artiklarinin kumulatif toplami
+    y_resid, mask = st["y_resid"], st["mask"]
+    y_star = st["y_fitted"][:, None, :] + _gather(y_resid, y_fit)
+    y_mean, beta = _centred_fit(st["P_y"], st["y_n"], y_star, np.broadcast_to(mask[:, None, :], y_star.shape))
+    pred = y_mean[..., None] + np.einsum("gbmp,gbp->gbm", X_future - st["X_mean"][:, None, None, :], beta)
+    return pred + np.cumsum(_gather(y_resid, y_future), axis=-1)
+
+
+def bootstrap_forecast_intervals(
+    X: np.ndarray,
+    y: np.ndarray,
+    mask: np.ndarray,
+    T: np.ndarray,
+    Y: np.ndarray,
+    valid: np.ndarray,
+    future_years: np.ndarray,
+    feature_slots,
+    year_slot: int | None = None,
+    degree: int = 2,
+    min_points: int = 5,
+    n_boot: int = 1000,
+    block: int = 1,
+    level: float = 0.95,
+    seed: int = 0,
+    jobs: int | None = 1,
+    rcond: float | None = None,
+    keys=None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    X, y, mask      : CO2 modelinin egitim yiginlari (G, n, p), (G, n), (G, n)
+    T, Y, valid     : feature serileri (G * k, n_f), grup-ana sira (bkz. stack_series)
+    feature_slots   : k feature'in X sutunlarindaki yerleri (seri sirasiyla)
+    year_slot       : yil sutununun yeri (yoksa None); gelecek yillar dogrudan yazilir
+    degree / min_points : feature trendleri (forecast_features ile ayni; az noktali seriler
+                      son degerde sabit kalir ve belirsizlik tasimaz)
+    n_boot          : bootstrap ornegi sayisi
+    block           : blok uzunlugu (1 = klasik artik bootstrap'i)
+    level           : aralik kapsami (0.95 -> %2.5 / %97.5 yuzdelikleri)
+    jobs            : worker sayisi (None -> CPU sayisi, 1 -> ayni process'te)
+    rcond           : CO2 modeli icin tekil deger esigi (LinearRegression ile ayni cozum icin)
+    keys            : grup etiketleri (ornegin ulke adlari; None -> grup sirasi); her grubun
+                      rastgele akisi (seed, etiket) ciftinden turetilir
+
+    Donus: alt ve ust sinirlar, (G, len(future_years))
+    """
+    if n_boot < 2:
+        raise ValueError(f"n_boot en az 2 olmali: {n_boot}")
+    if block < 1:
+        raise ValueError(f"block en az 1 olmali: {block}")
+
+    with span("bootstrap:prepare", groups=len(X), series=len(T)):
+        state = _prepare(X, y, mask, T, Y, valid, future_years, list(feature_slots), year_slot, degree, min_points, rcond)
+    state["entropy"] = _group_entropy(seed, range(len(X)) if keys is None else keys)
+
+    # Parcalar (grup araligi, ornek bloklari) ciftleridir; once gruplar, sonra bloklar butceye sigdirilir
+    n_groups, m = state["X_future"].shape[:2]
+    per_group = -(-max(state["f_resid"].size, state["y_resid"].size, state["X_future"].size, 1) // max(n_groups, 1))
+    group_chunk = max(1, min(n_groups, CHUNK_ELEMENTS // (per_group * SAMPLE_BLOCK)))
+    block_chunk = max(1, CHUNK_ELEMENTS // (per_group * group_chunk * SAMPLE_BLOCK))
+    blocks = [(j, min(SAMPLE_BLOCK, n_boot - start)) for j, start in enumerate(range(0, n_boot, SAMPLE_BLOCK))]
+    tasks = [
+        (start, min(start + group_chunk, n_groups), blocks[i : i + block_chunk], block)
+        for start in range(0, n_groups, group_chunk)
+        for i in range(0, len(blocks), block_chunk)
+    ]
+
+    jobs = jobs or os.cpu_count() or 1
+    with span("bootstrap:resample", samples=n_boot, chunks=len(tasks), jobs=jobs):
+        if jobs == 1 or len(tasks) == 1:
+            _init_worker(state)
+            try:
+                samples = [_run_chunk(task) for task in tasks]
+            finally:
+                _STATE.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=_init_worker, initargs=(state,)) as pool:
+                samples = list(pool.map(_run_chunk, tasks))
+
+    out = np.empty((n_groups, n_boot, m))
+    for (start, stop, chunk_blocks, _), chunk_samples in zip(tasks, samples):
+        first = chunk_blocks[0][0] * SAMPLE_BLOCK
+        out[start:stop, first : first + chunk_samples.shape[1]] = chunk_samples
+    samples = out  # (G, n_boot, m)
+    alpha = (1 - level) / 2
+    return np.quantile(samples, alpha, axis=1), np.quantile(samples, 1 - alpha, axis=1)
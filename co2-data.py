@@ -1,20 +1,40 @@
 import numpy as np
 import pandas as pd
-import seaborn as sns
-from matplotlib import pyplot as plt
 import os
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import json
 import warnings
-
-warnings.filterwarnings("ignore")
-
-pd.set_option("display.max_columns", None)
-pd.set_option("display.max_rows", None)
-pd.set_option("display.float_format", lambda x: "%.3f" % x)
-pd.set_option("display.width", 500)
+import argparse
+import time
+import io
+import contextlib
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+from data_loader import load_owid
+from compact_panel import CompactPanel
+from imputation import impute_by_group, last_valid_by_group
+from batched_regression import (
+    fit_ols_batched,
+    fit_polynomial_trends,
+    predict_batched,
+    predict_polynomial_trends,
+    stack_groups,
+    stack_series,
+)
+from model_store import MODEL_STORE, ModelStore, data_fingerprint
+from incremental import build_snapshot, global_avg, incremental_update, invalidated_outputs, load_snapshot, save_snapshot
+from task_graph import run_tasks
+from panel_index import PanelIndex, as_panel
+from panel_store import DEFAULT_STORE_DIR, PanelStore, StoredPanel
+from scenarios import growth_indices, reduction_scenarios
+from grouped_correlation import apply_rules, group_corr
+from fuel_mix import FuelMix
+from bootstrap_intervals import bootstrap_forecast_intervals
+from figure_render import FigureRenderer, emit, figure_spec, pending, renderer, take_pending
+import artifact_cache
+from artifact_cache import ArtifactCache
+import instrumentation
+from instrumentation import span
 
 """
 Bu dosya, Nature-Pollution/co2-data.py'nin "time-safe" (lookahead leakage yok) versiyonudur.
@@ -33,17 +53,32 @@ Not:
 """
 
 
-def load():
+def load(columns: list[str] | None = None):
     """
     Veri setini yükler. Dosya bulunamazsa alternatif yolu dener.
+    columns verilirse sadece bu sütunlar okunur (bkz. data_loader.load_owid).
+
+    Not: country sütunu object olarak döner; seaborn hue=country çizimleri
+    kategorik dtype'ta kullanılmayan ülkeleri de lejanta ekler.
     """
-    try:
-        data = pd.read_csv("Datasets/owid-co2-data.csv")
-    except FileNotFoundError:
-        data = pd.read_csv("Nature-Pollution/Datasets/owid-co2-data.csv")
+    with span("load", columns=len(columns) if columns else None) as s:
+        data = load_owid(columns=columns, categorical=False)
+        s.set(rows=len(data))
     return data
 
 
+def configure_output() -> None:
+    """
+    Rapor metni için pandas gösterim ayarları ve uyarı filtresi. Import sırasında değil,
+    rapor çalışırken (main, run_report ve rapor worker'ları) uygulanır.
+    """
+    warnings.filterwarnings("ignore")
+
+    pd.set_option("display.max_columns", None)
+    pd.set_option("display.max_rows", None)
+    pd.set_option("display.float_format", lambda x: "%.3f" % x)
+    pd.set_option("display.width", 500)
+
 
 FEATURES = [
     "year",
@@ -62,42 +97,116 @@ FEATURES = [
     "nitrous_oxide",
 ]
 
+# Rapor (__main__) için gereken sütunlar; geri kalan ~60 sütun hiç okunmaz.
+REPORT_COLUMNS = ["country", "iso_code", "consumption_co2", "co2"] + FEATURES
+
+# Raporda ayrıntılı incelenen ülkeler
+REPORT_COUNTRIES = ["China", "United States", "Russia", "Turkey", "Germany", "India"]
+
+COUNTRY_COLORS = {
+    "China": "#E74C3C",
+    "United States": "#3498DB",
+    "Germany": "#F1C40F",
+    "Russia": "#8E44AD",
+    "Turkey": "#E67E22",
+    "India": "#2ECC71",
+}
+
+# Rapor çıktılarının (img/ altındaki dosyalar) girdileri: ülkeler (None = tümü), sütunlar, yıl aralığı.
+# Artımlı modda sadece girdisi değişen çıktılar geçersiz sayılır.
+FIGURE_INPUTS = {
+    "global_co2_trend.png": {"countries": None, "columns": ["co2"], "years": None},
+    "country_co2_trend.png": {"countries": REPORT_COUNTRIES, "columns": ["co2"], "years": None},
+    "correlation_matrix.png": {
+        "countries": None,
+        "columns": ["co2", "gdp", "population", "energy_per_capita", "co2_per_capita", "methane", "nitrous_oxide"],
+        "years": (1991, None),
+    },
+    "global_forecast_multivariate.png": {"countries": None, "columns": FEATURES + ["co2"], "years": None},
+    "country_forecasts_multivariate.png": {"countries": REPORT_COUNTRIES, "columns": FEATURES + ["co2"], "years": None},
+    "co2_per_capita_trend.png": {"countries": REPORT_COUNTRIES, "columns": ["co2_per_capita"], "years": None},
+    **{
+        f"pop_vs_co2_{c}.png": {"countries": [c], "columns": ["population", "co2"], "years": (2004, 2024)}
+        for c in REPORT_COUNTRIES
+    },
+    "population_vs_per_capita.png": {
+        "countries": REPORT_COUNTRIES,
+        "columns": ["population", "co2_per_capita"],
+        "years": (1991, None),
+    },
+    "fossil_fuel_mix.png": {"countries": REPORT_COUNTRIES, "columns": ["coal_co2", "oil_co2", "gas_co2"], "years": None},
+    "population_forecast.png": {"countries": REPORT_COUNTRIES, "columns": ["population"], "years": None},
+    "co2_impact_analysis.png": {
+        "countries": REPORT_COUNTRIES,
+        "columns": ["co2", "population", "co2_per_capita"],
+        "years": None,
+    },
+    **{
+        f"prod_vs_cons_{c}.png": {"countries": [c], "columns": ["co2", "consumption_co2"], "years": None}
+        for c in REPORT_COUNTRIES
+    },
+    "carbon_intensity_trend.png": {"countries": REPORT_COUNTRIES, "columns": ["co2_per_gdp"], "years": (2000, None)},
+}
+
+# Metrik dosyalarının girdileri (ham veri üzerinden); artifact önbelleğinin anahtarına girer.
+METRIC_INPUTS = {
+    "metrics_timesafe.json": {"countries": None, "columns": FEATURES + ["co2"], "years": (2000, 2024)},
+    "metrics_backtest.csv": {"countries": None, "columns": FEATURES + ["co2"], "years": (2000, None)},
+}
+
 
 def clean_and_balance_data_for_eda(data: pd.DataFrame) -> pd.DataFrame:
     """
     (EDA/Görselleştirme amaçlı)  ülke bazında "both" interpolasyon uygular.
     Bu fonksiyon, model değerlendirme metrikleri için önerilmez; sadece grafik/EDA için tutulur.
     """
-    print("\n--- Data Quality Report (Before Cleaning) ---")
-    print("Missing Values (%):")
-    print(data[["co2", "population", "gdp"]].isnull().mean() * 100)
+    _quality_report_before(data)
 
-    countries_check = ["China", "United States", "Russia", "Turkey", "Germany", "India"]
-    print("\nData Points per Country (Selected):")
-    print(data[data["country"].isin(countries_check)]["country"].value_counts())
-
-    data = data.sort_values(["country", "year"])
     cols_to_interpolate = list(set(FEATURES + ["co2"]))
     cols_to_interpolate = [c for c in cols_to_interpolate if c in data.columns]
 
-    def fill_group(group):
-        group[cols_to_interpolate] = group[cols_to_interpolate].interpolate(
-            method="linear", limit_direction="both"
-        )
-        return group
+    # ülke içinde interpolate(linear, both) ile bit-bit aynı, vektörel motor
+    data = impute_by_group(data, cols_to_interpolate, mode="both")
 
-    data = data.groupby("country", group_keys=False).apply(fill_group)
+    _missing_report(data, "After Interpolation")
 
-    print("\n--- Data Quality Report (After Interpolation) ---")
+    return data
+
+
+def _missing_report(data: pd.DataFrame, title: str) -> None:
+    print(f"\n--- Data Quality Report ({title}) ---")
     print("Missing Values (%):")
     print(data[["co2", "population", "gdp"]].isnull().mean() * 100)
 
-    return data
+
+def _quality_report_before(data: pd.DataFrame) -> None:
+    _missing_report(data, "Before Cleaning")
+
+    print("\nData Points per Country (Selected):")
+    print(data[data["country"].isin(REPORT_COUNTRIES)]["country"].value_counts())
 
 
-def _build_global_avg(data: pd.DataFrame) -> pd.DataFrame:
+def stored_eda_panel(data: pd.DataFrame, store: PanelStore) -> StoredPanel:
+    """
+    clean_and_balance_data_for_eda sonucunu panel deposundan döndürür; ham veri veya
+    doldurma kodu değişmediyse doldurma tekrarlanmaz (rapor metni aynı kalır). Anahtar:
+    fonksiyonun kod sürümü + ham verinin içerik özeti.
+    """
+    code = artifact_cache.code_version(clean_and_balance_data_for_eda)
+    key = artifact_cache.artifact_key("eda_panel", code, inputs=artifact_cache.fingerprint(data))
+    stored = store.get(key)
+    if stored is None:
+        return store.put(key, clean_and_balance_data_for_eda(data.copy()))
+    _quality_report_before(data)
+    _missing_report(stored.frame(), "After Interpolation")
+    return stored
+
+
+def _build_global_avg(data: pd.DataFrame | CompactPanel) -> pd.DataFrame:
     
     cols = list(set(FEATURES + ["co2"]))
+    if isinstance(data, CompactPanel):
+        return data.mean_by_year([c for c in cols if c in data and c != "year"])
     cols = [c for c in cols if c in data.columns and c != "year"]
     df_subset = data.groupby("year")[cols].mean(numeric_only=True).reset_index()
     df_subset = df_subset.sort_values("year")
@@ -114,27 +223,16 @@ def _country_time_safe_impute_after_split(
     - Test : ülke içinde sadece ffill; baştaki NaN -> o ülkenin train son değeri
     
     """
-    tr = train_df.sort_values(["country", "year"]).copy()
-    te = test_df.sort_values(["country", "year"]).copy()
+    tr = train_df.copy()
+    te = test_df.copy()
 
     tr[cols] = tr[cols].replace([np.inf, -np.inf], np.nan)
     te[cols] = te[cols].replace([np.inf, -np.inf], np.nan)
 
-    def fill_train(g: pd.DataFrame) -> pd.DataFrame:
-        g[cols] = g[cols].interpolate(method="linear", limit_direction="both").ffill().bfill()
-        return g
+    tr = impute_by_group(tr, cols, mode="train")
 
-    tr = tr.groupby("country", group_keys=False).apply(fill_train)
-
-    # test: sadece geçmiş (ffill)
-    te = te.groupby("country", group_keys=False).apply(lambda g: g.assign(**{c: g[c].ffill() for c in cols}))
-
-    # test başındaki NaN -> ülkenin train son değeri
-    last_vals = tr.groupby("country")[cols].last()
-    te = te.set_index("country")
-    for c in cols:
-        te[c] = te[c].fillna(last_vals[c])
-    te = te.reset_index()
+    # test: sadece geçmiş (ffill); başındaki NaN -> ülkenin train son değeri
+    te = impute_by_group(te, cols, mode="test", seed=last_valid_by_group(tr, cols))
 
     return tr, te
 
@@ -174,6 +272,9 @@ def evaluate_model_multivariate_time_safe(data: pd.DataFrame) -> dict:
 
     Fark: Eksik değer doldurma split'ten sonra "time-safe" yapılır.
     """
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+
     print("\n--- Model Evaluation (Multivariate Global, TIME-SAFE) ---")
 
     # 1) Split önce (ham country-level veri)
@@ -232,41 +333,308 @@ def evaluate_model_multivariate_time_safe(data: pd.DataFrame) -> dict:
     return metrics
 
 
-def forecast_features(data: pd.DataFrame, future_years: np.ndarray) -> pd.DataFrame:
+# Rolling-origin (walk-forward) backtest için worker başına paylaşılan durum
+_BACKTEST_STATE: dict = {}
+
+
+def _init_backtest_worker(state: dict) -> None:
+    _BACKTEST_STATE.clear()
+    _BACKTEST_STATE.update(state)
+
+
+def _backtest_fold(origin: int) -> list[dict]:
+    """
+    Tek bir origin için: train [train_start, origin] time-safe imputasyon + global ortalama,
+    model bir kez fit edilir; her horizon test global ortalamasının ilk h yılıdır.
+    """
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+
+    panel = _BACKTEST_STATE["panel"]
+    cols = _BACKTEST_STATE["cols"]
+    test_global = _BACKTEST_STATE["test_global"]
+    horizons = _BACKTEST_STATE["horizons"]
+    train_start = _BACKTEST_STATE["train_start"]
+    last_year = _BACKTEST_STATE["last_year"]
+
+    train_imp = impute_by_group(panel[panel["year"] <= origin], cols, mode="train")
+    df_train = _build_global_avg(train_imp)
+    model_cols = [c for c in FEATURES if c in df_train.columns]
+    df_train = df_train.dropna(subset=["co2"] + model_cols)
+
+    df_test = test_global[(test_global["year"] > origin) & (test_global["year"] <= origin + max(horizons))]
+    df_test = df_test.dropna(subset=["co2"] + model_cols)
+    if len(df_train) < 2 or df_test.empty:
+        return []
+
+    model = LinearRegression()
+    model.fit(df_train[model_cols], df_train["co2"])
+    y_pred_all = model.predict(df_test[model_cols])
+
+    rows = []
+    for h in horizons:
+        if origin + h > last_year:
+            continue
+        sel = (df_test["year"] <= origin + h).to_numpy()
+        if not sel.any():
+            continue
+        y_test = df_test["co2"].to_numpy()[sel]
+        y_pred = y_pred_all[sel]
+        rows.append(
+            {
+                "origin": origin,
+                "horizon": h,
+                "train_period": f"{train_start}-{origin}",
+                "test_period": f"{origin + 1}-{origin + h}",
+                "n_test": int(sel.sum()),
+                "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
+                "mae": float(mean_absolute_error(y_test, y_pred)),
+                "r2": float(r2_score(y_test, y_pred)) if len(y_test) > 1 else np.nan,
+            }
+        )
+    return rows
+
+
+def backtest_multivariate_time_safe(
+    data: pd.DataFrame,
+    origins=range(2005, 2021),
+    horizons=range(1, 7),
+    train_start: int = 2000,
+    max_workers: int | None = None,
+    output_path: str | None = "metrics_backtest.csv",
+) -> pd.DataFrame:
+    """
+    evaluate_model_multivariate_time_safe ile aynı model ve imputasyon, çok sayıda
+    origin x horizon için walk-forward backtest.
+
+    - origin: train dönemi [train_start, origin]
+    - horizon h: test dönemi [origin+1, origin+h]
+
+    Tekrar kullanım:
+    - Test tarafı imputasyonu (ffill + train son değeri) nedensel olduğu için, tüm pencere
+      üzerinde tek bir ffill ile aynı sonucu verir; test global ortalaması bir kez hesaplanır.
+    - Her origin için model bir kez fit edilir; horizon'lar aynı tahminlerin önekleridir.
+    - Origin'ler bir process pool'da paralel çalışır.
+
+    Sonuç: (origin, horizon, rmse, mae, r2, ...) düzeninde tablo; output_path'e CSV yazılır.
+    """
+    print("\n--- Rolling-Origin Backtest (Multivariate Global, TIME-SAFE) ---")
+
+    origins = list(origins)
+    horizons = sorted(horizons)
+    last_year = int(data["year"].max())
+
+    cols = [c for c in (FEATURES + ["co2"]) if c in data.columns and c not in ["year", "country"]]
+    panel = data[data["year"] >= train_start].copy()
+    panel[cols] = panel[cols].replace([np.inf, -np.inf], np.nan)
+
+    test_imp = impute_by_group(panel, cols, mode="test")
+    state = {
+        "panel": panel,
+        "cols": cols,
+        "test_global": _build_global_avg(test_imp),
+        "horizons": horizons,
+        "train_start": train_start,
+        "last_year": last_year,
+    }
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_backtest_worker, initargs=(state,)) as pool:
+        fold_rows = list(pool.map(_backtest_fold, origins))
+
+    results = pd.DataFrame([row for rows in fold_rows for row in rows])
+    if not results.empty:
+        print(results.groupby("horizon")[["rmse", "mae", "r2"]].mean())
+
+    if output_path:
+        results.to_csv(output_path, index=False)
+        print(f"Backtest metrics saved to {output_path}")
+
+    return results
+
+
+def _trend_forecasts(
+    years: np.ndarray,
+    values: np.ndarray,
+    codes: np.ndarray,
+    names: list,
+    cols: list[str],
+    future_years: np.ndarray,
+    degree: int,
+    min_points: int,
+    store: ModelStore | None,
+) -> np.ndarray:
+    """
+    (ülke, sütun) trendlerini model store üzerinden tahmin eder: sadece önbellekte olmayan
+    seriler (toplu olarak) fit edilir. Dönüş: (n_ülke, n_yıl, n_sütun).
+    """
+    T, Y, valid = stack_series(years, values, codes, len(names))
+    n_cols = len(cols)
+    if len(T) == 0:
+        return np.empty((len(names), len(future_years), n_cols))
+
+    if store is None:
+        with span("fit:polynomial_trends", series=len(T), rows=int(valid.sum())):
+            trends = fit_polynomial_trends(T, Y, valid, degree, min_points)
+    else:
+        keys = []
+        for i in range(len(T)):
+            t, y = T[i, valid[i]], Y[i, valid[i]]
+            window = (int(t.min()), int(t.max())) if len(t) else None
+            keys.append((names[i // n_cols], cols[i % n_cols], degree, window, min_points, data_fingerprint(t, y)))
+
+        models = [store.get(key) for key in keys]
+        missing = [i for i, model in enumerate(models) if model is None]
+        if missing:
+            with span("fit:polynomial_trends", series=len(missing), rows=int(valid[missing].sum())):
+                fitted = fit_polynomial_trends(T[missing], Y[missing], valid[missing], degree, min_points)
+            for j, i in enumerate(missing):
+                models[i] = {field: arr[j] for field, arr in fitted.items()}
+                store.put(keys[i], models[i])
+        trends = {field: np.stack([model[field] for model in models]) for field in models[0]}
+
+    forecasts = predict_polynomial_trends(trends, future_years)
+    return forecasts.reshape(len(names), n_cols, -1).transpose(0, 2, 1)
+
+
+def forecast_features(
+    data: pd.DataFrame, future_years: np.ndarray, degree: int = 2, store: ModelStore | None = MODEL_STORE
+) -> pd.DataFrame:
     """
     her feature için year->feature polinom(2) ile tahmin.
+    Tüm feature'lar tek bir toplu fit ile çözülür (bkz. batched_regression.fit_polynomial_trends);
+    5'ten az nokta -> son değer. Fit edilmiş trendler model store'da saklanır.
     """
-    forecasts = {}
     feature_cols = [c for c in FEATURES if c != "year" and c in data.columns]
-    future_years_reshaped = future_years.reshape(-1, 1)
+    label = data["country"].iloc[0] if "country" in data.columns and data["country"].nunique() == 1 else "global"
+    forecasts = _trend_forecasts(
+        data["year"].to_numpy(),
+        data[feature_cols].to_numpy(dtype=np.float64, na_value=np.nan),
+        np.zeros(len(data), dtype=np.intp),
+        [label],
+        feature_cols,
+        future_years,
+        degree,
+        5,
+        store,
+    )
+    return pd.DataFrame(forecasts[0], columns=feature_cols, index=future_years.flatten())
 
-    for col in feature_cols:
-        df_feat = data[["year", col]].dropna()
-        if len(df_feat) < 5:
-            last_val = df_feat[col].iloc[-1] if not df_feat.empty else 0
-            forecasts[col] = np.full(len(future_years), last_val)
-            continue
 
-        X_feat = df_feat[["year"]]
-        y_feat = df_feat[col]
+def forecast_features_many(
+    data: pd.DataFrame,
+    future_years: np.ndarray,
+    cols: list[str] | None = None,
+    degree: int = 2,
+    min_points: int = 5,
+    store: ModelStore | None = MODEL_STORE,
+) -> pd.DataFrame:
+    """
+    forecast_features'ın tüm ülkeler için toplu versiyonu: her (ülke, sütun) trendi tek seferde fit edilir.
+    cols verilmezse FEATURES (year hariç) kullanılır. Önbellekte olan trendler tekrar fit edilmez.
+
+    Dönüş: uzun tablo (country, year, <cols>); ülke sırası verideki ilk görünme sırasıdır.
+    """
+    feature_cols = cols if cols is not None else [c for c in FEATURES if c != "year" and c in data.columns]
+    data = data[data["country"].notna()]
+
+    codes, names = pd.factorize(data["country"])
+    order = np.argsort(codes, kind="stable")
+    forecasts = _trend_forecasts(
+        data["year"].to_numpy()[order],
+        data[feature_cols].to_numpy(dtype=np.float64, na_value=np.nan)[order],
+        codes[order],
+        list(names),
+        feature_cols,
+        future_years,
+        degree,
+        min_points,
+        store,
+    )
 
-        poly_feat = PolynomialFeatures(degree=2)
-        X_poly_feat = poly_feat.fit_transform(X_feat)
+    result = pd.DataFrame(forecasts.reshape(-1, len(feature_cols)), columns=feature_cols)
+    result.insert(0, "year", np.tile(future_years, len(names)))
+    result.insert(0, "country", np.repeat(np.asarray(names, dtype=object), len(future_years)))
+    return result
 
-        model_feat = LinearRegression()
-        model_feat.fit(X_poly_feat, y_feat)
 
-        future_poly = poly_feat.transform(future_years_reshaped)
-        forecasts[col] = model_feat.predict(future_poly)
+INTERVAL_MODES = ("analytic", "bootstrap")
 
-    return pd.DataFrame(forecasts, index=future_years.flatten())
 
+def _check_interval(interval: str) -> None:
+    if interval not in INTERVAL_MODES:
+        raise ValueError(f"Bilinmeyen aralık modu: {interval} (beklenen: {INTERVAL_MODES})")
+
+
+def _bootstrap_bands(
+    X: np.ndarray,
+    y: np.ndarray,
+    mask: np.ndarray,
+    history: pd.DataFrame,
+    history_codes: np.ndarray,
+    n_groups: int,
+    model_cols: list[str],
+    future_years: np.ndarray,
+    bootstrap: dict,
+    keys: list[str],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    predict_co2_multivariate(_many) için bootstrap aralıkları: feature trendleri (geçmişin
+    tamamı, forecast_features ile aynı) ve CO2 modeli her örnekte yeniden fit edilir.
+    history_codes: history satırlarının grup kodları (sıralı). bootstrap: n_boot, block,
+    level, seed, jobs (bkz. bootstrap_intervals.bootstrap_forecast_intervals). keys: grup
+    etiketleri (ülke adları); rastgele akışlar (seed, ülke) çiftinden türetildiği için bir
+    ülkenin bandı tekli ve toplu çağrıda aynıdır.
+    """
+    from sklearn.linear_model import LinearRegression
+
+    feature_cols = [c for c in model_cols if c != "year"]
+    T, Y, valid = stack_series(
+        history["year"].to_numpy(), history[feature_cols].to_numpy(dtype=np.float64, na_value=np.nan), history_codes, n_groups
+    )
+    return bootstrap_forecast_intervals(
+        X,
+        y,
+        mask,
+        T,
+        Y,
+        valid,
+        future_years,
+        feature_slots=[model_cols.index(c) for c in feature_cols],
+        year_slot=model_cols.index("year") if "year" in model_cols else None,
+        rcond=getattr(LinearRegression(), "tol", None),
+        keys=keys,
+        **bootstrap,
+    )
+
+
+def predict_co2_multivariate(
+    data: pd.DataFrame | PanelIndex,
+    country_name: str | None = None,
+    interval: str = "analytic",
+    bootstrap: dict | None = None,
+    yearly: pd.DataFrame | None = None,
+):
+    """
+    data: EDA paneli (DataFrame veya PanelIndex; PanelIndex ile ülke dilimi taramasız alınır).
+    interval: "analytic" (varsayılan, 1.96 * std_error * sqrt(h)) veya "bootstrap" (feature
+    trendleri ve model yeniden örneklenerek; bootstrap: n_boot, block, level, seed, jobs).
+    yearly: küresel tahmin için hazır yıllık ortalamalar (_build_global_avg / artımlı
+    snapshot); verilmezse data üzerinden hesaplanır.
+    """
+    from sklearn.linear_model import LinearRegression
+
+    _check_interval(interval)
+    if isinstance(data, PanelIndex):
+        panel, data = data, data.frame
+    else:
+        panel = None
 
-def predict_co2_multivariate(data: pd.DataFrame, country_name: str | None = None):
-   
     if country_name:
-        df_subset = data[data["country"] == country_name].copy()
+        df_subset = (panel.country(country_name) if panel is not None else data[data["country"] == country_name]).copy()
         title_suffix = f" ({country_name})"
+    elif yearly is not None:
+        df_subset = yearly
+        title_suffix = " (Global Average)"
     else:
         cols = list(set(FEATURES + ["co2"]))
         if "year" in cols:
@@ -284,8 +652,15 @@ def predict_co2_multivariate(data: pd.DataFrame, country_name: str | None = None
     X = df_train[model_cols]
     y = df_train["co2"]
 
-    model = LinearRegression()
-    model.fit(X, y)
+    label = country_name or "global"
+    # "sklearn": LinearRegression nesnesi (predict_co2_multivariate_many ise "ols" sözlüğü saklar)
+    key = (label, "co2", "sklearn", 1, (2000, 2024), tuple(model_cols), data_fingerprint(X.to_numpy(dtype=np.float64), y.to_numpy()))
+
+    def fit():
+        with span("fit:LinearRegression", country=label, rows=len(X)):
+            return LinearRegression().fit(X, y)
+
+    model = MODEL_STORE.get_or_fit(key, fit)
 
     future_years = np.arange(2025, 2029)
     future_features_df = forecast_features(df_subset, future_years)
@@ -293,6 +668,22 @@ def predict_co2_multivariate(data: pd.DataFrame, country_name: str | None = None
     X_future = future_features_df[model_cols]
     predictions = model.predict(X_future)
 
+    if interval == "bootstrap":
+        X_rows = X.to_numpy(dtype=np.float64)[None]
+        lower, upper = _bootstrap_bands(
+            X_rows,
+            y.to_numpy(dtype=np.float64)[None],
+            np.ones(X_rows.shape[:2], dtype=bool),
+            df_subset,
+            np.zeros(len(df_subset), dtype=np.intp),
+            1,
+            model_cols,
+            future_years,
+            bootstrap or {},
+            [label],
+        )
+        return df_train, future_years, predictions, model, lower[0], upper[0]
+
     y_pred_train = model.predict(X)
     residuals = y - y_pred_train
     std_error = np.std(residuals)
@@ -306,386 +697,1019 @@ def predict_co2_multivariate(data: pd.DataFrame, country_name: str | None = None
     return df_train, future_years, predictions, model, np.array(ci_lower), np.array(ci_upper)
 
 
-if __name__ == "__main__":
-    df = load()
+def predict_co2_multivariate_many(
+    data: pd.DataFrame | PanelIndex,
+    countries: list[str] | None = None,
+    future_years: np.ndarray = np.arange(2025, 2029),
+    include_history: bool = False,
+    interval: str = "analytic",
+    bootstrap: dict | None = None,
+) -> pd.DataFrame:
+    """
+    predict_co2_multivariate(data, country) ile aynı model, tüm ülkeler (veya seçilen alt küme)
+    için tek geçişte:
+    - veri bir kez gruplanır,
+    - ülke başına LinearRegression yerine yığın halindeki en küçük kareler problemleri
+      NumPy ile toplu çözülür (bkz. batched_regression),
+    - sonuç tek bir uzun (long) DataFrame olarak döner.
+
+    Kolonlar: country, year, prediction, ci_lower, ci_upper
+    include_history=True ise eğitim satırları da (co2 dolu, prediction boş) eklenir.
+    En az 10 eğitim satırı olmayan ülkeler atlanır.
+    data bir PanelIndex ise ülke alt kümesi ofsetlerden alınır.
+    interval="bootstrap": aralıklar tüm ülkeler için toplu bootstrap ile (bkz. _bootstrap_bands).
+    """
+    from sklearn.linear_model import LinearRegression
 
-    
-    evaluate_model_multivariate_time_safe(df)
+    _check_interval(interval)
+    if isinstance(data, PanelIndex):
+        df_subset = data.frame if countries is None else data.select(countries)
+    else:
+        df_subset = data if countries is None else data[data["country"].isin(countries)]
+    model_cols = [c for c in FEATURES if c in df_subset.columns]
 
-   
-    df_eda = clean_and_balance_data_for_eda(df.copy())
+    df_subset = df_subset.sort_values(["country", "year"])
 
-   
-    output_dir = "img"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    df_train = df_subset[(df_subset["year"] >= 2000) & (df_subset["year"] <= 2024)].dropna(subset=["co2"] + model_cols)
+    counts = df_train.groupby("country", sort=False).size()
+    df_train = df_train[df_train["country"].isin(counts[counts >= 10].index)]
+
+    columns = ["country", "year", "prediction", "ci_lower", "ci_upper"] + (["co2"] if include_history else [])
+    if df_train.empty:
+        return pd.DataFrame(columns=columns)
+
+    codes, names = pd.factorize(df_train["country"])
+    n_groups = len(names)
+
+    X_rows = df_train[model_cols].to_numpy(dtype=np.float64)
+    y_rows = df_train["co2"].to_numpy(dtype=np.float64)
+    X, mask, _ = stack_groups(X_rows, codes, n_groups)
+    y, _, _ = stack_groups(y_rows, codes, n_groups)
+
+    # Model store: verisi değişmeyen ülkeler tekrar fit edilmez. "ols": {"coef", "intercept",
+    # "std_error"} sözlüğü; predict_co2_multivariate'in "sklearn" kayıtlarıyla karışmaz.
+    bounds = np.searchsorted(codes, np.arange(n_groups + 1))
+    keys = [
+        (name, "co2", "ols", 1, (2000, 2024), tuple(model_cols), data_fingerprint(X_rows[bounds[g]:bounds[g + 1]], y_rows[bounds[g]:bounds[g + 1]]))
+        for g, name in enumerate(names)
+    ]
+    models = [MODEL_STORE.get(key) for key in keys]
+    missing = [g for g, model in enumerate(models) if model is None]
+    if missing:
+        # LinearRegression ile aynı tekil değer eşiği (sklearn >= 1.7: tol, öncesi: makine epsilon)
+        X_m, y_m, mask_m = X[missing], y[missing], mask[missing]
+        with span("fit:ols_batched", countries=len(missing), rows=int(mask_m.sum())):
+            coef_m, intercept_m = fit_ols_batched(X_m, y_m, mask_m, rcond=getattr(LinearRegression(), "tol", None))
+
+        # Artıkların standart sapması (np.std, ddof=0), sadece geçerli satırlar üzerinde
+        residuals = np.where(mask_m, y_m - predict_batched(X_m, coef_m, intercept_m), 0.0)
+        count = mask_m.sum(axis=1)
+        res_mean = residuals.sum(axis=1) / count
+        std_m = np.sqrt((np.where(mask_m, residuals - res_mean[:, None], 0.0) ** 2).sum(axis=1) / count)
+
+        for j, g in enumerate(missing):
+            models[g] = {"coef": coef_m[j], "intercept": intercept_m[j], "std_error": std_m[j]}
+            MODEL_STORE.put(keys[g], models[g])
+
+    coef = np.stack([model["coef"] for model in models])
+    intercept = np.array([model["intercept"] for model in models])
+    std_error = np.array([model["std_error"] for model in models])
+
+    # Gelecek feature'ları (ülke geçmişinin tamamı üzerinden trend, tüm ülkeler tek fit)
+    df_history = df_subset[df_subset["country"].isin(names)]
+    future_features_df = forecast_features_many(df_history, future_years)
+    X_future = (
+        future_features_df.set_index("country")
+        .loc[names, model_cols]
+        .to_numpy(dtype=np.float64)
+        .reshape(n_groups, len(future_years), len(model_cols))
+    )
 
-    
-    COUNTRY_COLORS = {
-        "China": "#E74C3C",  
-        "United States": "#3498DB",  
-        "Germany": "#F1C40F",  
-        "Russia": "#8E44AD",  
-        "Turkey": "#E67E22",  
-        "India": "#2ECC71",  
-    }
+    predictions = predict_batched(X_future, coef, intercept)
+    if interval == "bootstrap":
+        history_codes = pd.Index(names).get_indexer(df_history["country"])
+        ci_lower, ci_upper = _bootstrap_bands(X, y, mask, df_history, history_codes, n_groups, model_cols, future_years, bootstrap or {}, names)
+    else:
+        margin = 1.96 * std_error[:, None] * np.sqrt(np.arange(1, len(future_years) + 1))[None, :]
+        ci_lower, ci_upper = predictions - margin, predictions + margin
+
+    result = pd.DataFrame(
+        {
+            "country": np.repeat(np.asarray(names, dtype=object), len(future_years)),
+            "year": np.tile(future_years, n_groups),
+            "prediction": predictions.ravel(),
+            "ci_lower": ci_lower.ravel(),
+            "ci_upper": ci_upper.ravel(),
+        }
+    )
+
+    if include_history:
+        history = df_train[["country", "year", "co2"]].assign(prediction=np.nan, ci_lower=np.nan, ci_upper=np.nan)
+        result = pd.concat([history, result], ignore_index=True).sort_values(["country", "year"], kind="stable")
+
+    return result.reset_index(drop=True)[columns]
+
+def run_incremental(
+    data: pd.DataFrame,
+    snapshot_path: str = ".cache/report_snapshot.pkl",
+    report_path: str | None = "incremental_report.json",
+) -> tuple[pd.DataFrame, pd.DataFrame, list[str]]:
+    """
+    Artımlı mod: yeni veri sürümünü saklanan snapshot ile karşılaştırır, sadece etkilenen
+    (ülke, sütun, yıl penceresi) aralıklarını yeniden doldurur, yıllık global ortalamaları
+    günceller ve girdisi değişen rapor çıktılarını listeler.
 
-    # 1. Yıllara Göre Genel CO2 Artışı
+    Snapshot yoksa (veya imputasyon sütunları değiştiyse) tam hesaplama yapılır ve tüm
+    çıktılar geçersiz sayılır.
+
+    Çıktılar hem figürler (FIGURE_INPUTS) hem metrik dosyalarıdır (METRIC_INPUTS).
+
+    Dönüş: (clean_and_balance_data_for_eda ile aynı doldurulmuş panel, snapshot'taki toplam /
+    sayılardan yıllık global ortalamalar (_build_global_avg ile aynı), geçersiz çıktılar)
+    """
+    print("\n--- Incremental Ingestion ---")
+    cols = sorted(c for c in set(FEATURES + ["co2"]) if c in data.columns and c != "year")
+    extra_cols = [
+        c for c in REPORT_COLUMNS
+        if c in data.columns and c not in cols + ["country", "year"] and pd.api.types.is_numeric_dtype(data[c])
+    ]
+
+    output_inputs = {**FIGURE_INPUTS, **METRIC_INPUTS}
+    snapshot = load_snapshot(snapshot_path)
+    if snapshot is None or snapshot["cols"] != cols or snapshot["extra_cols"] != extra_cols:
+        print("No compatible snapshot found, running full imputation.")
+        snapshot = build_snapshot(data, cols, extra_cols)
+        invalidated = list(output_inputs)
+        summary = {"mode": "full", "invalidated": invalidated}
+    else:
+        snapshot, report = incremental_update(snapshot, data)
+        invalidated = invalidated_outputs(report["changed_cells"], output_inputs)
+        changes = report["changes"].drop_duplicates(["country", "year", "change"])
+        summary = {
+            "mode": "incremental",
+            "rows": changes["change"].value_counts().to_dict(),
+            "spans": report["spans"].to_dict(orient="records"),
+            "changed_cells": len(report["changed_cells"]),
+            "global_avg_years": report["years"],
+            "invalidated": invalidated,
+        }
+        print(f"Changed rows: {summary['rows'] or 'none'}")
+        print(f"Re-imputed spans (country x column): {len(report['spans'])}")
+        print(f"Changed imputed cells: {summary['changed_cells']}")
+        print(f"Global average years updated: {len(report['years'])}")
+
+    save_snapshot(snapshot, snapshot_path)
+    print(f"Invalidated outputs ({len(invalidated)}/{len(output_inputs)}): {invalidated}")
+
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(summary, f, default=str, indent=2)
+        print(f"Incremental report saved to {report_path}")
+
+    return snapshot["imputed"], global_avg(snapshot), invalidated
+
+
+@renderer("global_trend")
+def _draw_global_trend(fig, data: dict) -> None:
+    import seaborn as sns
+
+    ax = fig.add_subplot()
+    sns.lineplot(data=data["yearly"], x="year", y="co2", estimator="mean", errorbar=None, color="black", ax=ax)
+    ax.set_title("Average Global CO2 Emissions Over Years")
+    ax.set_ylabel("CO2 Emissions (Million Tonnes)")
+    ax.set_xlabel("Year")
+    ax.grid(True, linestyle="--", alpha=0.7)
+
+
+def section_global_trend(ctx: dict) -> None:
+    """1. Yıllara Göre Genel CO2 Artışı"""
+    output_dir = ctx["output_dir"]
     print("--- General CO2 Increase Over Years ---")
-    yearly_co2 = df_eda.groupby("year")["co2"].mean()
+    yearly_co2 = ctx["global_avg"].set_index("year")["co2"]
     print(yearly_co2.tail())
 
-    plt.figure(figsize=(12, 6))
-    sns.lineplot(data=df_eda, x="year", y="co2", estimator="mean", errorbar=None, color="black")
-    plt.title("Average Global CO2 Emissions Over Years")
-    plt.ylabel("CO2 Emissions (Million Tonnes)")
-    plt.xlabel("Year")
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"{output_dir}/global_co2_trend.png")
-    print(f"Saved {output_dir}/global_co2_trend.png")
+    path = f"{output_dir}/global_co2_trend.png"
+    emit(figure_spec("global_trend", path, (12, 6), yearly=yearly_co2.dropna().reset_index()))
+    print(f"Saved {path}")
+
+
+@renderer("country_lines")
+def _draw_country_lines(fig, data: dict) -> None:
+    """Rapor ülkeleri için tek sütunun (data["y"]) zaman serisi, ülke renkleriyle."""
+    import seaborn as sns
+
+    ax = fig.add_subplot()
+    sns.lineplot(data=data["frame"], x="year", y=data["y"], hue="country", palette=data["palette"], ax=ax)
+    ax.set_title(data["title"])
+    ax.set_ylabel(data["ylabel"])
+    ax.set_xlabel("Year")
+    ax.legend(title="Country")
+    ax.grid(True, linestyle="--", alpha=0.7)
+
+
+def _country_lines_spec(df_countries: pd.DataFrame, y: str, path: str, title: str, ylabel: str) -> dict:
+    return figure_spec(
+        "country_lines",
+        path,
+        (12, 6),
+        frame=df_countries[["country", "year", y]],
+        y=y,
+        palette=COUNTRY_COLORS,
+        title=title,
+        ylabel=ylabel,
+    )
+
 
-    # 2. Ülkeye Özgü Analiz
+def section_country_trend(ctx: dict) -> None:
+    """2. Ülkeye Özgü Analiz"""
+    df_countries = ctx["df_countries"]
+    output_dir = ctx["output_dir"]
     print("\n--- Country-Specific Analysis ---")
-    countries = ["China", "United States", "Russia", "Turkey", "Germany", "India"]
-    df_countries = df_eda[df_eda["country"].isin(countries)]
-
-    plt.figure(figsize=(12, 6))
-    sns.lineplot(data=df_countries, x="year", y="co2", hue="country", palette=COUNTRY_COLORS)
-    plt.title("CO2 Emissions by Country")
-    plt.ylabel("CO2 Emissions (Million Tonnes)")
-    plt.xlabel("Year")
-    plt.legend(title="Country")
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"{output_dir}/country_co2_trend.png")
-    print(f"Saved {output_dir}/country_co2_trend.png")
-
-    # 3. Korelasyon Analizi
+
+    path = f"{output_dir}/country_co2_trend.png"
+    emit(_country_lines_spec(df_countries, "co2", path, "CO2 Emissions by Country", "CO2 Emissions (Million Tonnes)"))
+    print(f"Saved {path}")
+
+
+CORRELATION_COLUMNS = ["co2", "gdp", "population", "energy_per_capita", "co2_per_capita", "methane", "nitrous_oxide"]
+
+
+def correlation_matrix(df_eda: pd.DataFrame, since: int = 1990) -> pd.DataFrame | None:
+    """since yılından sonraki tam satırlar üzerinde korelasyon matrisi; veri yoksa None."""
+    cols_to_corr = [c for c in CORRELATION_COLUMNS if c in df_eda.columns]
+    df_corr = df_eda[df_eda["year"] > since][cols_to_corr].dropna()
+    return None if df_corr.empty else df_corr.corr()
+
+
+@renderer("correlation_heatmap")
+def _draw_correlation_heatmap(fig, data: dict) -> None:
+    import seaborn as sns
+
+    ax = fig.add_subplot()
+    sns.heatmap(data["corr"], annot=True, cmap="coolwarm", fmt=".2f", ax=ax)
+    ax.set_title("Correlation Matrix (Post-1990)")
+
+
+def section_correlation(ctx: dict) -> None:
+    """3. Korelasyon Analizi"""
+    df_eda = ctx["df_eda"]
+    output_dir = ctx["output_dir"]
     print("\n--- Correlation Analysis ---")
-    cols_to_corr = ["co2", "gdp", "population", "energy_per_capita", "co2_per_capita", "methane", "nitrous_oxide"]
-    cols_to_corr = [c for c in cols_to_corr if c in df_eda.columns]
-    df_corr = df_eda[df_eda["year"] > 1990][cols_to_corr].dropna()
+    corr_matrix = correlation_matrix(df_eda)
 
-    if not df_corr.empty:
-        corr_matrix = df_corr.corr()
+    if corr_matrix is not None:
         print(corr_matrix)
 
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(corr_matrix, annot=True, cmap="coolwarm", fmt=".2f")
-        plt.title("Correlation Matrix (Post-1990)")
-        plt.savefig(f"{output_dir}/correlation_matrix.png")
-        print(f"Saved {output_dir}/correlation_matrix.png")
+        path = f"{output_dir}/correlation_matrix.png"
+        emit(figure_spec("correlation_heatmap", path, (10, 8), corr=corr_matrix))
+        print(f"Saved {path}")
+
+
+def _axes_call(method: str, *args, **kwargs) -> tuple:
+    """line_chart spec'i için tek Axes çağrısı: (metot, args, kwargs)."""
+    return method, args, kwargs
 
-    # 4. Gelişmiş Analiz ve Tahmin (Multivariate)
+
+@renderer("line_chart")
+def _draw_line_chart(fig, data: dict) -> None:
+    """
+    Sadece matplotlib çağrılarından oluşan grafikler: data["calls"] sırayla uygulanan
+    (Axes metodu, args, kwargs) üçlüleridir; ardından başlık, eksen adları, lejant ve ızgara.
+    """
+    ax = fig.add_subplot()
+    for method, args, kwargs in data["calls"]:
+        getattr(ax, method)(*args, **kwargs)
+    ax.set_title(data["title"])
+    ax.set_ylabel(data["ylabel"])
+    ax.set_xlabel("Year")
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.7)
+
+
+@renderer("global_forecast")
+def _draw_global_forecast(fig, data: dict) -> None:
+    import seaborn as sns
+
+    ax = fig.add_subplot()
+    sns.lineplot(data=data["history"], x="year", y="co2", label="Historical (2000-2024)", color="black", ax=ax)
+    ax.plot(data["future_years"], data["pred"], color="red", linestyle="--", label="Multivariate Prediction (2025-2028)")
+    ax.fill_between(
+        data["future_years"].flatten(), data["ci_lower"], data["ci_upper"], color="red", alpha=0.2, label="95% Confidence Interval"
+    )
+    ax.set_title("Global CO2 Emissions Forecast (Multivariate Model)")
+    ax.set_ylabel("CO2 Emissions (Million Tonnes)")
+    ax.set_xlabel("Year")
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.7)
+
+
+def section_forecast(ctx: dict) -> None:
+    """4. Gelişmiş Analiz ve Tahmin (Multivariate)"""
+    panel = ctx["panel"]
+    output_dir = ctx["output_dir"]
     print("\n--- Advanced Analysis & Multivariate Prediction ---")
 
     # Küresel Tahmin
-    df_train_global, future_years, pred_global, model_global, ci_lower_global, ci_upper_global = predict_co2_multivariate(df_eda)
+    df_train_global, future_years, pred_global, model_global, ci_lower_global, ci_upper_global = predict_co2_multivariate(panel, yearly=ctx["global_avg"])
 
-    plt.figure(figsize=(12, 6))
     if df_train_global is not None:
-        sns.lineplot(data=df_train_global, x="year", y="co2", label="Historical (2000-2024)", color="black")
-        plt.plot(future_years, pred_global, color="red", linestyle="--", label="Multivariate Prediction (2025-2028)")
-        plt.fill_between(
-            future_years.flatten(), ci_lower_global, ci_upper_global, color="red", alpha=0.2, label="95% Confidence Interval"
+        path = f"{output_dir}/global_forecast_multivariate.png"
+        emit(
+            figure_spec(
+                "global_forecast",
+                path,
+                (12, 6),
+                history=df_train_global[["year", "co2"]],
+                future_years=future_years,
+                pred=pred_global,
+                ci_lower=ci_lower_global,
+                ci_upper=ci_upper_global,
+            )
         )
-        plt.title("Global CO2 Emissions Forecast (Multivariate Model)")
-        plt.ylabel("CO2 Emissions (Million Tonnes)")
-        plt.xlabel("Year")
-        plt.legend()
-        plt.grid(True, linestyle="--", alpha=0.7)
-        plt.savefig(f"{output_dir}/global_forecast_multivariate.png")
-        print(f"Saved {output_dir}/global_forecast_multivariate.png")
+        print(f"Saved {path}")
 
     # Ülke Bazlı Tahminler
-    plt.figure(figsize=(14, 7))
-    for country in countries:
-        df_train, future_years, preds, model, ci_lower, ci_upper = predict_co2_multivariate(df_eda, country)
-        if preds is not None:
+    calls = []
+    country_forecasts = predict_co2_multivariate_many(panel, REPORT_COUNTRIES, include_history=True)
+    forecasts_by_country = dict(tuple(country_forecasts.groupby("country", sort=False)))
+    for country in REPORT_COUNTRIES:
+        if country in forecasts_by_country:
+            df_country = forecasts_by_country[country]
+            df_train = df_country[df_country["prediction"].isna()]
+            df_pred = df_country[df_country["prediction"].notna()]
+            future_years = df_pred["year"].to_numpy()
+            preds = df_pred["prediction"].to_numpy()
+
             color = COUNTRY_COLORS.get(country, "gray")
-            plt.plot(df_train["year"], df_train["co2"], label=f"{country} Historical", color=color, alpha=0.6)
-            plt.plot(future_years, preds, linestyle="--", label=f"{country} Prediction", color=color, linewidth=2)
-            plt.fill_between(future_years.flatten(), ci_lower, ci_upper, color=color, alpha=0.1)
+            calls.append(_axes_call("plot", df_train["year"], df_train["co2"], label=f"{country} Historical", color=color, alpha=0.6))
+            calls.append(_axes_call("plot", future_years, preds, linestyle="--", label=f"{country} Prediction", color=color, linewidth=2))
+            calls.append(_axes_call("fill_between", future_years, df_pred["ci_lower"], df_pred["ci_upper"], color=color, alpha=0.1))
 
             last_hist = df_train["co2"].iloc[-1]
             last_pred = preds[-1]
             trend = "Increasing" if last_pred > last_hist else "Decreasing"
             print(f"{country}: Trend is {trend} (2028 Pred: {last_pred:.2f} vs Last Hist: {last_hist:.2f})")
+        else:
+            print(f"Not enough data for  ({country})")
+
+    path = f"{output_dir}/country_forecasts_multivariate.png"
+    emit(
+        figure_spec(
+            "line_chart",
+            path,
+            (14, 7),
+            calls=calls,
+            title="CO2 Emissions Forecast by Country (Multivariate, 2025-2028)",
+            ylabel="CO2 Emissions (Million Tonnes)",
+        )
+    )
+    print(f"Saved {path}")
 
-    plt.title("CO2 Emissions Forecast by Country (Multivariate, 2025-2028)")
-    plt.ylabel("CO2 Emissions (Million Tonnes)")
-    plt.xlabel("Year")
-    plt.legend()
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"{output_dir}/country_forecasts_multivariate.png")
-    print(f"Saved {output_dir}/country_forecasts_multivariate.png")
 
-    # 5. Sürücü Analizi ve Öneriler
+# Sürücü analizi: co2 ile korelasyonu incelenen sütunlar ve (sürücü, eşik, öneri) kuralları
+DRIVER_COLUMNS = ["gdp", "energy_per_capita", "population"]
+DRIVER_RULES = [
+    ("gdp", 0.9, "Focus on decoupling economic growth from emissions (Green Growth)."),
+    ("energy_per_capita", 0.9, "High energy dependency. Prioritize renewable energy transition and efficiency."),
+    ("population", 0.9, "Population growth is a major driver. Focus on sustainable urban planning."),
+]
+
+
+def section_drivers(ctx: dict) -> None:
+    """5. Sürücü Analizi ve Öneriler"""
+    panel = ctx["panel"]
     print("\n--- Driver Analysis & Recommendations ---")
-    for country in countries:
-        country_data = df_eda[df_eda["country"] == country].dropna(subset=["co2", "gdp", "energy_per_capita", "population"])
-        if len(country_data) > 10:
-            corr = country_data[["co2", "gdp", "energy_per_capita", "population"]].corr()["co2"]
-            print(f"\nReport for {country}:")
-            print(f"  - CO2 Correlation with GDP: {corr.get('gdp', 0):.2f}")
-            print(f"  - CO2 Correlation with Energy: {corr.get('energy_per_capita', 0):.2f}")
-
-            if corr.get("gdp", 0) > 0.9:
-                print("  -> Recommendation: Focus on decoupling economic growth from emissions (Green Growth).")
-            if corr.get("energy_per_capita", 0) > 0.9:
-                print("  -> Recommendation: High energy dependency. Prioritize renewable energy transition and efficiency.")
-            if corr.get("population", 0) > 0.9:
-                print("  -> Recommendation: Population growth is a major driver. Focus on sustainable urban planning.")
-
-    # 6. Azaltım Senaryoları
+    # Tüm ülkeler tek geçişte; listwise = önce dropna(subset=...) sonra corr() ile aynı
+    corr = group_corr(panel, "co2", DRIVER_COLUMNS, nan_policy="listwise", countries=REPORT_COUNTRIES)
+    corr = corr[corr["n"] > 10]
+    recommendations = apply_rules(corr, DRIVER_RULES)
+
+    for country, country_corr in corr.groupby("country", sort=False):
+        by_driver = dict(zip(country_corr["driver"], country_corr["corr"]))
+        print(f"\nReport for {country}:")
+        print(f"  - CO2 Correlation with GDP: {by_driver['gdp']:.2f}")
+        print(f"  - CO2 Correlation with Energy: {by_driver['energy_per_capita']:.2f}")
+        for text in recommendations.loc[recommendations["country"] == country, "recommendation"]:
+            print(f"  -> Recommendation: {text}")
+
+
+def section_scenarios(ctx: dict) -> None:
+    """6. Azaltım Senaryoları"""
+    panel = ctx["panel"]
     print("\n--- Reduction Scenarios ---")
     target_year = 2050
     current_year = 2024
-    years_remaining = target_year - current_year
 
-    for country in countries:
-        country_data = df_eda[(df_eda["country"] == country) & (df_eda["year"] == current_year)]
-        if not country_data.empty:
-            current_co2 = country_data["co2"].values[0]
-        else:
-            country_data_all = df_eda[df_eda["country"] == country].dropna(subset=["co2"])
-            if not country_data_all.empty:
-                current_co2 = country_data_all["co2"].iloc[-1]
-            else:
-                continue
+    # Tüm ülkeler için mevcut değer (2024 veya son geçerli yıl) ve gereken oran tek geçişte
+    scenarios = reduction_scenarios(panel, target_years=(target_year,), reductions=(0.5,), current_year=current_year, countries=REPORT_COUNTRIES)
+    for row in scenarios.itertuples(index=False):
+        print(f"{row.country}: To halve emissions by 2050, needs {row.annual_reduction_pct:.2f}% annual reduction.")
 
-        target_co2 = current_co2 * 0.5
-        required_reduction = (1 - (target_co2 / current_co2) ** (1 / years_remaining)) * 100
-        print(f"{country}: To halve emissions by 2050, needs {required_reduction:.2f}% annual reduction.")
 
-    # 7. Kişi Başına CO2 Analizi
+def section_per_capita(ctx: dict) -> None:
+    """7. Kişi Başına CO2 Analizi"""
+    df_countries = ctx["df_countries"]
+    output_dir = ctx["output_dir"]
     print("\n--- CO2 per Capita Analysis ---")
-    plt.figure(figsize=(12, 6))
-    sns.lineplot(data=df_countries, x="year", y="co2_per_capita", hue="country", palette=COUNTRY_COLORS)
-    plt.title("CO2 Emissions per Capita by Country")
-    plt.ylabel("CO2 per Capita (Tonnes)")
-    plt.xlabel("Year")
-    plt.legend(title="Country")
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"{output_dir}/co2_per_capita_trend.png")
-    print(f"Saved {output_dir}/co2_per_capita_trend.png")
-
-    # 8. Nüfus ve CO2 Büyüme Analizi
+    path = f"{output_dir}/co2_per_capita_trend.png"
+    emit(_country_lines_spec(df_countries, "co2_per_capita", path, "CO2 Emissions per Capita by Country", "CO2 per Capita (Tonnes)"))
+    print(f"Saved {path}")
+
+
+@renderer("growth_index")
+def _draw_growth_index(fig, data: dict) -> None:
+    """CO2 ve nüfus endeksleri, iki y ekseninde (başlık ve ızgara ikinci eksende)."""
+    color_co2 = data["color"]
+    color_pop = "black"
+    ax1 = fig.subplots()
+
+    ax1.set_xlabel("Year")
+    ax1.set_ylabel("CO2 Emissions (Index 2004=100)", color=color_co2)
+    ax1.plot(data["year"], data["co2_index"], color=color_co2, label="CO2 Growth", linewidth=2)
+    ax1.tick_params(axis="y", labelcolor=color_co2)
+
+    ax2 = ax1.twinx()
+    ax2.set_ylabel("Population (Index 2004=100)", color=color_pop)
+    ax2.plot(data["year"], data["pop_index"], color=color_pop, linestyle="--", label="Population Growth")
+    ax2.tick_params(axis="y", labelcolor=color_pop)
+
+    ax2.set_title(data["title"])
+    fig.tight_layout()
+    ax2.grid(True, linestyle="--", alpha=0.5)
+
+
+def section_population_growth(ctx: dict) -> None:
+    """8. Nüfus ve CO2 Büyüme Analizi"""
+    panel = ctx["panel"]
+    output_dir = ctx["output_dir"]
     print("\n--- Population vs CO2 Growth Analysis ---")
     start_year_growth = 2004
     end_year_growth = 2024
 
-    for country in countries:
-        country_data = df_eda[
-            (df_eda["country"] == country) & (df_eda["year"] >= start_year_growth) & (df_eda["year"] <= end_year_growth)
-        ].sort_values("year")
+    # Taban yılı endeksleri tüm ülkeler için tek geçişte; ülke başına sadece grafik spec'i
+    indices = growth_indices(panel, ("population", "co2"), start_year_growth, end_year_growth, countries=REPORT_COUNTRIES)
+    for country, country_data in indices.groupby("country", sort=False):
+        if country_data["base_valid"].iat[0]:
+            path = f"{output_dir}/pop_vs_co2_{country}.png"
+            spec = figure_spec(
+                "growth_index",
+                path,
+                (10, 6),
+                year=country_data["year"],
+                co2_index=country_data["co2_index"],
+                pop_index=country_data["population_index"],
+                color=COUNTRY_COLORS.get(country, "tab:red"),
+                title=f"{country}: Population vs CO2 Growth (Indexed)",
+            )
+            emit(spec)
+            print(f"Saved {path}")
+
 
-        if not country_data.empty:
-            base_pop = country_data["population"].iloc[0]
-            base_co2 = country_data["co2"].iloc[0]
-
-            if base_pop > 0 and base_co2 > 0:
-                country_data["pop_index"] = (country_data["population"] / base_pop) * 100
-                country_data["co2_index"] = (country_data["co2"] / base_co2) * 100
-
-                fig, ax1 = plt.subplots(figsize=(10, 6))
-                color_co2 = COUNTRY_COLORS.get(country, "tab:red")
-                color_pop = "black"
-
-                ax1.set_xlabel("Year")
-                ax1.set_ylabel("CO2 Emissions (Index 2004=100)", color=color_co2)
-                ax1.plot(country_data["year"], country_data["co2_index"], color=color_co2, label="CO2 Growth", linewidth=2)
-                ax1.tick_params(axis="y", labelcolor=color_co2)
-
-                ax2 = ax1.twinx()
-                ax2.set_ylabel("Population (Index 2004=100)", color=color_pop)
-                ax2.plot(country_data["year"], country_data["pop_index"], color=color_pop, linestyle="--", label="Population Growth")
-                ax2.tick_params(axis="y", labelcolor=color_pop)
-
-                plt.title(f"{country}: Population vs CO2 Growth (Indexed)")
-                fig.tight_layout()
-                plt.grid(True, linestyle="--", alpha=0.5)
-                plt.savefig(f"{output_dir}/pop_vs_co2_{country}.png")
-                print(f"Saved {output_dir}/pop_vs_co2_{country}.png")
-                plt.close()
-
-    # 9. Nüfusa Göre Kişi Başına Değişim
+@renderer("population_scatter")
+def _draw_population_scatter(fig, data: dict) -> None:
+    import seaborn as sns
+
+    ax = fig.add_subplot()
+    sns.scatterplot(data=data["frame"], x="population", y="co2_per_capita", hue="country", palette=data["palette"], ax=ax)
+    ax.set_title("Population vs CO2 per Capita (Post-1990)")
+    ax.set_ylabel("CO2 per Capita (Tonnes)")
+    ax.set_xlabel("Population")
+    ax.grid(True, linestyle="--", alpha=0.7)
+
+
+def section_population_vs_per_capita(ctx: dict) -> None:
+    """9. Nüfusa Göre Kişi Başına Değişim"""
+    df_countries = ctx["df_countries"]
+    output_dir = ctx["output_dir"]
     print("\n--- Per Capita Change relative to Population ---")
-    plt.figure(figsize=(10, 8))
-    sns.scatterplot(
-        data=df_countries[df_countries["year"] > 1990], x="population", y="co2_per_capita", hue="country", palette=COUNTRY_COLORS
-    )
-    plt.title("Population vs CO2 per Capita (Post-1990)")
-    plt.ylabel("CO2 per Capita (Tonnes)")
-    plt.xlabel("Population")
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"{output_dir}/population_vs_per_capita.png")
-    print(f"Saved {output_dir}/population_vs_per_capita.png")
-
-    # 10. Fosil Yakıt Kaynakları Analizi
+    frame = df_countries.loc[df_countries["year"] > 1990, ["country", "population", "co2_per_capita"]]
+    path = f"{output_dir}/population_vs_per_capita.png"
+    emit(figure_spec("population_scatter", path, (10, 8), frame=frame, palette=COUNTRY_COLORS))
+    print(f"Saved {path}")
+
+
+@renderer("fossil_mix")
+def _draw_fossil_mix(fig, data: dict) -> None:
+    ax = fig.add_subplot()
+    data["shares"].plot(kind="bar", stacked=True, colormap="viridis", ax=ax)
+
+    ax.set_title(f"Fossil Fuel CO2 Emission Mix (Year Used: {data['year_label']})")
+    ax.set_ylabel("Percentage Share (%)")
+    ax.set_xlabel("Country")
+    ax.legend(title="Fuel Source", bbox_to_anchor=(1.05, 1), loc="upper left")
+    fig.tight_layout()
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+
+
+def section_fossil_mix(ctx: dict) -> None:
+    """10. Fosil Yakıt Kaynakları Analizi"""
+    fuel_mix = ctx["fuel_mix"]
+    output_dir = ctx["output_dir"]
     print("\n--- Fossil Fuel Sources Analysis ---")
     fuel_cols = ["coal_co2", "oil_co2", "gas_co2"]
-    existing_fuel_cols = [c for c in fuel_cols if c in df_eda.columns]
+    existing_fuel_cols = [c for c in fuel_cols if c in fuel_mix.fuels]
 
     if existing_fuel_cols:
-        plt.figure(figsize=(12, 8))
-
-        last_year_data = []
-        years_used = []
-
-        for country in countries:
-            country_df = df_eda[df_eda["country"] == country].sort_values("year")
-            if not country_df.empty:
-                valid_row = country_df.dropna(subset=existing_fuel_cols).tail(1)
-                if not valid_row.empty:
-                    last_year_data.append(valid_row)
-                    years_used.append(valid_row["year"].iloc[0])
-
-        if last_year_data:
-            df_fuel = pd.concat(last_year_data)
-            unique_years = sorted(list(set(years_used)))
-            year_label = f"{min(unique_years)}-{max(unique_years)}" if len(unique_years) > 1 else str(unique_years[0])
+        # Her ülkenin üç yakıtı da dolu son yılı: önceden hesaplanmış karışım tablosundan doğrudan
+        df_fuel = fuel_mix.last_complete(REPORT_COUNTRIES, existing_fuel_cols)
 
-            df_fuel["total_fossil"] = df_fuel[existing_fuel_cols].sum(axis=1)
-            for col in existing_fuel_cols:
-                df_fuel[f"{col}_share"] = (df_fuel[col] / df_fuel["total_fossil"]) * 100
+        if not df_fuel.empty:
+            unique_years = sorted(set(df_fuel["year"]))
+            year_label = f"{min(unique_years)}-{max(unique_years)}" if len(unique_years) > 1 else str(unique_years[0])
 
             plot_data = df_fuel.set_index("country")[[f"{c}_share" for c in existing_fuel_cols]]
             plot_data.columns = [c.replace("_co2", "").title() for c in existing_fuel_cols]
-            plot_data.plot(kind="bar", stacked=True, figsize=(12, 7), colormap="viridis")
-
-            plt.title(f"Fossil Fuel CO2 Emission Mix (Year Used: {year_label})")
-            plt.ylabel("Percentage Share (%)")
-            plt.xlabel("Country")
-            plt.legend(title="Fuel Source", bbox_to_anchor=(1.05, 1), loc="upper left")
-            plt.tight_layout()
-            plt.grid(axis="y", linestyle="--", alpha=0.7)
-            plt.savefig(f"{output_dir}/fossil_fuel_mix.png")
-            print(f"Saved {output_dir}/fossil_fuel_mix.png")
+
+            path = f"{output_dir}/fossil_fuel_mix.png"
+            emit(figure_spec("fossil_mix", path, (12, 7), shares=plot_data, year_label=year_label))
+            print(f"Saved {path}")
         else:
             print("No valid data found for fossil fuel analysis.")
 
-    # 11. Nüfus Tahmini (2025-2028)
+
+def section_population_forecast(ctx: dict) -> None:
+    """11. Nüfus Tahmini (2025-2028)"""
+    panel = ctx["panel"]
+    df_countries = ctx["df_countries"]
+    output_dir = ctx["output_dir"]
     print("\n--- Population Forecast (2025-2028) ---")
-    plt.figure(figsize=(12, 6))
+    calls = []
     future_years_pop = np.arange(2025, 2029)
 
-    for country in countries:
-        country_data = df_eda[df_eda["country"] == country].dropna(subset=["population"])
+    df_pop = df_countries.dropna(subset=["population"])
+    pop_forecasts = forecast_features_many(df_pop, future_years_pop, cols=["population"], min_points=1)
+    pop_forecasts = {c: g["population"].to_numpy() for c, g in pop_forecasts.groupby("country", sort=False)}
+
+    for country in REPORT_COUNTRIES:
+        country_data = panel.country(country).dropna(subset=["population"])
         if len(country_data) > 5:
-            X_pop = country_data[["year"]]
-            y_pop = country_data["population"]
+            pred_pop = pop_forecasts[country]
 
-            poly_pop = PolynomialFeatures(degree=2)
-            X_poly_pop = poly_pop.fit_transform(X_pop)
+            color = COUNTRY_COLORS.get(country, "gray")
+            calls.append(_axes_call("plot", country_data["year"], country_data["population"] / 1e6, label=f"{country} (Hist)", color=color))
+            calls.append(_axes_call("plot", future_years_pop, pred_pop / 1e6, linestyle="--", color=color))
 
-            model_pop = LinearRegression()
-            model_pop.fit(X_poly_pop, y_pop)
+    path = f"{output_dir}/population_forecast.png"
+    emit(figure_spec("line_chart", path, (12, 6), calls=calls, title="Population Forecast (2025-2028)", ylabel="Population (Millions)"))
+    print(f"Saved {path}")
 
-            future_years_reshaped = future_years_pop.reshape(-1, 1)
-            future_poly_pop = poly_pop.transform(future_years_reshaped)
-            pred_pop = model_pop.predict(future_poly_pop)
 
-            color = COUNTRY_COLORS.get(country, "gray")
-            plt.plot(country_data["year"], country_data["population"] / 1e6, label=f"{country} (Hist)", color=color)
-            plt.plot(future_years_pop, pred_pop / 1e6, linestyle="--", color=color)
-
-    plt.title("Population Forecast (2025-2028)")
-    plt.ylabel("Population (Millions)")
-    plt.xlabel("Year")
-    plt.legend()
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"{output_dir}/population_forecast.png")
-    print(f"Saved {output_dir}/population_forecast.png")
-
-    # 12. CO2 Etki Analizi (Population Driven)
+def section_co2_impact(ctx: dict) -> None:
+    """12. CO2 Etki Analizi (Population Driven)"""
+    panel = ctx["panel"]
+    df_countries = ctx["df_countries"]
+    output_dir = ctx["output_dir"]
     print("\n--- CO2 Impact Analysis (Population Driven) ---")
-    plt.figure(figsize=(12, 6))
+    calls = []
+    future_years_pop = np.arange(2025, 2029)
+
+    df_impact = df_countries.dropna(subset=["co2", "population", "co2_per_capita"])
+    impact_forecasts = forecast_features_many(df_impact, future_years_pop, cols=["population"], min_points=1)
+    impact_forecasts = {c: g["population"].to_numpy() for c, g in impact_forecasts.groupby("country", sort=False)}
 
-    for country in countries:
-        country_data = df_eda[df_eda["country"] == country].dropna(subset=["co2", "population", "co2_per_capita"])
+    for country in REPORT_COUNTRIES:
+        country_data = panel.country(country).dropna(subset=["co2", "population", "co2_per_capita"])
         if not country_data.empty:
             last_hist_year = country_data["year"].max()
             last_per_capita = country_data.loc[country_data["year"] == last_hist_year, "co2_per_capita"].values[0]
 
-            X_pop = country_data[["year"]]
-            y_pop = country_data["population"]
-            poly_pop = PolynomialFeatures(degree=2)
-            X_poly_pop = poly_pop.fit_transform(X_pop)
-            model_pop = LinearRegression()
-            model_pop.fit(X_poly_pop, y_pop)
-
-            future_years_reshaped = future_years_pop.reshape(-1, 1)
-            future_poly_pop = poly_pop.transform(future_years_reshaped)
-            pred_pop = model_pop.predict(future_poly_pop)
+            pred_pop = impact_forecasts[country]
 
             pop_driven_co2 = pred_pop * last_per_capita
             color = COUNTRY_COLORS.get(country, "gray")
-            plt.plot(future_years_pop, pop_driven_co2, linestyle=":", linewidth=2, color=color, label=f"{country} (Pop. Driven)")
-
-    plt.title("Projected CO2 if Per Capita Emissions Remain Constant (2025-2028)")
-    plt.ylabel("CO2 Emissions (Million Tonnes)")
-    plt.xlabel("Year")
-    plt.legend()
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"{output_dir}/co2_impact_analysis.png")
-    print(f"Saved {output_dir}/co2_impact_analysis.png")
-
-    # 13. Üretim vs Tüketim Bazlı Emisyon Analizi
+            style = {"linestyle": ":", "linewidth": 2, "color": color, "label": f"{country} (Pop. Driven)"}
+            calls.append(_axes_call("plot", future_years_pop, pop_driven_co2, **style))
+
+    path = f"{output_dir}/co2_impact_analysis.png"
+    emit(
+        figure_spec(
+            "line_chart",
+            path,
+            (12, 6),
+            calls=calls,
+            title="Projected CO2 if Per Capita Emissions Remain Constant (2025-2028)",
+            ylabel="CO2 Emissions (Million Tonnes)",
+        )
+    )
+    print(f"Saved {path}")
+
+
+@renderer("production_vs_consumption")
+def _draw_production_vs_consumption(fig, data: dict) -> None:
+    import seaborn as sns
+
+    ax = fig.add_subplot()
+    frame = data["frame"]
+    sns.lineplot(data=frame, x="year", y="co2", label="Production (Territorial)", color=data["color"], linewidth=2, ax=ax)
+    sns.lineplot(
+        data=frame,
+        x="year",
+        y="consumption_co2",
+        label="Consumption (Trade-Adjusted)",
+        color="gray",
+        linestyle="--",
+        linewidth=2,
+        ax=ax,
+    )
+    ax.fill_between(frame["year"], frame["co2"], frame["consumption_co2"], alpha=0.1, color="gray")
+    ax.set_title(data["title"])
+    ax.set_ylabel("CO2 Emissions (Million Tonnes)")
+    ax.set_xlabel("Year")
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.7)
+
+
+def section_production_vs_consumption(ctx: dict) -> None:
+    """13. Üretim vs Tüketim Bazlı Emisyon Analizi"""
+    panel = ctx["panel"]
+    output_dir = ctx["output_dir"]
     print("\n--- Production vs Consumption Analysis ---")
-    for country in countries:
-        country_data = df_eda[df_eda["country"] == country].sort_values("year")
+    for country in REPORT_COUNTRIES:
+        country_data = panel.country(country)
 
         if "consumption_co2" in country_data.columns and not country_data["consumption_co2"].isnull().all():
-            plt.figure(figsize=(10, 6))
-            sns.lineplot(
-                data=country_data,
-                x="year",
-                y="co2",
-                label="Production (Territorial)",
+            filename = f"{output_dir}/prod_vs_cons_{country}.png"
+            spec = figure_spec(
+                "production_vs_consumption",
+                filename,
+                (10, 6),
+                frame=country_data[["year", "co2", "consumption_co2"]],
                 color=COUNTRY_COLORS.get(country, "blue"),
-                linewidth=2,
+                title=f"{country}: Production vs Consumption CO2 Emissions",
             )
-            sns.lineplot(
-                data=country_data,
-                x="year",
-                y="consumption_co2",
-                label="Consumption (Trade-Adjusted)",
-                color="gray",
-                linestyle="--",
-                linewidth=2,
-            )
-            plt.fill_between(country_data["year"], country_data["co2"], country_data["consumption_co2"], alpha=0.1, color="gray")
-            plt.title(f"{country}: Production vs Consumption CO2 Emissions")
-            plt.ylabel("CO2 Emissions (Million Tonnes)")
-            plt.xlabel("Year")
-            plt.legend()
-            plt.grid(True, linestyle="--", alpha=0.7)
-            filename = f"{output_dir}/prod_vs_cons_{country}.png"
-            plt.savefig(filename)
+            emit(spec)
             print(f"Saved {filename}")
-            plt.close()
         else:
             print(f"Skipping {country}: No consumption data.")
 
-    # 14. Ekonomik Karbon Yoğunluğu (CO2 per GDP)
+
+@renderer("carbon_intensity")
+def _draw_carbon_intensity(fig, data: dict) -> None:
+    import seaborn as sns
+
+    ax = fig.add_subplot()
+    for series in data["series"]:
+        sns.lineplot(data=series["frame"], x="year", y="co2_per_gdp", label=series["label"], color=series["color"], linewidth=2, ax=ax)
+    ax.set_title("Economic Carbon Intensity (CO2 per GDP) Trend (2000-2024)")
+    ax.set_ylabel("CO2 per GDP (kg per $)")
+    ax.set_xlabel("Year")
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.7)
+
+
+def section_carbon_intensity(ctx: dict) -> None:
+    """14. Ekonomik Karbon Yoğunluğu (CO2 per GDP)"""
+    panel = ctx["panel"]
+    output_dir = ctx["output_dir"]
     print("\n--- Carbon Intensity Analysis (CO2 per GDP) ---")
-    plt.figure(figsize=(12, 7))
-    for country in countries:
-        country_data = df_eda[df_eda["country"] == country].sort_values("year")
-        country_data = country_data[country_data["year"] >= 2000]
+    series = []
+    for country in REPORT_COUNTRIES:
+        country_data = panel.country(country, start=2000)
         if "co2_per_gdp" in country_data.columns:
-            sns.lineplot(
-                data=country_data,
-                x="year",
-                y="co2_per_gdp",
-                label=country,
-                color=COUNTRY_COLORS.get(country),
-                linewidth=2,
-            )
-    plt.title("Economic Carbon Intensity (CO2 per GDP) Trend (2000-2024)")
-    plt.ylabel("CO2 per GDP (kg per $)")
-    plt.xlabel("Year")
-    plt.legend()
-    plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"{output_dir}/carbon_intensity_trend.png")
-    print(f"Saved {output_dir}/carbon_intensity_trend.png")
+            series.append({"label": country, "color": COUNTRY_COLORS.get(country), "frame": country_data[["year", "co2_per_gdp"]]})
+    path = f"{output_dir}/carbon_intensity_trend.png"
+    emit(figure_spec("carbon_intensity", path, (12, 7), series=series))
+    print(f"Saved {path}")
+
+
+def _eda_context(df_eda: pd.DataFrame | StoredPanel, yearly: pd.DataFrame | None = None) -> dict:
+    """
+    Doldurulmuş panelden bölümlerin ortak girdileri: (country, year) indeksi (PanelIndex),
+    indeksin sıralı çerçevesi (df_eda), rapor ülkeleri alt kümesi (df_countries), tüm
+    ülke / yıllar için fosil yakıt karışımı (fuel_mix) ve yıllık global ortalamalar
+    (global_avg; yearly verilmezse paneldan hesaplanır). df_eda bir StoredPanel ise panel
+    diskteki dosyalara eşlenir (kopyasız; fork ile açılan worker'lar aynı sayfaları paylaşır).
+    """
+    panel = as_panel(df_eda)
+    return {
+        "panel": panel,
+        "df_eda": panel.frame,
+        "df_countries": panel.select(REPORT_COUNTRIES),
+        "fuel_mix": FuelMix(panel, [c for c in FEATURES if c.endswith("_co2")]),
+        "global_avg": _build_global_avg(panel.frame) if yearly is None else yearly,
+    }
+
+
+def _prepare_eda(ctx: dict) -> dict:
+    """
+    EDA paneli (tüm bölümlerin ortak girdisi); ana process'te bir kez hazırlanır. Bağlamda
+    panel_store varsa doldurulmuş panel depoya bir kez yazılır ve oradan eşlenir.
+    """
+    store = ctx.get("panel_store")
+    if store is not None:
+        return _eda_context(stored_eda_panel(ctx["df"], store))
+    return _eda_context(clean_and_balance_data_for_eda(ctx["df"].copy()))
+
+
+def section_evaluate(ctx: dict) -> None:
+    """Time-safe model değerlendirmesi (2000-2018 / 2019-2024)"""
+    evaluate_model_multivariate_time_safe(ctx["df"])
+
+
+def section_backtest(ctx: dict) -> None:
+    """Rolling-origin backtest"""
+    backtest_multivariate_time_safe(ctx["df"])
+
+
+# Rapor görevleri: girdiler (bağlam kaynakları / diğer görevlerin çıktıları) ve çıktılar.
+# Çıktı adları FIGURE_INPUTS anahtarlarıyla aynıdır; artımlı modda sadece geçersiz
+# çıktıları üreten görevler çalıştırılır. Kayıt sırası, raporun metin sırasıdır.
+REPORT_TASKS = {
+    "eda": {"func": _prepare_eda, "inputs": ["df"], "outputs": ["panel", "df_eda", "df_countries", "fuel_mix", "global_avg"], "local": True},
+    "evaluate": {"func": section_evaluate, "inputs": ["df"], "outputs": ["metrics_timesafe.json"]},
+    "backtest": {"func": section_backtest, "inputs": ["df"], "outputs": ["metrics_backtest.csv"]},
+    "global_trend": {"func": section_global_trend, "inputs": ["df_eda", "global_avg"], "outputs": ["global_co2_trend.png"]},
+    "country_trend": {"func": section_country_trend, "inputs": ["df_countries"], "outputs": ["country_co2_trend.png"]},
+    "correlation": {"func": section_correlation, "inputs": ["df_eda"], "outputs": ["correlation_matrix.png"]},
+    "forecast": {
+        "func": section_forecast,
+        "inputs": ["panel", "global_avg"],
+        "outputs": ["global_forecast_multivariate.png", "country_forecasts_multivariate.png"],
+    },
+    "drivers": {"func": section_drivers, "inputs": ["panel"], "outputs": []},
+    "scenarios": {"func": section_scenarios, "inputs": ["panel"], "outputs": []},
+    "per_capita": {"func": section_per_capita, "inputs": ["df_countries"], "outputs": ["co2_per_capita_trend.png"]},
+    "population_growth": {
+        "func": section_population_growth,
+        "inputs": ["panel"],
+        "outputs": [f"pop_vs_co2_{c}.png" for c in REPORT_COUNTRIES],
+    },
+    "population_vs_per_capita": {
+        "func": section_population_vs_per_capita,
+        "inputs": ["df_countries"],
+        "outputs": ["population_vs_per_capita.png"],
+    },
+    "fossil_mix": {"func": section_fossil_mix, "inputs": ["fuel_mix"], "outputs": ["fossil_fuel_mix.png"]},
+    "population_forecast": {
+        "func": section_population_forecast,
+        "inputs": ["panel", "df_countries"],
+        "outputs": ["population_forecast.png"],
+    },
+    "co2_impact": {"func": section_co2_impact, "inputs": ["panel", "df_countries"], "outputs": ["co2_impact_analysis.png"]},
+    "production_vs_consumption": {
+        "func": section_production_vs_consumption,
+        "inputs": ["panel"],
+        "outputs": [f"prod_vs_cons_{c}.png" for c in REPORT_COUNTRIES],
+    },
+    "carbon_intensity": {"func": section_carbon_intensity, "inputs": ["panel"], "outputs": ["carbon_intensity_trend.png"]},
+}
+
+def _input_slice_fingerprints(name: str, ctx: dict) -> dict:
+    """
+    Görev çıktılarının girdi dilimlerinin (FIGURE_INPUTS / METRIC_INPUTS: ülkeler, sütunlar,
+    yıllar) içerik özetleri. Ham veriyi (df) okuyan görevlerde dilim ham veriden, diğerlerinde
+    EDA panelinden alınır.
+    """
+    task = REPORT_TASKS[name]
+    frame = ctx["df"] if "df" in task["inputs"] else ctx["df_eda"]
+    fingerprints, seen = {}, {}
+    for output in task["outputs"]:
+        spec = FIGURE_INPUTS.get(output) or METRIC_INPUTS[output]
+        slice_key = (tuple(spec["countries"] or ()), tuple(spec["columns"]), spec["years"])
+        if slice_key not in seen:
+            rows = frame
+            if spec["countries"] is not None:
+                rows = rows[rows["country"].isin(spec["countries"])]
+            if spec["years"] is not None:
+                start, end = spec["years"]
+                if start is not None:
+                    rows = rows[rows["year"] >= start]
+                if end is not None:
+                    rows = rows[rows["year"] <= end]
+            cols = ["country", "year"] + [c for c in dict.fromkeys(spec["columns"]) if c in rows.columns and c != "year"]
+            seen[slice_key] = artifact_cache.fingerprint(rows[cols])
+        fingerprints[output] = seen[slice_key]
+    return fingerprints
+
+
+def _run_cached_section(name: str, ctx: dict) -> None:
+    """
+    Görevi artifact önbelleği üzerinden çalıştırır. Anahtar: görevin (geçişli) kod sürümü,
+    parametreleri ve girdi dilimlerinin özetleri. Önbellekte varsa görev çalışmaz: stdout'u
+    yeniden yazılır, figür spec'leri çizime gönderilir (figürler de önbellekten gelir) ve
+    metrik dosyaları yerine konur.
+    """
+    task = REPORT_TASKS[name]
+    cache = ctx["artifact_cache"]
+    code = artifact_cache.code_version(task["func"], *(type(ctx[i]) for i in task["inputs"]))
+    params = {"output_dir": ctx["output_dir"], "outputs": task["outputs"]}
+    inputs = _input_slice_fingerprints(name, ctx)
+    key = artifact_cache.artifact_key(f"task:{name}", code, params, inputs)
+
+    entry = cache.get(key)
+    if entry is not None:
+        stdout, specs = cache.load_payload(entry)
+        for path, status in cache.restore(entry).items():
+            artifact_cache.record(path, entry, status)
+        print(stdout, end="")
+        for spec in specs:
+            emit(spec)
+        return
+
+    buffer = io.StringIO()
+    first_spec = len(pending())
+    try:
+        with contextlib.redirect_stdout(buffer):
+            task["func"](ctx)
+    finally:
+        print(buffer.getvalue(), end="")
+    files = {path: path for path in task["outputs"] if not path.endswith(".png") and os.path.exists(path)}
+    entry = cache.put(key, f"task:{name}", code, files=files, payload=(buffer.getvalue(), pending()[first_spec:]), params=params, inputs=inputs)
+    for path in files:
+        artifact_cache.record(path, entry, "produced")
+
+
+# Worker başına: bu worker'ın ana process'e henüz göndermediği model anahtarları ve sayaçlar
+_REPORT_WORKER_STATE: dict = {}
+
+
+def _init_report_worker() -> None:
+    """Her worker kendi model önbelleği ile çalışır; figürler spec olarak ana process'e döner."""
+    configure_output()
+    if not len(MODEL_STORE):
+        MODEL_STORE.load()
+    _REPORT_WORKER_STATE.update(known=set(MODEL_STORE.keys()), hits=MODEL_STORE.hits, misses=MODEL_STORE.misses)
+
+
+def _finish_report_task() -> dict:
+    """Görev sonrası: üretilen figür spec'leri ve yeni fit edilen modeller ana process'e gönderilir."""
+    state = _REPORT_WORKER_STATE
+    models = MODEL_STORE.export(exclude=state["known"])
+    payload = {
+        "pid": os.getpid(),
+        "models": models,
+        "hits": MODEL_STORE.hits - state["hits"],
+        "misses": MODEL_STORE.misses - state["misses"],
+        "spans": instrumentation.worker_spans(),
+        "figures": take_pending(),
+        "artifacts": artifact_cache.take_records(),
+    }
+    state.update(hits=MODEL_STORE.hits, misses=MODEL_STORE.misses)
+    state["known"].update(models)
+    return payload
+
+
+def _merge_report_models(name: str, payload: dict) -> None:
+    instrumentation.extend(payload["spans"])
+    artifact_cache.extend_records(payload["artifacts"])
+    if payload["pid"] == os.getpid():  # seri mod: modeller zaten bu process'in önbelleğinde
+        return
+    MODEL_STORE.update(payload["models"])
+    MODEL_STORE.hits += payload["hits"]
+    MODEL_STORE.misses += payload["misses"]
+
+
+def run_report(
+    data: pd.DataFrame,
+    sections: list[str] | None = None,
+    jobs: int | None = None,
+    output_dir: str = "img",
+    df_eda: pd.DataFrame | None = None,
+    figures: FigureRenderer | None = None,
+    cache: ArtifactCache | None = None,
+    store: PanelStore | None = None,
+    global_avg: pd.DataFrame | None = None,
+) -> dict:
+    """
+    Rapor görevlerini (REPORT_TASKS) bağımlılık sırasına göre bir process pool'da çalıştırır.
+    Görevlerin ürettiği figür spec'leri geldikçe çizime gönderilir (bkz. figure_render).
+
+    sections : çalıştırılacak görevler (None -> tümü); bağımlılıklar otomatik eklenir
+    jobs     : worker sayısı (None -> CPU sayısı, 1 -> seri)
+    df_eda   : hazır EDA paneli (ör. artımlı moddan); verilirse "eda" görevi atlanır
+    global_avg: df_eda ile birlikte hazır yıllık global ortalamalar (artımlı snapshot'tan)
+    figures  : çizici (FigureRenderer); verilmezse cache ile bir çizici kullanılır ve dönmeden
+               önce kapatılır. Verilirse kapatmak çağıranındır.
+    cache    : artifact önbelleği; verilirse çıktısı olan görevler ve figürler girdi dilimi /
+               kod sürümü değişmedikçe yeniden üretilmez (bkz. _run_cached_section)
+    store    : panel deposu; verilirse EDA paneli bir kez yazılır, bölümler ve worker'lar
+               onu diskten eşlenmiş olarak okur (bkz. stored_eda_panel)
+
+    Dönüş: görev adı -> süre (saniye)
+    """
+    if figures is None:
+        with FigureRenderer(jobs=jobs, cache=cache) as figures:
+            return run_report(data, sections, jobs, output_dir, df_eda, figures, cache, store, global_avg)
+
+    configure_output()
+    os.makedirs(output_dir, exist_ok=True)
+    ctx = {"df": data, "output_dir": output_dir, "artifact_cache": cache, "panel_store": store}
+    if df_eda is not None:
+        ctx.update(_eda_context(df_eda, global_avg))
+
+    tasks = REPORT_TASKS
+    if cache is not None:
+        tasks = {
+            name: dict(task, func=functools.partial(_run_cached_section, name)) if task["outputs"] and not task.get("local") else task
+            for name, task in REPORT_TASKS.items()
+        }
+
+    def on_result(name: str, payload: dict) -> None:
+        _merge_report_models(name, payload)
+        for spec in payload["figures"]:
+            figures.submit(spec)
+
+    return run_tasks(
+        tasks,
+        ctx,
+        selected=sections,
+        max_workers=jobs,
+        worker_init=_init_report_worker,
+        worker_finish=_finish_report_task,
+        on_result=on_result,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Komut satırı girişi; argv None ise sys.argv kullanılır."""
+    parser = argparse.ArgumentParser(description="CO2 analysis report")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="diff the dataset against the stored snapshot and only re-render invalidated outputs",
+    )
+    parser.add_argument("--sections", help="comma-separated report sections to run (dependencies are added)")
+    parser.add_argument("--list-sections", action="store_true", help="list report sections and their outputs")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count, 1 = serial)")
+    parser.add_argument("--redraw", action="store_true", help="re-render every figure even if it is in the artifact cache")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="do not reuse or store artifacts or the imputed panel (recompute every output)"
+    )
+    parser.add_argument("--panel-dir", default=DEFAULT_STORE_DIR, help="memory-mapped store for the imputed EDA panel")
+    parser.add_argument("--cache-dir", default=artifact_cache.DEFAULT_CACHE_DIR, help="artifact cache directory")
+    parser.add_argument(
+        "--cache-max-mb", type=float, default=artifact_cache.DEFAULT_MAX_BYTES / 2**20, help="evict artifacts beyond this size"
+    )
+    parser.add_argument(
+        "--cache-max-age-days", type=float, default=artifact_cache.DEFAULT_MAX_AGE_DAYS, help="evict artifacts unused for this long"
+    )
+    parser.add_argument("--trace", help="record timing spans and write them to this file (.json: Chrome trace, .csv: flat)")
+    parser.add_argument("--profile", metavar="DIR", help="with --trace: write a cProfile dump per report task to DIR")
+    parser.add_argument("--trace-memory", action="store_true", help="with --trace: tracemalloc peak per span (slow)")
+    args = parser.parse_args(argv)
+    configure_output()
+
+    if args.trace:
+        instrumentation.enable(profile_dir=args.profile, trace_memory=args.trace_memory)
+
+    if args.list_sections:
+        for name, task in REPORT_TASKS.items():
+            print(f"{name:<26} {', '.join(task['outputs'])}")
+        return
+
+    sections = [s.strip() for s in args.sections.split(",") if s.strip()] if args.sections else None
+    unknown = [s for s in sections or [] if s not in REPORT_TASKS]
+    if unknown:
+        parser.error(f"unknown section(s): {', '.join(unknown)} (see --list-sections)")
+
+    df = load(columns=REPORT_COLUMNS)
+
+    df_eda = yearly = None
+    if args.incremental:
+        df_eda, yearly, invalidated = run_incremental(df)
+        sections = [
+            name
+            for name, task in REPORT_TASKS.items()
+            if set(task["outputs"]) & set(invalidated) and (sections is None or name in sections)
+        ]
+        if not sections:
+            print("Nothing to re-render.")
+            return
+        print(f"Re-rendering sections: {sections}")
+
+    # Önceki çalışmalardan kalan fit edilmiş modeller (.cache/models.pkl)
+    n_models = MODEL_STORE.load()
+    if n_models:
+        print(f"Model store: {n_models} fitted models loaded from {MODEL_STORE.path}")
+
+    cache = None if args.no_cache else ArtifactCache(args.cache_dir)
+    store = None if args.no_cache else PanelStore(args.panel_dir)
+    t0 = time.perf_counter()
+    with FigureRenderer(jobs=args.jobs, cache=cache, force=args.redraw) as figures:
+        timings = run_report(df, sections=sections, jobs=args.jobs, df_eda=df_eda, figures=figures, cache=cache, store=store, global_avg=yearly)
+    figure_stats = figures.stats()
+    print(f"\nReport tasks: {len(timings)} finished in {time.perf_counter() - t0:.1f}s (sum of task times {sum(timings.values()):.1f}s)")
+    print(f"Figures: {figure_stats['rendered']} rendered, {figure_stats['skipped']} from cache")
+
+    if cache is not None:
+        records = artifact_cache.take_records()
+        cache.write_manifest(records)
+        evicted = cache.evict(max_bytes=int(args.cache_max_mb * 2**20), max_age_days=args.cache_max_age_days)
+        produced = sum(r["status"] == "produced" for r in records)
+        print(
+            f"Artifacts: {produced} produced, {len(records) - produced} reused; cache {cache.stats()['bytes'] / 2**20:.1f} MB "
+            f"({evicted['entries']} entries evicted), provenance in {cache.manifest_path}"
+        )
+
+    MODEL_STORE.save()
+    print(f"\nModel store: {MODEL_STORE.stats()} (saved to {MODEL_STORE.path})")
+
+    if args.trace:
+        instrumentation.export(args.trace)
+        print(f"\nTrace: {len(instrumentation.spans())} spans saved to {args.trace}")
+        print(instrumentation.summary().head(15))
+        instrumentation.disable()
+
+
+if __name__ == "__main__":
+    main()
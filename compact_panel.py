@@ -0,0 +1,249 @@
+"""
+Bellek-kompakt panel: OWID verisinin gerekli sutunlari (varlik x yil) float32 izgaralari.
+
+load() + clean_and_balance_data_for_eda zinciri ~80 sutunlu cercevenin birden fazla float64
+kopyasini tutar (ham cerceve, .copy(), siralanmis / doldurulmus cerceve). Burada:
+
+- varlik ekseni sozluk kodludur: entities (sirali adlar) + satir basina kod; ulke adi
+  satir basina tekrar edilmez
+- zaman ekseni ardisik yil araligidir (int16); (varlik, yil) hucresi dogrudan adreslenir
+- her sutun (E, Y) float32 dizisidir; gecersiz hucreler 0 tutulur ve gecerlilik NaN yerine
+  np.packbits ile paketlenmis bit haritasindadir (hucre basina 1 bit)
+- satir varligi (o varlik-yil satiri veri setinde var mi) ayri bir bit haritasidir; pandas'a
+  donuste yalnizca var olan satirlar uretilir
+
+Var olan hucrelerin satir-oncelikli (row-major) sirasi (country, year) siralamasiyla aynidir;
+impute ve mean_by_year bu sirayla imputation / groupby yollarinin sonuclarini verir
+(degerler float32 hassasiyetinde saklanir).
+
+    panel = load_owid_compact(columns=REPORT_COLUMNS)        # veya CompactPanel.from_frame(df)
+    filled = impute_by_group(panel, cols, mode="both")       # CompactPanel dondurur
+    global_avg = _build_global_avg(filled)                   # yillik ortalamalar
+    df_eda = filled.to_frame()
+"""
+
+import numpy as np
+import pandas as pd
+
+from imputation import impute_block
+
+
+def _unpack(bits: np.ndarray, n_years: int) -> np.ndarray:
+    """Paketlenmis (E, ceil(Y/8)) bit haritasi -> (E, Y) bool."""
+    return np.unpackbits(bits, axis=1, count=n_years).astype(bool)
+
+
+class CompactPanel:
+    """
+    (varlik x yil) float32 sutun izgaralari ve paketlenmis gecerlilik bit haritalari.
+
+    entities : sirali varlik adlari (object dizisi); kod = bu dizideki konum
+    years    : ardisik yillar (int16)
+    columns  : sutun adlari (eklenme sirasinda)
+    """
+
+    def __init__(self, entities, years, present_bits, group_col: str = "country", time_col: str = "year", row_cells=None):
+        self.entities = entities
+        self.years = years
+        self.group_col = group_col
+        self.time_col = time_col
+        self._present = present_bits
+        self._row_cells = row_cells  # add_column icin: kaynak satir -> hucre (-1 = atildi)
+        self._values: dict = {}
+        self._valid: dict = {}
+
+    # --- kurulum ---------------------------------------------------------------------------
+
+    @classmethod
+    def from_keys(cls, groups, times, group_col: str = "country", time_col: str = "year") -> "CompactPanel":
+        """
+        Satir anahtarlarindan sutunsuz panel; sutunlar add_column ile ayni satir sirasinda
+        eklenir. group degeri NaN olan satirlar atilir (groupby davranisi). Ayni (varlik, yil)
+        iki kez gecerse ValueError.
+        """
+        codes, uniques = pd.factorize(groups)
+        # Kategorik girdide factorize(sort=True) kategori sirasina dizer; adlara gore sirala
+        uniques = np.asarray(uniques, dtype=object)
+        order = np.argsort(uniques, kind="stable")
+        rank = np.empty(len(order), dtype=np.intp)
+        rank[order] = np.arange(len(order))
+        codes = np.where(codes >= 0, rank[codes] if len(rank) else codes, -1)
+        entities = uniques[order]
+        times = np.asarray(times)
+        keep = codes >= 0
+        if keep.any():
+            first, last = int(times[keep].min()), int(times[keep].max())
+        else:
+            first, last = 0, -1
+        years = np.arange(first, last + 1, dtype=np.int16)
+
+        cells = np.full(len(codes), -1, dtype=np.int64)
+        cells[keep] = codes[keep].astype(np.int64) * len(years) + (times[keep].astype(np.int64) - first)
+        present = np.zeros(len(entities) * len(years), dtype=bool)
+        present[cells[keep]] = True
+        if present.sum() != keep.sum():
+            raise ValueError(f"Tekrarlanan ({group_col}, {time_col}) satirlari var")
+
+        present = present.reshape(len(entities), len(years))
+        return cls(entities, years, np.packbits(present, axis=1), group_col, time_col, cells)
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, columns=None, group_col: str = "country", time_col: str = "year") -> "CompactPanel":
+        """
+        DataFrame'den panel. columns None ise group / time disindaki tum sayisal sutunlar;
+        verilirse veri setinde olmayanlar yok sayilir.
+        """
+        if columns is None:
+            columns = [c for c in data.select_dtypes("number").columns if c not in (group_col, time_col)]
+        panel = cls.from_keys(data[group_col], data[time_col].to_numpy(), group_col, time_col)
+        for col in columns:
+            if col in data.columns and col not in (group_col, time_col):
+                panel.add_column(col, data[col].to_numpy(dtype=np.float64, na_value=np.nan))
+        return panel
+
+    def add_column(self, name: str, values) -> None:
+        """from_keys'e verilen satir sirasindaki degerleri izgaraya yerlestirir (NaN = gecersiz)."""
+        if self._row_cells is None:
+            raise ValueError("add_column sadece from_keys / from_frame ile kurulan panellerde kullanilabilir")
+        values = np.asarray(values)
+        if len(values) != len(self._row_cells):
+            raise ValueError(f"{name}: {len(values)} deger, {len(self._row_cells)} satir bekleniyordu")
+        keep = self._row_cells >= 0
+        self._store(name, self._row_cells[keep], values[keep])
+
+    def _store(self, name: str, cells: np.ndarray, values: np.ndarray) -> None:
+        ok = ~np.isnan(values)
+        size = len(self.entities) * len(self.years)
+        grid = np.zeros(size, dtype=np.float32)
+        grid[cells[ok]] = values[ok]
+        mask = np.zeros(size, dtype=bool)
+        mask[cells[ok]] = True
+        self._values[name] = grid.reshape(len(self.entities), len(self.years))
+        self._valid[name] = np.packbits(mask.reshape(len(self.entities), len(self.years)), axis=1)
+
+    def _derive(self) -> "CompactPanel":
+        """Ayni eksenler ve sutunlarla yeni panel (diziler paylasilir, sozlukler kopyalanir)."""
+        out = CompactPanel(self.entities, self.years, self._present, self.group_col, self.time_col, self._row_cells)
+        out._values = dict(self._values)
+        out._valid = dict(self._valid)
+        return out
+
+    # --- erisim ----------------------------------------------------------------------------
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._values)
+
+    @property
+    def nbytes(self) -> int:
+        """Izgaralar, bit haritalari ve eksenlerin toplam boyutu (varlik adlari haric)."""
+        arrays = [self.years, self._present, *self._values.values(), *self._valid.values()]
+        if self._row_cells is not None:
+            arrays.append(self._row_cells)
+        return sum(a.nbytes for a in arrays)
+
+    def __len__(self) -> int:
+        """Var olan (varlik, yil) satiri sayisi."""
+        return int(np.unpackbits(self._present).sum())
+
+    def __contains__(self, col) -> bool:
+        return col in self._values
+
+    def present(self) -> np.ndarray:
+        """(E, Y) bool: veri setinde satiri olan hucreler."""
+        return _unpack(self._present, len(self.years))
+
+    def valid(self, col: str) -> np.ndarray:
+        """(E, Y) bool: col degeri dolu olan hucreler."""
+        return _unpack(self._valid[col], len(self.years))
+
+    def column(self, col: str, dtype=np.float32) -> np.ndarray:
+        """(E, Y) izgara; gecersiz hucreler NaN."""
+        return np.where(self.valid(col), self._values[col].astype(dtype), np.nan)
+
+    def _cells(self) -> np.ndarray:
+        """Var olan hucrelerin duz konumlari, (varlik, yil) sirasinda."""
+        return np.flatnonzero(self.present().ravel())
+
+    def _block(self, cols: list[str], cells: np.ndarray) -> np.ndarray:
+        """(len(cells), len(cols)) float64 blok; gecersiz degerler NaN."""
+        block = np.empty((len(cells), len(cols)))
+        for k, col in enumerate(cols):
+            block[:, k] = self._values[col].ravel()[cells]
+            block[~self.valid(col).ravel()[cells], k] = np.nan
+        return block
+
+    def to_frame(self, columns=None, dtype=np.float64, categorical: bool = False) -> pd.DataFrame:
+        """
+        Var olan satirlardan (group_col, time_col, sutunlar) cercevesi; (varlik, yil) sirasinda,
+        RangeIndex ile. categorical=True ise group_col kategorik, degilse object.
+        """
+        columns = self.columns if columns is None else list(columns)
+        cells = self._cells()
+        codes, year_pos = np.divmod(cells, len(self.years))
+        if categorical:
+            groups = pd.Categorical.from_codes(codes, categories=self.entities)
+        else:
+            groups = self.entities[codes]
+        out = {self.group_col: groups, self.time_col: self.years[year_pos]}
+        block = self._block(columns, cells)
+        out.update({col: block[:, k].astype(dtype, copy=False) for k, col in enumerate(columns)})
+        return pd.DataFrame(out)
+
+    # --- doldurma ve toplama ---------------------------------------------------------------
+
+    def impute(self, cols=None, mode: str = "both", seed: pd.DataFrame | None = None) -> "CompactPanel":
+        """
+        cols sutunlarini varlik icinde doldurur (imputation.impute_by_group ile ayni modlar);
+        hesap float64'te yapilir, sonuc float32 izgaralara yazilir. Diger sutunlar paylasilir.
+
+        seed : "test" modunda kalan NaN'lar icin varlik indeksli degerler (last_valid gibi)
+        """
+        cols = self.columns if cols is None else [c for c in cols if c in self._values]
+        out = self._derive()
+        if not cols or not len(self.entities):
+            return out
+
+        cells = self._cells()
+        codes = cells // len(self.years)
+        seed_by_entity = None
+        if mode == "test" and seed is not None:
+            seed_by_entity = seed.reindex(index=self.entities, columns=cols).to_numpy(dtype=np.float64, na_value=np.nan)
+        # Sutun sutun: doldurma motorunun (n_rows, n_cols) ara dizileri tek sutunla sinirli kalir
+        for k, col in enumerate(cols):
+            seed_block = None if seed_by_entity is None else seed_by_entity[codes, k : k + 1]
+            filled = impute_block(self._block([col], cells), codes, mode, seed_block)
+            out._store(col, cells, filled[:, 0])
+        return out
+
+    def last_valid(self, cols=None) -> pd.DataFrame:
+        """
+        Her varlik icin her sutunun son gecerli degeri (groupby(group_col)[cols].last() ile
+        ayni); varlik indeksli, float64.
+        """
+        cols = self.columns if cols is None else list(cols)
+        n_years = len(self.years)
+        rows = np.arange(len(self.entities))
+        out = {}
+        for col in cols:
+            valid = self.valid(col)
+            last = n_years - 1 - valid[:, ::-1].argmax(axis=1) if n_years else np.zeros(len(rows), dtype=np.intp)
+            has = valid.any(axis=1)
+            values = self._values[col][rows, last].astype(np.float64) if n_years else np.zeros(len(rows))
+            out[col] = np.where(has, values, np.nan)
+        return pd.DataFrame(out, index=pd.Index(self.entities, name=self.group_col))
+
+    def mean_by_year(self, cols=None) -> pd.DataFrame:
+        """
+        Yillik ortalamalar (groupby(time_col)[cols].mean().reset_index() ile ayni): her yil
+        icin gecerli degerlerin float64 toplami / sayisi. Hic satiri olmayan yillar atlanir.
+        """
+        cols = self.columns if cols is None else list(cols)
+        has_rows = self.present().any(axis=0)
+        out = {self.time_col: self.years[has_rows]}
+        for col in cols:
+            total = self._values[col].sum(axis=0, dtype=np.float64)
+            count = self.valid(col).sum(axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[col] = np.where(count > 0, total / count, np.nan)[has_rows]
+        return pd.DataFrame(out)
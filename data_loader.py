@@ -0,0 +1,211 @@
+"""
+OWID CO2 veri seti icin ortak, tipli ve onbellekli yukleyici.
+
+- Sabit dtype semasi: country/iso_code -> category, year -> int16, metrikler -> float64
+  (istege bagli float32)
+- Sutun projeksiyonu: sadece cagiranin ihtiyac duydugu sutunlar okunur
+- Ikili onbellek: her sutun ayri bir .npy dosyasi olarak saklanir; onbellek, CSV
+  dosyasinin SHA-256 ozetine baglidir ve sadece kaynak degistiginde yeniden olusturulur
+
+- Kompakt yukleme: load_owid_compact sayisal sutunlari onbellekten tek tek okuyup
+  (ulke x yil) float32 izgaralarina yerlestirir (bkz. compact_panel.CompactPanel)
+
+Kullanim:
+    from data_loader import load_owid
+    df = load_owid(columns=FEATURES + ["co2"])
+    panel = load_owid_compact(columns=FEATURES + ["co2"])
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from compact_panel import CompactPanel
+from instrumentation import instrumented
+
+DATA_PATHS = ["Datasets/owid-co2-data.csv", "Nature-Pollution/Datasets/owid-co2-data.csv"]
+CACHE_DIR_NAME = ".cache"
+
+CATEGORICAL_COLUMNS = ["country", "iso_code"]
+YEAR_DTYPE = "int16"
+
+
+def find_data_path(path: str | None = None) -> str:
+    """
+    CSV dosyasinin yolunu bulur. Yol verilmezse DATA_PATHS sirasiyla denenir.
+    """
+    if path is not None:
+        return path
+    for candidate in DATA_PATHS:
+        if os.path.exists(candidate):
+            return candidate
+    raise FileNotFoundError(f"OWID veri seti bulunamadi: {DATA_PATHS}")
+
+
+def file_fingerprint(path: str, chunk_size: int = 1 << 20) -> str:
+    """Dosya iceriginin SHA-256 ozetini dondurur."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_owid_csv(path: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    CSV'yi sabit dtype semasiyla okur (onbellek kullanmadan).
+    """
+    usecols = None if columns is None else (lambda c: c in set(columns))
+    data = pd.read_csv(path, usecols=usecols, dtype={c: "category" for c in CATEGORICAL_COLUMNS})
+    if "year" in data.columns:
+        data["year"] = data["year"].astype(YEAR_DTYPE)
+    return data
+
+
+def _cache_prefix(csv_path: str) -> str:
+    return os.path.splitext(os.path.basename(csv_path))[0] + "-"
+
+
+def _cache_path(csv_path: str, fingerprint: str) -> str:
+    cache_root = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME)
+    return os.path.join(cache_root, _cache_prefix(csv_path) + fingerprint[:16])
+
+
+def _build_cache(csv_path: str, cache_path: str) -> None:
+    """
+    CSV'yi bir kez parse eder ve her sutunu ayri .npy dosyasina yazar.
+    Yazim gecici bir dizine yapilir ve en sonda atomik olarak yerine tasinir.
+    """
+    data = read_owid_csv(csv_path)
+
+    tmp_path = cache_path + f".tmp-{os.getpid()}"
+    os.makedirs(tmp_path, exist_ok=True)
+
+    meta = {"source": os.path.basename(csv_path), "n_rows": len(data), "columns": []}
+    for i, col in enumerate(data.columns):
+        series = data[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            kind = "category"
+            np.save(os.path.join(tmp_path, f"{i}.codes.npy"), series.cat.codes.to_numpy())
+            np.save(os.path.join(tmp_path, f"{i}.categories.npy"), series.cat.categories.to_numpy(dtype=str))
+        else:
+            kind = "numeric"
+            np.save(os.path.join(tmp_path, f"{i}.npy"), series.to_numpy())
+        meta["columns"].append({"name": col, "file": str(i), "kind": kind})
+
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    # Ayni kaynagin eski onbellekleri artik gecersiz (bu ozetin onbellegi haric: es zamanli
+    # bir yukleyici onu olusturmus ve okuyor olabilir)
+    cache_root = os.path.dirname(cache_path)
+    for name in os.listdir(cache_root):
+        full = os.path.join(cache_root, name)
+        if name.startswith(_cache_prefix(csv_path)) and ".tmp-" not in name and full != cache_path:
+            shutil.rmtree(full, ignore_errors=True)
+
+    try:
+        os.replace(tmp_path, cache_path)
+    except OSError:  # baska bir process ayni onbellegi once yazdi; onunki kullanilir
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _read_cached_column(cache_path: str, entry: dict, float32: bool, categorical: bool) -> pd.Series:
+    base = os.path.join(cache_path, entry["file"])
+    if entry["kind"] == "category":
+        codes = np.load(base + ".codes.npy")
+        categories = np.load(base + ".categories.npy")
+        values = pd.Categorical.from_codes(codes, categories=categories)
+        if not categorical:
+            return pd.Series(values, name=entry["name"]).astype(object)
+        return pd.Series(values, name=entry["name"])
+
+    values = np.load(base + ".npy")
+    if float32 and values.dtype == np.float64:
+        values = values.astype(np.float32)
+    return pd.Series(values, name=entry["name"])
+
+
+def _open_cache(csv_path: str) -> tuple[str, dict]:
+    """Kaynagin onbellegini (gerekirse olusturarak) acar; onbellek yolu ve meta.json."""
+    cache_path = _cache_path(csv_path, file_fingerprint(csv_path))
+    if not os.path.exists(os.path.join(cache_path, "meta.json")):
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        _build_cache(csv_path, cache_path)
+
+    with open(os.path.join(cache_path, "meta.json")) as f:
+        return cache_path, json.load(f)
+
+
+@instrumented("load_owid")
+def load_owid(
+    columns: list[str] | None = None,
+    path: str | None = None,
+    float32: bool = False,
+    categorical: bool = True,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """
+    OWID CO2 veri setini tipli ve onbellekli olarak yukler.
+
+    columns     : Okunacak sutunlar (None -> tumu). Veri setinde olmayan sutunlar yok sayilir.
+    path        : CSV yolu (None -> DATA_PATHS).
+    float32     : True ise metrik sutunlari float32 olarak dondurulur.
+    categorical : False ise country/iso_code object (str) olarak dondurulur.
+    use_cache   : False ise onbellek atlanir ve CSV dogrudan okunur.
+    """
+    csv_path = find_data_path(path)
+
+    if not use_cache:
+        data = read_owid_csv(csv_path, columns)
+        for col in CATEGORICAL_COLUMNS:
+            if col in data.columns and not categorical:
+                data[col] = data[col].astype(object)
+        if float32:
+            float_cols = data.select_dtypes("float64").columns
+            data[float_cols] = data[float_cols].astype(np.float32)
+        return data
+
+    cache_path, meta = _open_cache(csv_path)
+    wanted = None if columns is None else set(columns)
+    series = [
+        _read_cached_column(cache_path, entry, float32, categorical)
+        for entry in meta["columns"]
+        if wanted is None or entry["name"] in wanted
+    ]
+    return pd.concat(series, axis=1) if series else pd.DataFrame(index=pd.RangeIndex(meta["n_rows"]))
+
+
+@instrumented("load_owid_compact")
+def load_owid_compact(
+    columns: list[str] | None = None,
+    path: str | None = None,
+    group_col: str = "country",
+    time_col: str = "year",
+) -> CompactPanel:
+    """
+    OWID veri setini CompactPanel olarak yukler: anahtarlar okunduktan sonra her sayisal
+    sutun onbellekten tek basina okunup izgaraya yerlestirilir; bellekte ayni anda en fazla
+    bir float64 sutun bulunur, DataFrame hic olusturulmaz.
+
+    columns : Izgaraya alinacak sutunlar (None -> tum sayisal sutunlar). Kategorik sutunlar
+              (iso_code) ve veri setinde olmayanlar yok sayilir.
+    """
+    cache_path, meta = _open_cache(find_data_path(path))
+    entries = {entry["name"]: entry for entry in meta["columns"]}
+    groups = _read_cached_column(cache_path, entries[group_col], float32=False, categorical=True)
+    times = np.load(os.path.join(cache_path, entries[time_col]["file"] + ".npy"))
+    panel = CompactPanel.from_keys(groups.array, times, group_col, time_col)
+    del groups, times
+
+    wanted = None if columns is None else set(columns)
+    for entry in meta["columns"]:
+        if entry["kind"] != "numeric" or entry["name"] in (group_col, time_col):
+            continue
+        if wanted is None or entry["name"] in wanted:
+            panel.add_column(entry["name"], np.load(os.path.join(cache_path, entry["file"] + ".npy")))
+    return panel
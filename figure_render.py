@@ -0,0 +1,200 @@
+"""
+Rapor PNG'leri icin cizim katmani: her figur kendi kendine yeten bir "spec"tir ve bir Agg
+worker havuzunda cizilir.
+
+    @renderer("global_trend")
+    def _draw_global_trend(fig, data): ...      # sadece fig ve data kullanir
+
+    emit(figure_spec("global_trend", "img/global_co2_trend.png", (12, 6), yearly=yearly))
+
+    with FigureRenderer(jobs=4, cache=ArtifactCache()) as figures:
+        for spec in take_pending():
+            figures.submit(spec)
+
+- Spec: {"kind", "path", "figsize", "data"}; data sadece cizime giren (kucuk) tablolar, diziler
+  ve sabitlerdir (renkler dahil), global duruma bakilmaz. Rapor bolumleri hesaplamayi yapar
+  ve spec uretir; cizim ayri process'lerde yapilir.
+- Her figur pyplot'a kaydedilmeden (matplotlib.figure.Figure + FigureCanvasAgg) cizilir,
+  kaydedilir ve kapatilir; calisma boyunca acik figur birikmez.
+- Anahtar (bkz. artifact_cache): tur, yol, figsize, data ozeti ve cizim fonksiyonunun kod
+  surumu (+ kutuphane surumleri). Anahtar onbellekte varsa figur yeniden cizilmez.
+- Cizim fonksiyonlari kayit defterinde (RENDERERS) tur adiyla tutulur; worker'lar fork ile
+  baslatildigindan ana process'te kaydedilen fonksiyonlari gorur (bkz. task_graph).
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentation
+from artifact_cache import ArtifactCache, artifact_key, code_version, fingerprint, record
+from instrumentation import span
+
+# tur adi -> cizim fonksiyonu draw(fig, data)
+RENDERERS: dict = {}
+
+# Bu process'te uretilen ve henuz cizime gonderilmemis spec'ler (bkz. emit / take_pending)
+_PENDING: list = []
+
+
+def renderer(kind: str):
+    """Cizim fonksiyonunu tur adiyla kaydeden dekorator."""
+
+    def register(fn):
+        RENDERERS[kind] = fn
+        return fn
+
+    return register
+
+
+def figure_spec(kind: str, path: str, figsize: tuple, **data) -> dict:
+    """Cizim icin gereken her seyi iceren spec."""
+    return {"kind": kind, "path": path, "figsize": tuple(figsize), "data": data}
+
+
+def emit(spec: dict) -> None:
+    """Spec'i bu process'in bekleyen listesine ekler (worker'dan ana process'e tasinir)."""
+    _PENDING.append(spec)
+
+
+def pending() -> list[dict]:
+    """Bekleyen spec'ler (liste bosaltilmaz)."""
+    return list(_PENDING)
+
+
+def take_pending() -> list[dict]:
+    """Bekleyen spec'leri dondurur ve listeyi bosaltir."""
+    specs = list(_PENDING)
+    _PENDING.clear()
+    return specs
+
+
+# --- anahtar ---------------------------------------------------------------------------
+
+
+def spec_key(spec: dict) -> tuple[str, str, dict, dict]:
+    """
+    Spec'in artifact anahtari: tur, cizim fonksiyonunun kod surumu, yol / boyut ve verinin
+    icerik ozeti. Donus: (anahtar, kod surumu, parametreler, girdiler)
+    """
+    code = code_version(RENDERERS[spec["kind"]])
+    params = {"path": spec["path"], "figsize": list(spec["figsize"])}
+    inputs = {"data": fingerprint(spec["data"])}
+    return artifact_key(f"figure:{spec['kind']}", code, params, inputs), code, params, inputs
+
+
+# --- cizim -----------------------------------------------------------------------------
+
+
+def render_spec(spec: dict) -> str:
+    """
+    Spec'i pyplot disinda bir Agg figurune cizer ve PNG olarak kaydeder (once gecici dosyaya,
+    sonra yerine tasinir). Figur her durumda temizlenir. Donus: yazilan dosya yolu.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    path = spec["path"]
+    fig = Figure(figsize=spec["figsize"])
+    FigureCanvasAgg(fig)
+    try:
+        with span(f"render:{spec['kind']}", path=path):
+            RENDERERS[spec["kind"]](fig, spec["data"])
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            with span("savefig", path=path):
+                fig.savefig(tmp_path, format="png")
+            os.replace(tmp_path, path)
+    finally:
+        fig.clear()
+    return path
+
+
+def _render_in_worker(spec: dict) -> tuple[str, float, list]:
+    """render_spec + sure; pool worker'inda kaydedilen span'ler de ana process'e doner."""
+    t0 = time.perf_counter()
+    render_spec(spec)
+    return spec["path"], time.perf_counter() - t0, instrumentation.worker_spans()
+
+
+class FigureRenderer:
+    """
+    Spec'leri bir process havuzunda cizer; artifact onbellegi verilirse anahtari degismeyen
+    figurler cizilmez, dosya onbellekten yerine konur (icerik ayniysa dokunulmaz).
+
+    jobs  : cizim worker sayisi (None -> CPU sayisi, 1 -> ayni process'te, sirayla)
+    cache : ArtifactCache; None ise her spec cizilir
+    force : onbellege bakmadan tum figurleri ciz (sonuclar yine onbellege yazilir)
+    """
+
+    def __init__(self, jobs: int | None = None, cache: ArtifactCache | None = None, force: bool = False):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache = cache
+        self.force = force
+        self.rendered = 0
+        self.skipped = 0
+        self.render_seconds = 0.0
+        self._pool = None
+        self._futures: list = []
+
+    def submit(self, spec: dict) -> bool:
+        """Spec'i cizime gonderir; onbellekte varsa atlar. Donus: cizilecekse True."""
+        key = spec_key(spec) if self.cache is not None else None
+        if key is not None and not self.force:
+            entry = self.cache.get(key[0])
+            if entry is not None and spec["path"] in entry["files"]:
+                status = self.cache.restore(entry)
+                record(spec["path"], entry, status[spec["path"]])
+                self.skipped += 1
+                return False
+
+        if self.jobs == 1:
+            _, elapsed, _ = _render_in_worker(spec)
+            self._done(spec, key, elapsed)
+            return True
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.jobs)
+        self._futures.append((spec, key, self._pool.submit(_render_in_worker, spec)))
+        return True
+
+    def _done(self, spec: dict, key: tuple | None, elapsed: float) -> None:
+        self.rendered += 1
+        self.render_seconds += elapsed
+        if key is not None:
+            digest, code, params, inputs = key
+            path = spec["path"]
+            entry = self.cache.put(digest, f"figure:{spec['kind']}", code, files={path: path}, params=params, inputs=inputs)
+            record(path, entry, "produced")
+
+    def close(self) -> dict:
+        """Bekleyen cizimleri bitirir; ilk cizim hatasi (digerleri bittikten sonra) yeniden firlatilir."""
+        error = None
+        for spec, key, future in self._futures:
+            try:
+                _, elapsed, spans = future.result()
+            except Exception as exc:
+                error = error or exc
+                continue
+            instrumentation.extend(spans)
+            self._done(spec, key, elapsed)
+        self._futures.clear()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if error is not None:
+            raise error
+        return self.stats()
+
+    def stats(self) -> dict:
+        return {"rendered": self.rendered, "skipped": self.skipped, "render_seconds": round(self.render_seconds, 2)}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        return False
@@ -0,0 +1,103 @@
+"""
+Fosil yakit karisimi: tum ulkeler ve tum yillar icin yakit paylari, tek vektorel geciste.
+
+Ulke basina sort + dropna + tail(1) + concat yerine panelin yakit sutunlari bir kez
+(satir x yakit) matrisine alinir; toplamlar, paylar ve "tum yakitlar dolu" maskesi tum
+satirlar icin birlikte hesaplanir. Her ulkenin son tam yili, ulke kodlari uzerinden bir
+kerede bulunan satir konumlari tablosudur (son_tam[ulke kodu] -> satir); sorgu tarama
+degil, dogrudan indekslemedir.
+
+- FuelMix(panel).table: country, year, yakit degerleri, total_fossil, <yakit>_share, complete
+- mix(fuels): yakitlarin bir alt kumesi icin ayni tablo (paylar alt kumenin toplamina gore);
+  alt kume basina bir kez hesaplanir ve saklanir
+- last_complete(countries, fuels): her ulkenin tum yakitlari dolu son yili
+- series(country, fuels): ulkenin yillara gore karisimi (grafikler icin)
+
+Rapor bu nesneyi EDA baglaminda bir kez kurar (bkz. co2-data._eda_context); yigin cubuk
+grafigi ve ileride eklenecek karisim zaman serileri ayni tablodan okur.
+"""
+
+import numpy as np
+import pandas as pd
+
+from panel_index import as_panel
+
+FUEL_COLUMNS = ["coal_co2", "oil_co2", "gas_co2", "cement_co2", "flaring_co2"]
+
+
+class FuelMix:
+    """
+    Panelin yakit sutunlari uzerinde onceden hesaplanmis karisim tablolari.
+
+    fuels : dikkate alinacak yakit sutunlari; panelde olmayanlar atlanir
+    """
+
+    def __init__(self, data, fuels=FUEL_COLUMNS):
+        panel = as_panel(data)
+        self.panel = panel
+        self.fuels = [c for c in fuels if c in panel.frame.columns]
+        self._values = panel.frame[self.fuels].to_numpy(dtype=np.float64, na_value=np.nan)
+        self._mixes: dict = {}
+        self._last: dict = {}
+        self.table = self.mix()
+
+    def mix(self, fuels=None) -> pd.DataFrame:
+        """
+        Tum satirlar icin karisim tablosu (panel sirasi ve indeks etiketleri korunur).
+        total_fossil eksik yakitlari 0 sayar (DataFrame.sum(axis=1) ile ayni); complete
+        tum yakitlarin dolu oldugu satirlardir.
+        """
+        fuels = self._subset(fuels)
+        if fuels not in self._mixes:
+            values = self._values[:, [self.fuels.index(c) for c in fuels]]
+            missing = np.isnan(values)
+            total = np.zeros(len(values))
+            for j in range(values.shape[1]):  # soldan saga toplam: satir toplamiyla ayni sira
+                total = total + np.where(missing[:, j], 0.0, values[:, j])
+
+            frame = self.panel.frame
+            out = {self.panel.group_col: frame[self.panel.group_col], self.panel.time_col: frame[self.panel.time_col]}
+            out.update({c: values[:, j] for j, c in enumerate(fuels)})
+            out["total_fossil"] = total
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out.update({f"{c}_share": (values[:, j] / total) * 100 for j, c in enumerate(fuels)})
+            out["complete"] = ~missing.any(axis=1)
+            self._mixes[fuels] = pd.DataFrame(out, index=frame.index)
+        return self._mixes[fuels]
+
+    def _subset(self, fuels) -> tuple:
+        if fuels is None:
+            return tuple(self.fuels)
+        unknown = [c for c in fuels if c not in self.fuels]
+        if unknown:
+            raise KeyError(f"Karisimda olmayan yakit sutunlari: {unknown}")
+        return tuple(fuels)
+
+    def _last_complete_rows(self, fuels: tuple) -> np.ndarray:
+        """Ulke kodu -> son tam satirin konumu (-1 = yok); alt kume basina bir kez."""
+        if fuels not in self._last:
+            last = np.full(len(self.panel.countries), -1, dtype=np.intp)
+            rows = np.flatnonzero(self.mix(fuels)["complete"].to_numpy())
+            last[self.panel.group_codes()[rows]] = rows  # satirlar yil sirasinda: son yazilan kalir
+            self._last[fuels] = last
+        return self._last[fuels]
+
+    def last_complete(self, countries=None, fuels=None) -> pd.DataFrame:
+        """
+        Her ulkenin tum yakitlari dolu son yilinin satiri (mix tablosundan). countries
+        verilirse bu sirada; bilinmeyen veya tam yili olmayan ulkeler atlanir.
+        """
+        fuels = self._subset(fuels)
+        last = self._last_complete_rows(fuels)
+        if countries is None:
+            rows = last[last >= 0]
+        else:
+            code_of = {c: i for i, c in enumerate(self.panel.countries)}
+            rows = np.array([last[code_of[c]] for c in countries if c in code_of], dtype=np.intp)
+            rows = rows[rows >= 0]
+        return self.mix(fuels).take(rows)
+
+    def series(self, country, fuels=None, start=None, end=None) -> pd.DataFrame:
+        """Ulkenin yillara gore karisimi (start <= yil <= end); bilinmeyen ulke -> bos."""
+        lo, hi = self.panel.bounds(country, start, end)
+        return self.mix(fuels).iloc[lo:hi]
@@ -6,10 +6,16 @@ Unlem isaretleri ile kirlilik gosterimi
 
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import warnings
-warnings.filterwarnings('ignore')
+import argparse
+from data_loader import load_owid
+from imputation import impute_by_group
+from panel_index import PanelIndex, as_panel
+from panel_store import PanelStore
+from artifact_cache import artifact_key, code_version, fingerprint
+from pollution_scale import data_range, pollution_colors, pollution_style
+from html_export import DEFAULT_PRECISION, write_compact_html
+from instrumentation import span
 
 # Ulke koordinatlari (enlem, boylam)
 COUNTRY_COORDS = {
@@ -24,50 +30,17 @@ COUNTRY_COORDS = {
 # CO2 degerine gore renk hesapla (dusuk=yesil/sari, yuksek=turuncu/kirmizi)
 def get_pollution_color(co2_value, min_co2=100, max_co2=12000):
     """
-    CO2 degerine gore renk dondurur
-    Dusuk kirlilik: Yesil -> Sari
-    Yuksek kirlilik: Turuncu -> Kirmizi
+    CO2 degerine gore renk dondurur (tekil deger)
+    Diziler icin pollution_scale.pollution_style / pollution_colors kullanilir
     """
-    if co2_value <= 0:
-        return 'rgb(100, 200, 100)'  # Yesil (veri yok)
-    
-    # Normalizasyon (0-1 arasi)
-    normalized = min(1, max(0, (co2_value - min_co2) / (max_co2 - min_co2)))
-    
-    # Renk gecisi: Yesil -> Sari -> Turuncu -> Kirmizi
-    if normalized < 0.25:
-        # Yesil -> Sari-yesil
-        r = int(100 + normalized * 4 * 155)  # 100 -> 255
-        g = int(200 + normalized * 4 * 55)   # 200 -> 255
-        b = int(100 - normalized * 4 * 100)  # 100 -> 0
-    elif normalized < 0.5:
-        # Sari-yesil -> Sari
-        t = (normalized - 0.25) * 4
-        r = 255
-        g = 255
-        b = int(0)
-    elif normalized < 0.75:
-        # Sari -> Turuncu
-        t = (normalized - 0.5) * 4
-        r = 255
-        g = int(255 - t * 130)  # 255 -> 125
-        b = 0
-    else:
-        # Turuncu -> Kirmizi
-        t = (normalized - 0.75) * 4
-        r = 255
-        g = int(125 - t * 125)  # 125 -> 0
-        b = 0
-    
-    return f'rgb({r}, {g}, {b})'
+    return pollution_colors(np.array([co2_value]), min_co2, max_co2)[0]
+
+# Gorsellestirmelerde kullanilan sutunlar
+GLOBE_COLUMNS = ['country', 'year', 'co2', 'co2_per_capita', 'population', 'gdp']
 
-def load_data():
-    """Veri setini yukler"""
-    try:
-        data = pd.read_csv("Datasets/owid-co2-data.csv")
-    except FileNotFoundError:
-        data = pd.read_csv("Nature-Pollution/Datasets/owid-co2-data.csv")
-    return data
+def load_data(columns=GLOBE_COLUMNS):
+    """Veri setini yukler (sadece gerekli sutunlar, onbellekli)"""
+    return load_owid(columns=columns)
 
 def prepare_country_data(df, countries, start_year=1990, end_year=2024):
     """Ulke verilerini hazirlar"""
@@ -75,25 +48,35 @@ def prepare_country_data(df, countries, start_year=1990, end_year=2024):
         (df['country'].isin(countries)) & 
         (df['year'] >= start_year) & 
         (df['year'] <= end_year)
-    ].copy()
+    ]
     
-    df_filtered = df_filtered.sort_values(['country', 'year'])
-    df_filtered['co2'] = df_filtered.groupby('country')['co2'].transform(
-        lambda x: x.interpolate(method='linear', limit_direction='both')
-    )
-    df_filtered['co2_per_capita'] = df_filtered.groupby('country')['co2_per_capita'].transform(
-        lambda x: x.interpolate(method='linear', limit_direction='both')
-    )
+    df_filtered = impute_by_group(df_filtered, ['co2', 'co2_per_capita'], mode='both')
     
     return df_filtered
 
-def create_3d_globe_visualization(df, year):
+def stored_country_data(countries, store=None):
+    """
+    prepare_country_data(load_data(), countries) sonucu, panel deposundan (StoredPanel).
+    Veri veya hazirlik kodu degismediyse doldurma tekrarlanmaz; grafik fonksiyonlari ve
+    worker process'ler paneli diskten salt-okunur, kopyasiz eslenmis olarak kullanir.
+    """
+    store = store or PanelStore()
+    df = load_data()
+    key = artifact_key("globe_panel", code_version(prepare_country_data), params=list(countries), inputs=fingerprint(df))
+    return store.get(key) or store.put(key, prepare_country_data(df, countries))
+
+def create_3d_globe_visualization(df, year, color_range=None):
     """
     Belirli bir yil icin 3D dunya gorsellestirmesi olusturur
     Unlem isareti marker'lari ile
+    df: DataFrame veya PanelIndex (ulke/yil erisimi indeksten yapilir)
+    color_range: (min, max) renk araligi (None -> o yilin verisinden)
     """
+    import plotly.graph_objects as go
+    
     countries = list(COUNTRY_COORDS.keys())
-    df_year = df[df['year'] == year]
+    panel = as_panel(df)
+    df_year = panel.year(year)
     
     # Toplam CO2 ve diger metrikleri hesapla (yuzdelik icin)
     total_co2 = df_year['co2'].sum()
@@ -104,19 +87,17 @@ def create_3d_globe_visualization(df, year):
     lats = []
     lons = []
     hover_texts = []
-    marker_texts = []  # Unlem isaretleri
-    sizes = []
-    colors = []
+    co2_values = []
     
     for country in countries:
         coords = COUNTRY_COORDS[country]
-        country_data = df_year[df_year['country'] == country]
+        country_data = panel.row(country, year)
         
-        if not country_data.empty:
-            co2 = country_data['co2'].values[0]
-            co2_pc = country_data['co2_per_capita'].values[0] if 'co2_per_capita' in country_data.columns else 0
-            pop = country_data['population'].values[0] if 'population' in country_data.columns else 0
-            gdp = country_data['gdp'].values[0] if 'gdp' in country_data.columns else 0
+        if country_data is not None:
+            co2 = country_data['co2']
+            co2_pc = country_data['co2_per_capita'] if 'co2_per_capita' in country_data.index else 0
+            pop = country_data['population'] if 'population' in country_data.index else 0
+            gdp = country_data['gdp'] if 'gdp' in country_data.index else 0
         else:
             co2 = 0
             co2_pc = 0
@@ -125,22 +106,7 @@ def create_3d_globe_visualization(df, year):
         
         lats.append(coords['lat'])
         lons.append(coords['lon'])
-        
-        # Kirlilik rengini hesapla
-        color = get_pollution_color(co2)
-        colors.append(color)
-        
-        # Marker boyutu CO2 emisyonuna gore
-        size = max(20, min(60, co2 / 150)) if co2 > 0 else 20
-        sizes.append(size)
-        
-        # Unlem isareti (kirlilik seviyesine gore sayisi artar)
-        if co2 > 8000:
-            marker_texts.append("!!!")
-        elif co2 > 4000:
-            marker_texts.append("!!")
-        else:
-            marker_texts.append("!")
+        co2_values.append(co2)
         
         # Yuzdelik hesaplamalar
         co2_pct = (co2 / total_co2 * 100) if total_co2 > 0 else 0
@@ -161,6 +127,10 @@ def create_3d_globe_visualization(df, year):
         hover_text += f"GDP: ${gdp/1e9:,.1f} B"
         hover_texts.append(hover_text)
     
+    # Kirlilik rengi, marker boyutu ve unlem isaretleri (tum ulkeler icin tek cagrida)
+    style = pollution_style(co2_values, *(color_range or (None, None)))
+    marker_texts, sizes, colors = style['glyphs'], style['sizes'], style['colors']
+    
     # 3D Globe Figure
     fig = go.Figure()
     
@@ -180,7 +150,7 @@ def create_3d_globe_visualization(df, year):
             symbol='circle'
         ),
         textfont=dict(
-            size=[s * 0.8 for s in sizes],
+            size=sizes * 0.8,
             color='white',
             family='Arial Black'
         ),
@@ -235,145 +205,162 @@ def create_3d_globe_visualization(df, year):
     
     return fig
 
-def create_animated_globe(df, start_year=2000, end_year=2024):
+def build_globe_frames(df, countries, years, value_cols=('co2', 'co2_per_capita', 'population', 'gdp'), color_range=None):
     """
-    Yil slider'i ile animasyonlu 3D globe olusturur
-    Unlem isaretleri ve kirlilik renkleri ile
+    Animasyon karelerinin tum dizilerini (yil x ulke) matrisleri olarak tek seferde hesaplar.
+    
+    Donus: sozluk; her deger (len(years), len(countries)) seklinde:
+    - value_cols: degerler (eksik ulke / deger -> 0)
+    - sizes, colors, glyphs: marker boyutu, rengi ve unlem isaretleri
+    - co2_pct: o yilin toplam CO2'sine gore dunya payi (%)
+    - pop_pct, co2_pc_pct: nufus payi ve en yuksek kisi basi degere orani (%)
+    - range: kullanilan renk araligi (color_range None ise tum karelerin verisinden)
     """
-    countries = list(COUNTRY_COORDS.keys())
-    years = list(range(start_year, end_year + 1))
-    
-    # Ilk frame icin veri
-    df_first = df[df['year'] == start_year]
-    
-    lats, lons, marker_texts, hover_texts, sizes, colors = [], [], [], [], [], []
-    
-    for country in countries:
-        coords = COUNTRY_COORDS[country]
-        country_data = df_first[df_first['country'] == country]
-        
-        if not country_data.empty:
-            co2 = country_data['co2'].values[0] if pd.notna(country_data['co2'].values[0]) else 0
-            co2_pc = country_data['co2_per_capita'].values[0] if pd.notna(country_data['co2_per_capita'].values[0]) else 0
-            pop = country_data['population'].values[0] if pd.notna(country_data['population'].values[0]) else 0
-        else:
-            co2, co2_pc, pop = 0, 0, 0
-        
-        lats.append(coords['lat'])
-        lons.append(coords['lon'])
-        colors.append(get_pollution_color(co2))
-        sizes.append(max(20, min(60, co2 / 150)) if co2 > 0 else 20)
-        
-        if co2 > 8000:
-            marker_texts.append("!!!")
-        elif co2 > 4000:
-            marker_texts.append("!!")
-        else:
-            marker_texts.append("!")
-            
-        hover_texts.append(f"<b>{country}</b><br>CO2: {co2:,.0f} Mt<br>Kisi Basi: {co2_pc:.2f} ton")
-    
-    # Ana figure
-    fig = go.Figure()
-    
-    # Scatter marker
-    fig.add_trace(go.Scattergeo(
+    panel = as_panel(df)
+    frame = panel.frame
+    years = np.asarray(years)
+    year_pos = pd.Index(years)
+    country_pos = pd.Index(countries)
+    
+    # (yil, ulke) konumlari: listedeki ulkelerin satirlari tek seferde matrise yerlestirilir
+    rows = panel.select(countries)
+    yi = year_pos.get_indexer(rows[panel.time_col])
+    ci = country_pos.get_indexer(rows[panel.group_col])
+    keep = (yi >= 0) & (ci >= 0)
+    
+    out = {}
+    for col in value_cols:
+        matrix = np.zeros((len(years), len(countries)), dtype=np.float64)
+        matrix[yi[keep], ci[keep]] = rows[col].to_numpy(dtype=np.float64, na_value=np.nan)[keep]
+        out[col] = np.nan_to_num(matrix, nan=0.0)
+    
+    # Yillik toplamlar: (df[df['year'] == year] uzerinden) tum satirlar
+    by_year = frame.groupby(panel.time_col, observed=True)
+    total_co2 = by_year['co2'].sum().reindex(years, fill_value=0).to_numpy(dtype=np.float64)
+    total_pop = by_year['population'].sum().reindex(years, fill_value=0).to_numpy(dtype=np.float64)
+    max_co2_pc = by_year['co2_per_capita'].max().reindex(years).to_numpy(dtype=np.float64)
+    
+    def share(values, totals):
+        totals = totals[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(totals > 0, values / totals * 100, 0.0)
+    
+    co2 = out['co2']
+    out['co2_pct'] = share(co2, total_co2)
+    out['pop_pct'] = share(out['population'], total_pop)
+    out['co2_pc_pct'] = share(out['co2_per_capita'], max_co2_pc)
+    style = pollution_style(co2, *(color_range or data_range(co2)))
+    out['sizes'], out['colors'], out['glyphs'] = style['sizes'], style['colors'], style['glyphs']
+    out['range'] = style['range']
+    return out
+
+# Animasyon karelerinin hover sablonu; degerler customdata'dan (co2, dunya payi, kisi basi, nufus [M])
+FRAME_HOVERTEMPLATE = (
+    "<b>%{{hovertext}}</b><br>"
+    "<b>Yil: {year}</b><br><br>"
+    "<b>CO2:</b> %{{customdata[0]:,.0f}} Mt<br>"
+    "<b>Dunya Payi: %{{customdata[1]:.1f}}%</b><br><br>"
+    "Kisi Basi: %{{customdata[2]:.2f}} ton<br>"
+    "Nufus: %{{customdata[3]:,.1f}} M"
+    "<extra></extra>"
+)
+
+def _frame_customdata(arrays, t):
+    """Hover sablonunun degerleri: co2, dunya payi, kisi basi, nufus (milyon)"""
+    return np.column_stack([
+        arrays['co2'][t], arrays['co2_pct'][t], arrays['co2_per_capita'][t], arrays['population'][t] / 1e6
+    ])
+
+def _globe_frame_update(arrays, t, hovertemplate):
+    """
+    Delta kare: sadece yildan yila degisen ozellikler (glyph, hover, boyut, renk).
+    plotly.js kareyi mevcut ize birlestirir; lon/lat, marker.line ve yazi tipi gibi sabit
+    ozellikler her karede tekrar yazilmaz.
+    """
+    sizes = arrays['sizes'][t]
+    return dict(
+        type='scattergeo',
+        text=arrays['glyphs'][t],
+        customdata=_frame_customdata(arrays, t),
+        hovertemplate=hovertemplate,
+        marker=dict(size=sizes, color=arrays['colors'][t]),
+        textfont=dict(size=sizes * 0.8),
+    )
+
+def _globe_trace(lons, lats, countries, arrays, t, hovertemplate, **kwargs):
+    """
+    Karenin (t. yil) Scattergeo izi (dict); tum degerler onceden hesaplanmis matrislerden okunur.
+    Iz, go.Scattergeo yerine dict olarak dondurulur: plotly her izi figure'a eklenirken bir kez
+    dogrular (go.Frame + fig.frames ile iki kez dogrulanirdi).
+    """
+    sizes = arrays['sizes'][t]
+    return dict(
+        type='scattergeo',
         lon=lons,
         lat=lats,
-        text=marker_texts,
-        hovertext=hover_texts,
-        hoverinfo='text',
+        text=arrays['glyphs'][t],
+        hovertext=countries,
+        customdata=_frame_customdata(arrays, t),
+        hovertemplate=hovertemplate,
         mode='text+markers',
         marker=dict(
             size=sizes,
-            color=colors,
+            color=arrays['colors'][t],
             opacity=0.9,
             line=dict(width=3, color='white'),
         ),
         textfont=dict(
-            size=[s * 0.8 for s in sizes],
+            size=sizes * 0.8,
             color='white',
             family='Arial Black'
         ),
         textposition='middle center',
-        showlegend=False
-    ))
+        **kwargs
+    )
+
+def create_animated_globe(df, start_year=2000, end_year=2024, coords=None, color_range=None, delta_frames=False):
+    """
+    Yil slider'i ile animasyonlu 3D globe olusturur
+    Unlem isaretleri ve kirlilik renkleri ile
+    df    : DataFrame veya PanelIndex
+    coords: {ulke: {'lat': .., 'lon': ..}} (varsayilan COUNTRY_COORDS)
+    color_range: (min, max) renk araligi (None -> tum karelerin verisinden; kareler arasi ortak)
+    delta_frames: True ise kareler sadece degisen ozellikleri tasir (kompakt HTML icin)
     
-    # Her yil icin frame olustur
-    frames = []
-    for year in years:
-        df_year = df[df['year'] == year]
-        
-        # O yil icin toplamlar
-        total_co2_year = df_year['co2'].sum()
-        total_pop_year = df_year['population'].sum() if 'population' in df_year.columns else 1
-        max_co2_pc_year = df_year['co2_per_capita'].max() if 'co2_per_capita' in df_year.columns else 1
-        
-        frame_sizes = []
-        frame_colors = []
-        frame_marker_texts = []
-        frame_hover_texts = []
-        
-        for country in countries:
-            country_data = df_year[df_year['country'] == country]
-            
-            if not country_data.empty:
-                co2 = country_data['co2'].values[0] if pd.notna(country_data['co2'].values[0]) else 0
-                co2_pc = country_data['co2_per_capita'].values[0] if pd.notna(country_data['co2_per_capita'].values[0]) else 0
-                pop = country_data['population'].values[0] if pd.notna(country_data['population'].values[0]) else 0
-                gdp = country_data['gdp'].values[0] if pd.notna(country_data['gdp'].values[0]) else 0
-            else:
-                co2, co2_pc, pop, gdp = 0, 0, 0, 0
-            
-            frame_sizes.append(max(20, min(60, co2 / 150)) if co2 > 0 else 20)
-            frame_colors.append(get_pollution_color(co2))
-            
-            if co2 > 8000:
-                frame_marker_texts.append("!!!")
-            elif co2 > 4000:
-                frame_marker_texts.append("!!")
-            else:
-                frame_marker_texts.append("!")
-            
-            # Yuzdelik hesaplamalar
-            co2_pct = (co2 / total_co2_year * 100) if total_co2_year > 0 else 0
-            pop_pct = (pop / total_pop_year * 100) if total_pop_year > 0 else 0
-            co2_pc_pct = (co2_pc / max_co2_pc_year * 100) if max_co2_pc_year > 0 else 0
-            
-            frame_hover_texts.append(
-                f"<b>{country}</b><br>"
-                f"<b>Yil: {year}</b><br><br>"
-                f"<b>CO2:</b> {co2:,.0f} Mt<br>"
-                f"<b>Dunya Payi: {co2_pct:.1f}%</b><br><br>"
-                f"Kisi Basi: {co2_pc:.2f} ton<br>"
-                f"Nufus: {pop/1e6:,.1f} M"
+    Tum karelerin dizileri build_globe_frames ile tek seferde hesaplanir; kareler bu
+    matrislerin satirlarindan tek geciste olusturulur.
+    """
+    import plotly.graph_objects as go
+    
+    coords = COUNTRY_COORDS if coords is None else coords
+    countries = list(coords.keys())
+    years = list(range(start_year, end_year + 1))
+    lats = [coords[c]['lat'] for c in countries]
+    lons = [coords[c]['lon'] for c in countries]
+    
+    arrays = build_globe_frames(df, countries, years, color_range=color_range)
+    
+    # Ana figure: ilk yilin (kisa hover'li) izi
+    first_hovertemplate = (
+        "<b>%{hovertext}</b><br>CO2: %{customdata[0]:,.0f} Mt<br>Kisi Basi: %{customdata[2]:.2f} ton<extra></extra>"
+    )
+    fig = go.Figure()
+    fig.add_trace(_globe_trace(lons, lats, countries, arrays, 0, first_hovertemplate, showlegend=False))
+    
+    # Her yil icin frame
+    if delta_frames:
+        fig.frames = [
+            dict(data=[_globe_frame_update(arrays, t, FRAME_HOVERTEMPLATE.format(year=year))], traces=[0], name=str(year))
+            for t, year in enumerate(years)
+        ]
+    else:
+        fig.frames = [
+            dict(
+                data=[_globe_trace(lons, lats, countries, arrays, t, FRAME_HOVERTEMPLATE.format(year=year))],
+                name=str(year)
             )
-        
-        frames.append(go.Frame(
-            data=[go.Scattergeo(
-                lon=lons,
-                lat=lats,
-                text=frame_marker_texts,
-                hovertext=frame_hover_texts,
-                hoverinfo='text',
-                mode='text+markers',
-                marker=dict(
-                    size=frame_sizes,
-                    color=frame_colors,
-                    opacity=0.9,
-                    line=dict(width=3, color='white'),
-                ),
-                textfont=dict(
-                    size=[s * 0.8 for s in frame_sizes],
-                    color='white',
-                    family='Arial Black'
-                ),
-                textposition='middle center',
-            )],
-            name=str(year)
-        ))
-    
-    fig.frames = frames
+            for t, year in enumerate(years)
+        ]
     
     # Slider ve animasyon butonlari
     sliders = [dict(
@@ -480,18 +467,21 @@ def create_animated_globe(df, start_year=2000, end_year=2024):
     
     return fig
 
-def create_country_comparison_chart(df, countries, year):
-    """Ulkeler arasi karsilastirma cubugu"""
-    df_year = df[(df['year'] == year) & (df['country'].isin(countries))]
+def create_country_comparison_chart(df, countries, year, color_range=None):
+    """
+    Ulkeler arasi karsilastirma cubugu (df: DataFrame veya PanelIndex)
+    color_range: (min, max) renk araligi (None -> grafikteki degerlerden)
+    """
+    import plotly.graph_objects as go
+    
+    panel = as_panel(df)
+    co2_values = panel.values(countries, year, ['co2'])[:, 0]
+    colors = pollution_colors(co2_values, *(color_range or (None, None)))
     
     fig = go.Figure()
     
-    for country in countries:
-        country_data = df_year[df_year['country'] == country]
-        if not country_data.empty:
-            co2 = country_data['co2'].values[0]
-            color = get_pollution_color(co2)
-            
+    for country, co2, color in zip(countries, co2_values, colors):
+        if panel.row_position(country, year) >= 0:
             fig.add_trace(go.Bar(
                 x=[country],
                 y=[co2],
@@ -519,34 +509,51 @@ def create_country_comparison_chart(df, countries, year):
     
     return fig
 
-def main():
-    """Ana fonksiyon - gorsellestirmeleri olusturur ve kaydeder"""
+def save_figure(fig, path, compact=False, precision=DEFAULT_PRECISION):
+    """
+    Figuru HTML olarak kaydeder.
+    compact=True: paylasilan yerel plotly.js, yuvarlanmis sayilar ve .gz kopyasi (bkz. html_export)
+    """
+    with span("write_html", path=path, compact=compact):
+        if not compact:
+            fig.write_html(path)
+            return
+        sizes = write_compact_html(fig, path, precision=precision)
+    print(f"     ({sizes['html'] / 1024:,.0f} KB, gzip {sizes['gzip'] / 1024:,.0f} KB)")
+
+def main(compact=False, precision=DEFAULT_PRECISION):
+    """
+    Ana fonksiyon - gorsellestirmeleri olusturur ve kaydeder
+    compact=True: kompakt HTML modu (delta kareler, paylasilan plotly.js, gzip)
+    """
+    warnings.filterwarnings('ignore')  # import sirasinda degil, sadece script calisirken
+    
     print("[*] 3D Dunya CO2 Gorsellestirmesi Olusturuluyor...")
     print("[*] Unlem isaretleri ve kirlilik renkleri ile...")
     
-    # Veri yukle
-    df = load_data()
+    # Veri yukle (hazirlanmis panel depodan eslenir)
     countries = list(COUNTRY_COORDS.keys())
-    df_prepared = prepare_country_data(df, countries)
+    panel = stored_country_data(countries).panel()  # tum grafikler ayni (country, year) indeksini kullanir
+    color_range = data_range(panel.frame['co2'])  # tum grafikler icin ortak, veriye dayali renk araligi
     
     print("[OK] Veri yuklendi ve islendi")
     
     # Animasyonlu 3D Globe
     print("[*] Animasyonlu 3D Globe olusturuluyor...")
-    fig_animated = create_animated_globe(df_prepared, 2000, 2024)
-    fig_animated.write_html("img/3d_globe_animated.html")
+    fig_animated = create_animated_globe(panel, 2000, 2024, color_range=color_range, delta_frames=compact)
+    save_figure(fig_animated, "img/3d_globe_animated.html", compact, precision)
     print("[OK] Kaydedildi: img/3d_globe_animated.html")
     
     # 2024 yili statik globe
     print("[*] 2024 yili 3D Globe olusturuluyor...")
-    fig_2024 = create_3d_globe_visualization(df_prepared, 2024)
-    fig_2024.write_html("img/3d_globe_2024.html")
+    fig_2024 = create_3d_globe_visualization(panel, 2024, color_range=color_range)
+    save_figure(fig_2024, "img/3d_globe_2024.html", compact, precision)
     print("[OK] Kaydedildi: img/3d_globe_2024.html")
     
     # Ulke karsilastirma
     print("[*] Ulke karsilastirma grafikleri olusturuluyor...")
-    fig_comparison = create_country_comparison_chart(df_prepared, countries, 2024)
-    fig_comparison.write_html("img/country_comparison_2024.html")
+    fig_comparison = create_country_comparison_chart(panel, countries, 2024, color_range=color_range)
+    save_figure(fig_comparison, "img/country_comparison_2024.html", compact, precision)
     print("[OK] Kaydedildi: img/country_comparison_2024.html")
     
     print("\n" + "="*50)
@@ -560,6 +567,13 @@ def main():
     print("   - img/3d_globe_animated.html - Animasyonlu 3D Dunya (2000-2024)")
     print("   - img/3d_globe_2024.html - 2024 Statik 3D Dunya")
     print("   - img/country_comparison_2024.html - Ulke Karsilastirma")
+    if compact:
+        print("   - img/plotly.min.js - Paylasilan plotly.js (+ tum dosyalarin .gz kopyalari)")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="3D globe gorsellestirmeleri")
+    parser.add_argument("--compact", action="store_true", help="kompakt HTML: paylasilan plotly.js, delta kareler, gzip")
+    parser.add_argument("--precision", type=int, default=DEFAULT_PRECISION, help="kompakt modda ondalik basamak sayisi")
+    args = parser.parse_args()
+    
+    main(compact=args.compact, precision=args.precision)
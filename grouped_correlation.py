@@ -0,0 +1,217 @@
+"""
+Gruplu korelasyon motoru: hedef sutun (co2) ile surucu sutunlar arasindaki Pearson /
+Spearman korelasyonlari tum ulkeler icin tek vektorel geciste.
+
+Ulke basina dropna + DataFrame.corr() yerine panel bir kez (ulke x yil) yogun izgarasina
+yerlestirilir; her (ulke, pencere) icin ortalamalar ve merkezlenmis toplamlar numpy
+indirgemeleriyle hesaplanir (iki gecis: once ortalama, sonra sapmalarin carpim toplamlari).
+Ham toplamlardan (sum x*y - n*mx*my) hesaplanmaz; buyuk olcekli sutunlarda (gdp ~ 1e13)
+iptal hatasi olusmaz.
+
+- nan_policy="pairwise": her (hedef, surucu) cifti icin ikisinin de dolu oldugu yillar
+  (DataFrame.corr() ile ayni); "listwise": hedef ve tum suruculerin dolu oldugu yillar
+  (once dropna(subset=...) sonra corr() ile ayni)
+- method="spearman": gecerli yillar uzerinde ortalama siralar (esitlikler ortalanir), sonra
+  Pearson
+- rolling_group_corr: her ulke ve her yil icin [yil - window + 1, yil] penceresinde korelasyon
+
+Sonuclar duzenli tablolardir (country, [year,] driver, corr, n); oneri kurallari
+apply_rules ile bu tablo uzerinde calisir.
+
+    table = group_corr(df_eda, "co2", ["gdp", "energy_per_capita"], nan_policy="listwise")
+    rolling = rolling_group_corr(df_eda, "co2", ["gdp"], window=20)
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from panel_index import as_panel
+
+METHODS = ("pearson", "spearman")
+NAN_POLICIES = ("pairwise", "listwise")
+
+
+def _dense_grid(panel, cols: list[str], countries=None) -> tuple[list, np.ndarray, np.ndarray]:
+    """
+    Paneli (ulke, yil, sutun) yogun dizisine yerlestirir; eksik yillar NaN.
+    Donus: ulkeler (verilen sirada), yillar, grid (G, Y, len(cols)).
+    """
+    codes = panel.group_codes()
+    times = panel.frame[panel.time_col].to_numpy()
+    values = panel.frame[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    if countries is None:
+        selected = list(panel.countries)
+        remap = np.arange(len(selected))
+    else:
+        code_of = {c: i for i, c in enumerate(panel.countries)}
+        selected = [c for c in dict.fromkeys(countries) if c in code_of]
+        remap = np.full(len(panel.countries), -1, dtype=np.intp)
+        remap[[code_of[c] for c in selected]] = np.arange(len(selected))
+
+    rows = remap[codes] if len(codes) else np.zeros(0, dtype=np.intp)
+    keep = rows >= 0
+    years = np.unique(times[keep]) if keep.any() else np.zeros(0, dtype=np.int64)
+    grid = np.full((len(selected), len(years), len(cols)), np.nan)
+    grid[rows[keep], np.searchsorted(years, times[keep])] = values[keep]
+    return selected, years, grid
+
+
+def _average_ranks(x: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Son eksen boyunca gecerli degerlerin ortalama siralari (1'den baslar; esitlikler
+    ortalanir, rank(method="average") ile ayni); gecersiz konumlar NaN.
+    """
+    flat = np.where(valid, x, np.nan).reshape(-1, x.shape[-1])
+    ranks = pd.DataFrame(flat).rank(axis=1, method="average").to_numpy()
+    return ranks.reshape(x.shape)
+
+
+def _constant(x: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Son eksen boyunca gecerli degerleri hep ayni olan (sifir varyansli) konumlar."""
+    return np.where(valid, x, -np.inf).max(-1) == np.where(valid, x, np.inf).min(-1)
+
+
+def _window_corr(x: np.ndarray, y: np.ndarray, method: str, min_periods: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Son eksen boyunca (pencere) korelasyon; x, y ayni bicimli, NaN = eksik.
+    Donus: korelasyon, gecerli gozlem sayisi (son eksen indirgenmis).
+    """
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    if method == "spearman":
+        x, y = _average_ranks(x, valid), _average_ranks(y, valid)
+    n = valid.sum(-1)
+    count = np.maximum(n, 1)
+    mx = np.where(valid, x, 0.0).sum(-1) / count
+    my = np.where(valid, y, 0.0).sum(-1) / count
+    dx = np.where(valid, x - mx[..., None], 0.0)
+    dy = np.where(valid, y - my[..., None], 0.0)
+
+    sxy = (dx * dy).sum(-1)
+    divisor = np.sqrt((dx * dx).sum(-1) * (dy * dy).sum(-1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.clip(sxy / divisor, -1.0, 1.0)
+    # Sabit seriler: ortalamanin yuvarlama hatasi sapmalari tam sifir birakmayabilir
+    constant = _constant(x, valid) | _constant(y, valid)
+    corr[constant | (divisor == 0) | (n < max(min_periods, 2))] = np.nan
+    return corr, n
+
+
+def _check(method: str, nan_policy: str) -> None:
+    if method not in METHODS:
+        raise ValueError(f"Bilinmeyen yontem: {method} (beklenen: {METHODS})")
+    if nan_policy not in NAN_POLICIES:
+        raise ValueError(f"Bilinmeyen NaN politikasi: {nan_policy} (beklenen: {NAN_POLICIES})")
+
+
+def _apply_nan_policy(grid: np.ndarray, nan_policy: str) -> np.ndarray:
+    """listwise: herhangi bir sutunu eksik olan (ulke, yil) hucrelerini tamamen NaN yapar."""
+    if nan_policy == "listwise":
+        grid = np.where(np.isnan(grid).any(-1, keepdims=True), np.nan, grid)
+    return grid
+
+
+def group_corr(
+    data,
+    target: str = "co2",
+    drivers=("gdp", "energy_per_capita", "population"),
+    method: str = "pearson",
+    nan_policy: str = "pairwise",
+    min_periods: int = 2,
+    countries=None,
+) -> pd.DataFrame:
+    """
+    Her ulke icin target ile her surucu arasindaki korelasyon (ulkenin tum yillari).
+
+    data        : DataFrame veya PanelIndex
+    min_periods : bundan az gecerli gozlemli ciftler NaN
+    countries   : None -> tum ulkeler; verilirse bu ulkeler bu sirada (bilinmeyenler atlanir)
+
+    Donus: country, driver, corr, n sutunlu tablo (ulke, surucu sirasinda).
+    """
+    _check(method, nan_policy)
+    drivers = list(drivers)
+    selected, _, grid = _dense_grid(as_panel(data), [target] + drivers, countries)
+    grid = _apply_nan_policy(grid, nan_policy)
+
+    # (G, Y, 1) hedef ile (G, Y, D) suruculer -> yil ekseni sona: (G, D, Y)
+    x = np.broadcast_to(grid[..., :1], grid[..., 1:].shape).transpose(0, 2, 1)
+    y = grid[..., 1:].transpose(0, 2, 1)
+    corr, n = _window_corr(x, y, method, min_periods)
+
+    return pd.DataFrame(
+        {
+            "country": np.repeat(np.array(selected, dtype=object), len(drivers)),
+            "driver": np.tile(np.array(drivers, dtype=object), len(selected)),
+            "corr": corr.ravel(),
+            "n": n.ravel(),
+        }
+    )
+
+
+def rolling_group_corr(
+    data,
+    target: str = "co2",
+    drivers=("gdp", "energy_per_capita", "population"),
+    window: int = 20,
+    method: str = "pearson",
+    nan_policy: str = "pairwise",
+    min_periods: int | None = None,
+    countries=None,
+) -> pd.DataFrame:
+    """
+    Her ulke ve her bitis yili icin window yillik kayan pencerede korelasyon.
+
+    min_periods : None -> window (pandas rolling varsayilani)
+
+    Donus: country, year (pencerenin son yili), driver, corr, n sutunlu tablo; hic gecerli
+    gozlemi olmayan pencereler tabloda yer almaz.
+    """
+    _check(method, nan_policy)
+    drivers = list(drivers)
+    min_periods = window if min_periods is None else min_periods
+    selected, years, grid = _dense_grid(as_panel(data), [target] + drivers, countries)
+    grid = _apply_nan_policy(grid, nan_policy)
+
+    # Yillar ardisik degilse aradaki yillar NaN ile doldurulur: pencere takvim yilidir
+    if len(years):
+        full_years = np.arange(years[0], years[-1] + 1)
+        full = np.full((grid.shape[0], len(full_years), grid.shape[2]), np.nan)
+        full[:, years - years[0]] = grid
+        grid, years = full, full_years
+    if len(years) < window:
+        return pd.DataFrame({"country": [], "year": [], "driver": [], "corr": [], "n": []})
+
+    # (G, W, C, window): W = len(years) - window + 1 pencere
+    windows = sliding_window_view(grid, window, axis=1)
+    x = np.broadcast_to(windows[:, :, :1], windows[:, :, 1:].shape)
+    y = windows[:, :, 1:]
+    corr, n = _window_corr(x, y, method, min_periods)  # (G, W, D)
+
+    g, w, d = np.indices(corr.shape).reshape(3, -1)
+    table = pd.DataFrame(
+        {
+            "country": np.array(selected, dtype=object)[g],
+            "year": years[window - 1 :][w],
+            "driver": np.array(drivers, dtype=object)[d],
+            "corr": corr.ravel(),
+            "n": n.ravel(),
+        }
+    )
+    return table[table["n"] > 0].reset_index(drop=True)
+
+
+def apply_rules(table: pd.DataFrame, rules) -> pd.DataFrame:
+    """
+    (surucu, esik, oneri) kurallarini korelasyon tablosuna uygular: corr > esik olan her
+    (satir, kural) eslesmesi bir oneri satiridir.
+
+    Donus: table'in sutunlari + threshold, recommendation; satirlar tablo sirasinda, ayni
+    satir icin kurallar verilen sirada.
+    """
+    rule_table = pd.DataFrame(list(rules), columns=["driver", "threshold", "recommendation"])
+    rule_table["rule"] = np.arange(len(rule_table))
+    merged = table.reset_index(drop=True).reset_index(names="_row").merge(rule_table, on="driver")
+    hits = merged[merged["corr"] > merged["threshold"]]
+    return hits.sort_values(["_row", "rule"]).drop(columns=["_row", "rule"]).reset_index(drop=True)
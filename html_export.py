@@ -0,0 +1,216 @@
+"""
+Plotly figurleri icin kompakt HTML ciktisi.
+
+write_html varsayilan olarak her dosyaya tum plotly.js paketini (~4.5 MB) gomer ve sayisal
+dizileri tam hassasiyetle (base64 float64) yazar. Kompakt mod:
+- plotly.js'i cikti dizinine bir kez (paylasilan yerel dosya olarak) yazar; HTML'ler onu
+  <script src=...> ile referans verir (cevrimdisi calisir),
+- sayisal dizileri istenen ondalik hassasiyete yuvarlar,
+- her dosyanin gzip ile onceden sikistirilmis kopyasini (.gz) da yazar (ornegin nginx
+  gzip_static ile dogrudan sunulabilir).
+
+write_streaming_html ayni ciktiyi, animasyon karelerini tek tek ureten bir iterator'dan yazar:
+kareler bellekte birikmez (yil sayisindan bagimsiz sabit bellek).
+
+Kullanim:
+    write_compact_html(fig, "img/3d_globe_animated.html", precision=2)
+    write_streaming_html("img/globe.html", frames_iter, lambda: (data, layout))
+"""
+
+import base64
+import gzip
+import hashlib
+import os
+
+import numpy as np
+
+from instrumentation import instrumented
+
+PLOTLYJS_FILENAME = "plotly.min.js"
+DEFAULT_PRECISION = 2
+GZIP_LEVEL = 9
+
+
+def _decode_typed_array(obj: dict) -> np.ndarray:
+    """plotly'nin {"dtype", "bdata", "shape"} (base64) dizi kodlamasini cozer."""
+    values = np.frombuffer(base64.b64decode(obj["bdata"]), dtype=np.dtype(obj["dtype"]))
+    if "shape" in obj:
+        values = values.reshape([int(n) for n in str(obj["shape"]).split(",")])
+    return values
+
+
+def _round_array(values: np.ndarray, precision: int):
+    if values.dtype.kind == "f":
+        values = np.round(values, precision)
+        if precision <= 0:
+            return values.astype(np.int64).tolist()
+    return values.tolist()
+
+
+def round_floats(obj, precision: int):
+    """
+    Figur sozlugundeki tum ondalikli degerleri (listeler, NumPy / base64 diziler dahil)
+    precision basamaga yuvarlar; diziler duz JSON listelerine cevrilir.
+    """
+    if isinstance(obj, dict):
+        if "bdata" in obj and "dtype" in obj:
+            return _round_array(_decode_typed_array(obj), precision)
+        return {key: round_floats(value, precision) for key, value in obj.items()}
+    if isinstance(obj, np.ndarray):
+        return _round_array(obj, precision) if obj.dtype != object else [round_floats(v, precision) for v in obj.tolist()]
+    if isinstance(obj, (list, tuple)):
+        return [round_floats(value, precision) for value in obj]
+    if isinstance(obj, (float, np.floating)):
+        value = round(float(obj), precision)
+        return int(value) if precision <= 0 else value
+    if isinstance(obj, np.integer):
+        return int(obj)
+    return obj
+
+
+def _remove_quietly(*paths: str) -> None:
+    """Yarim kalmis gecici dosyalari siler (yoksa sessizce gecer)."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _write_with_gzip(path: str, data: bytes, gzip_level: int = GZIP_LEVEL) -> int:
+    """Dosyayi ve .gz kopyasini (deterministik: mtime=0) yazar; .gz boyutunu dondurur."""
+    compressed = gzip.compress(data, compresslevel=gzip_level, mtime=0)
+    for target, payload in ((path, data), (f"{path}.gz", compressed)):
+        tmp_path = f"{target}.tmp-{os.getpid()}"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+        except BaseException:
+            _remove_quietly(tmp_path)
+            raise
+        os.replace(tmp_path, target)
+    return len(compressed)
+
+
+def ensure_plotlyjs(directory: str, filename: str = PLOTLYJS_FILENAME, gzip_level: int = GZIP_LEVEL) -> str:
+    """
+    Paylasilan plotly.js dosyasini (ve .gz kopyasini) dizine yazar; ayni surum zaten varsa
+    dokunmaz. Dosya yolunu dondurur.
+    """
+    from plotly.offline import get_plotlyjs
+
+    path = os.path.join(directory, filename)
+    bundle = get_plotlyjs().encode("utf-8")
+    if os.path.exists(path) and os.path.exists(f"{path}.gz"):
+        with open(path, "rb") as f:
+            if hashlib.sha256(f.read()).digest() == hashlib.sha256(bundle).digest():
+                return path
+    os.makedirs(directory or ".", exist_ok=True)
+    _write_with_gzip(path, bundle, gzip_level)
+    return path
+
+
+def write_compact_html(
+    fig,
+    path: str,
+    precision: int | None = DEFAULT_PRECISION,
+    gzip_level: int = GZIP_LEVEL,
+    plotlyjs: str = PLOTLYJS_FILENAME,
+) -> dict:
+    """
+    Figuru kompakt HTML olarak yazar (bkz. modul aciklamasi).
+
+    precision : ondalik basamak sayisi (None -> yuvarlama yok, plotly'nin base64 dizileri korunur)
+    plotlyjs  : HTML ile ayni dizindeki paylasilan plotly.js dosya adi
+
+    Donus: {"html": bayt, "gzip": bayt}
+    """
+    import plotly.io as pio
+
+    fig_dict = fig.to_plotly_json()
+    if precision is not None:
+        fig_dict = round_floats(fig_dict, precision)
+
+    ensure_plotlyjs(os.path.dirname(path), plotlyjs, gzip_level)
+    html = pio.to_html(fig_dict, include_plotlyjs=plotlyjs, full_html=True, validate=False).encode("utf-8")
+    gzip_size = _write_with_gzip(path, html, gzip_level)
+    return {"html": len(html), "gzip": gzip_size}
+
+
+_STREAMING_HEAD = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8" /></head>
+<body>
+<div id="{div_id}" class="plotly-graph-div" style="height:100vh; width:100%;"></div>
+<script charset="utf-8" src="{plotlyjs}"></script>
+<script type="text/javascript">
+var frames = [];
+"""
+
+_STREAMING_TAIL = """Plotly.newPlot("{div_id}", {data}, {layout}, {config}).then(function () {{
+    return Plotly.addFrames("{div_id}", frames);
+}});
+</script>
+</body>
+</html>
+"""
+
+
+@instrumented("write_html")
+def write_streaming_html(
+    path: str,
+    frames,
+    build_figure,
+    config: dict | None = None,
+    div_id: str = "figure",
+    plotlyjs: str = PLOTLYJS_FILENAME,
+    gzip_level: int = GZIP_LEVEL,
+) -> dict:
+    """
+    Animasyonlu figuru kareleri bellekte biriktirmeden HTML'e yazar.
+
+    frames       : kare sozluklerini ({"name": ..., "data": [...]}) ureten iterator; her kare
+                   JSON'a cevrilip dosyaya (ve .gz kopyasina) yazildiktan sonra birakilir
+    build_figure : kareler bittikten sonra cagrilir, (data, layout) dondurur; boylece renk
+                   araligi / slider adimlari gibi degerler kareler akarken toplanabilir
+
+    Donus: {"html": bayt, "gzip": bayt, "frames": kare sayisi}
+    """
+    import plotly.io as pio
+
+    directory = os.path.dirname(path)
+    ensure_plotlyjs(directory, plotlyjs, gzip_level)
+
+    tmp_path, tmp_gz_path = f"{path}.tmp-{os.getpid()}", f"{path}.gz.tmp-{os.getpid()}"
+    n_frames, n_bytes = 0, 0
+    try:
+        with open(tmp_path, "wb") as raw, open(tmp_gz_path, "wb") as gz_raw:
+            with gzip.GzipFile(fileobj=gz_raw, mode="wb", compresslevel=gzip_level, mtime=0) as gz:
+
+                def write(text: str) -> None:
+                    nonlocal n_bytes
+                    data = text.encode("utf-8")
+                    raw.write(data)
+                    gz.write(data)
+                    n_bytes += len(data)
+
+                write(_STREAMING_HEAD.format(div_id=div_id, plotlyjs=plotlyjs))
+                for frame in frames:
+                    write(f"frames.push({pio.json.to_json_plotly(frame)});\n")
+                    n_frames += 1
+
+                data, layout = build_figure()
+                write(
+                    _STREAMING_TAIL.format(
+                        div_id=div_id,
+                        data=pio.json.to_json_plotly(data),
+                        layout=pio.json.to_json_plotly(layout),
+                        config=pio.json.to_json_plotly(config or {"responsive": True}),
+                    )
+                )
+    except BaseException:  # kare ureteci veya build_figure hata verirse yarim dosya kalmaz
+        _remove_quietly(tmp_path, tmp_gz_path)
+        raise
+    os.replace(tmp_path, path)
+    os.replace(tmp_gz_path, f"{path}.gz")
+    return {"html": n_bytes, "gzip": os.path.getsize(f"{path}.gz"), "frames": n_frames}
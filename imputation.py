@@ -0,0 +1,160 @@
+"""
+Ulke bazli (grup bazli) vektorel imputasyon motoru.
+
+groupby("country").apply(fill_group) her ulke icin bir Python callback'i calistirip
+DataFrame kopyalar. Bu modul veriyi bir kez (country, year) sirasina dizer ve tum
+sutun blogu uzerinde, grup sinirlarini asmadan, dizi islemleriyle doldurma yapar.
+
+Modlar:
+- "both" : interpolate(method="linear", limit_direction="both") ile bit-bit ayni
+- "train": interpolate(both) + ffill/bfill (time-safe train tarafi)
+- "test" : sadece ffill; kalan (bastaki) NaN -> seed (ornegin train son degeri)
+"""
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import instrumented
+
+MODES = ("both", "train", "test")
+
+
+def _group_edges(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sirali grup anahtarlari icin her satirin grubunun ilk ve son satir indeksini dondurur.
+    """
+    n = len(keys)
+    is_start = np.ones(n, dtype=bool)
+    is_start[1:] = keys[1:] != keys[:-1]
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], n) - 1
+    group_id = np.cumsum(is_start) - 1
+    return starts[group_id], ends[group_id]
+
+
+def _fill_block(values: np.ndarray, row_start: np.ndarray, row_end: np.ndarray, mode: str) -> np.ndarray:
+    """
+    (n_rows, n_cols) float64 blogunu grup sinirlari icinde doldurur.
+
+    Dogrusal interpolasyon np.interp ile ayni formulu kullanir:
+    slope * (x - x_a) + y_a (NaN cikarsa diger uctan tekrar hesaplanir).
+    """
+    n = values.shape[0]
+    out = values.copy()
+    invalid = np.isnan(values)
+    if not invalid.any():
+        return out
+
+    rows = np.arange(n)[:, None]
+
+    prev = np.where(invalid, -1, rows)
+    np.maximum.accumulate(prev, axis=0, out=prev)
+    has_prev = prev >= row_start[:, None]
+
+    if mode == "test":
+        i, j = np.nonzero(invalid & has_prev)
+        out[i, j] = values[prev[i, j], j]
+        return out
+
+    nxt = np.where(invalid, n, rows)
+    nxt = np.minimum.accumulate(nxt[::-1], axis=0)[::-1]
+    has_next = nxt <= row_end[:, None]
+
+    # Ic bosluklar: dogrusal interpolasyon
+    i, j = np.nonzero(invalid & has_prev & has_next)
+    a, b = prev[i, j], nxt[i, j]
+    ya, yb = values[a, j], values[b, j]
+    slope = (yb - ya) / (b - a)
+    res = slope * (i - a) + ya
+    retry = np.isnan(res)
+    if retry.any():
+        res[retry] = slope[retry] * (i[retry] - b[retry]) + yb[retry]
+        same = np.isnan(res) & (ya == yb)
+        res[same] = ya[same]
+    out[i, j] = res
+
+    # Kenarlar: sabit (ilk/son gecerli deger)
+    i, j = np.nonzero(invalid & has_prev & ~has_next)
+    out[i, j] = values[prev[i, j], j]
+    i, j = np.nonzero(invalid & ~has_prev & has_next)
+    out[i, j] = values[nxt[i, j], j]
+
+    return out
+
+
+def impute_block(
+    values: np.ndarray, group_codes: np.ndarray, mode: str = "both", seed: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    (group, time) sirasindaki satirlarin (n_rows, n_cols) float64 blogunu grup icinde doldurur.
+
+    group_codes : satir basina grup kodu (ayni grubun satirlari ardisik)
+    seed        : "test" modunda kalan NaN'lar icin (n_rows, n_cols) degerler (NaN = seed yok)
+    """
+    if mode not in MODES:
+        raise ValueError(f"Bilinmeyen mod: {mode} (beklenen: {MODES})")
+    row_start, row_end = _group_edges(group_codes)
+    filled = _fill_block(values, row_start, row_end, mode)
+    if mode == "test" and seed is not None:
+        missing = np.isnan(filled)
+        filled[missing] = seed[missing]
+    return filled
+
+
+@instrumented("last_valid_by_group", rows=lambda data, *args, **kwargs: len(data))
+def last_valid_by_group(data: pd.DataFrame, cols: list[str], group_col: str = "country") -> pd.DataFrame:
+    """
+    Her grup icin her sutunun son gecerli degeri (groupby(group_col)[cols].last() ile ayni).
+    data bir CompactPanel ise CompactPanel.last_valid kullanilir.
+    """
+    from compact_panel import CompactPanel
+
+    if isinstance(data, CompactPanel):
+        return data.last_valid(cols)
+    return data.groupby(group_col, observed=True)[cols].last()
+
+
+@instrumented("impute_by_group", rows=lambda data, *args, **kwargs: len(data))
+def impute_by_group(
+    data: pd.DataFrame,
+    cols: list[str],
+    mode: str = "both",
+    group_col: str = "country",
+    time_col: str = "year",
+    seed: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """
+    Veriyi (group_col, time_col) sirasina dizer ve cols sutunlarini grup icinde doldurur.
+
+    mode : "both" | "train" | "test" (bkz. modul aciklamasi)
+    seed : "test" modunda, ffill sonrasi kalan NaN'lar icin grup indeksli degerler
+           (genellikle last_valid_by_group(train, cols)).
+
+    Donus: (group_col, time_col) sirasinda yeni DataFrame; orijinal indeks korunur.
+    group_col degeri NaN olan satirlar, groupby davranisiyla uyumlu olarak atilir.
+    data bir CompactPanel ise doldurma izgara uzerinde yapilir ve CompactPanel doner.
+    """
+    from compact_panel import CompactPanel
+
+    if mode not in MODES:
+        raise ValueError(f"Bilinmeyen mod: {mode} (beklenen: {MODES})")
+    if isinstance(data, CompactPanel):
+        return data.impute(cols, mode, seed)
+
+    out = data.sort_values([group_col, time_col])
+    out = out[out[group_col].notna()].copy()
+    if out.empty or not cols:
+        return out
+
+    codes, _ = pd.factorize(out[group_col])
+    block = out[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    seed_block = None
+    if mode == "test" and seed is not None:
+        seed_block = seed.reindex(index=out[group_col], columns=cols).to_numpy(dtype=np.float64, na_value=np.nan)
+    filled = impute_block(block, codes, mode, seed_block)
+
+    for k, col in enumerate(cols):
+        if np.isnan(block[:, k]).any():
+            out[col] = filled[:, k].astype(out[col].dtype, copy=False)
+
+    return out
@@ -0,0 +1,254 @@
+"""
+Artimli (incremental) veri alimi: yeni bir OWID surumunu, gecmisi bastan hesaplamadan isler.
+
+Her OWID surumu cogunlukla bir yil ekler ve birkac yakin degeri revize eder. Bu modul:
+1) yeni ham veriyi saklanan snapshot ile satir duzeyinde karsilastirir (eklenen / silinen /
+   degisen (country, year) satirlari),
+2) sadece etkilenen (ulke, sutun, yil-penceresi) araliklarinin imputasyonunu yeniden yapar,
+3) yillik global ortalamalari (toplam / sayi uzerinden) artimli olarak gunceller,
+4) hangi ciktilarin (figurler ve metrik dosyalari) gecersiz oldugunu raporlar.
+
+Pencere mantigi (interpolate(linear, both) icin):
+Bir hucrenin doldurulmus degeri sadece sutundaki onceki ve sonraki gecerli degere baglidir.
+Degisen yillari kapsayan pencere [degisimden onceki son gecerli yil, degisimden sonraki ilk
+gecerli yil] (yoksa seri basi / sonu) yeniden doldurulursa sonuc, tum verinin bastan
+doldurulmasiyla bit-bit aynidir.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from imputation import impute_by_group
+
+KEY = ["country", "year"]
+
+
+def _sorted(data: pd.DataFrame) -> pd.DataFrame:
+    data = data[data["country"].notna()]
+    return data.sort_values(KEY).reset_index(drop=True)
+
+
+def _year_sums(imputed: pd.DataFrame, cols: list[str]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    grouped = imputed.groupby("year")[cols]
+    return grouped.sum(min_count=1).fillna(0.0), grouped.count()
+
+
+def build_snapshot(raw: pd.DataFrame, cols: list[str], extra_cols: list[str] | None = None) -> dict:
+    """
+    Tam (artimli olmayan) hesaplama: ham veri, doldurulmus panel ve yillik toplamlar.
+
+    cols       : ulke icinde interpolate(both) ile doldurulan sutunlar
+    extra_cols : doldurulmadan tasinan sutunlar (degisiklikleri yine izlenir)
+    """
+    extra_cols = [c for c in (extra_cols or []) if c in raw.columns and c not in cols]
+    raw = _sorted(raw[KEY + cols + extra_cols])
+    imputed = impute_by_group(raw, cols, mode="both").reset_index(drop=True)
+    year_sums, year_counts = _year_sums(imputed, cols)
+    return {
+        "cols": cols,
+        "extra_cols": extra_cols,
+        "raw": raw,
+        "imputed": imputed,
+        "year_sums": year_sums,
+        "year_counts": year_counts,
+    }
+
+
+def save_snapshot(snapshot: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> dict | None:
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def global_avg(snapshot: dict) -> pd.DataFrame:
+    """Yillik global ortalama (groupby("year")[cols].mean() karsiligi), toplam / sayi ile."""
+    means = snapshot["year_sums"] / snapshot["year_counts"].where(snapshot["year_counts"] > 0)
+    return means.reset_index()
+
+
+def diff_raw(old_raw: pd.DataFrame, new_raw: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """
+    Iki ham surumu (country, year) anahtarinda karsilastirir.
+
+    Donus: country, year, column, change ("added" | "removed" | "modified") satirlari.
+    Eklenen/silinen satirlarda (deger NaN olsa bile) her sutun listelenir.
+    """
+    merged = old_raw[KEY + cols].merge(new_raw[KEY + cols], on=KEY, how="outer", suffixes=("_old", "_new"), indicator=True)
+
+    row_changed = (merged["_merge"] != "both").to_numpy()
+    parts = []
+    for col in cols:
+        old = merged[f"{col}_old"].to_numpy(dtype=np.float64, na_value=np.nan)
+        new = merged[f"{col}_new"].to_numpy(dtype=np.float64, na_value=np.nan)
+        both_nan = np.isnan(old) & np.isnan(new)
+        differs = (~both_nan & ~(old == new)) | row_changed
+        if not differs.any():
+            continue
+        part = merged.loc[differs, KEY + ["_merge"]].copy()
+        part["column"] = col
+        parts.append(part)
+
+    if not parts:
+        return pd.DataFrame(columns=KEY + ["column", "change"])
+
+    changes = pd.concat(parts, ignore_index=True)
+    changes["change"] = changes.pop("_merge").map({"left_only": "removed", "right_only": "added", "both": "modified"})
+    return changes.sort_values(KEY + ["column"]).reset_index(drop=True)
+
+
+_YEAR_SPAN = 1 << 16
+
+
+def _valid_keys(raw: pd.DataFrame, col: str, countries: pd.Index) -> np.ndarray:
+    """Sutunun gecerli oldugu (ulke, yil) ciftleri, sirali ulke_kodu * 2**16 + yil anahtarlari olarak."""
+    valid = raw.loc[raw[col].notna(), KEY]
+    keys = countries.get_indexer(valid["country"]).astype(np.int64) * _YEAR_SPAN + valid["year"].to_numpy(np.int64)
+    return np.sort(keys)
+
+
+def affected_spans(old_raw: pd.DataFrame, new_raw: pd.DataFrame, changes: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """
+    Her (ulke, sutun) icin yeniden doldurulmasi gereken yil penceresi.
+
+    Pencere, degisen yillarin hem eski hem yeni surumdeki gecerli komsularina kadar uzanir;
+    komsu yoksa ulkenin (yeni surumdeki) ilk / son yilina kadar. Komsular, sirali
+    (ulke, yil) anahtarlari uzerinde searchsorted ile vektorel olarak bulunur.
+    """
+    bounds = new_raw.groupby("country")["year"].agg(["min", "max"])
+    countries = pd.Index(pd.unique(pd.concat([old_raw["country"], new_raw["country"]])))
+
+    parts = []
+    for col in cols:
+        col_changes = changes[changes["column"] == col]
+        col_changes = col_changes[col_changes["country"].isin(bounds.index)]  # tamamen silinen ulkeler haric
+        if col_changes.empty:
+            continue
+        span = col_changes.groupby("country")["year"].agg(["min", "max"])
+        code = countries.get_indexer(span.index).astype(np.int64)
+        first = code * _YEAR_SPAN + span["min"].to_numpy(np.int64)
+        last = code * _YEAR_SPAN + span["max"].to_numpy(np.int64)
+        start = bounds.loc[span.index, "min"].to_numpy(np.int64)
+        end = bounds.loc[span.index, "max"].to_numpy(np.int64)
+
+        lo, hi = end.copy(), start.copy()
+        for raw in (old_raw, new_raw):
+            keys = _valid_keys(raw, col, countries)
+            if len(keys) == 0:
+                lo, hi = start, end
+                continue
+            i = np.searchsorted(keys, first, side="left") - 1
+            prev_key = keys[np.clip(i, 0, None)]
+            has_prev = (i >= 0) & (prev_key // _YEAR_SPAN == code)
+            lo = np.minimum(lo, np.where(has_prev, prev_key % _YEAR_SPAN, start))
+
+            j = np.searchsorted(keys, last, side="right")
+            next_key = keys[np.clip(j, None, len(keys) - 1)]
+            has_next = (j < len(keys)) & (next_key // _YEAR_SPAN == code)
+            hi = np.maximum(hi, np.where(has_next, next_key % _YEAR_SPAN, end))
+
+        parts.append(pd.DataFrame({"country": span.index, "column": col, "start": lo, "end": hi}))
+
+    if not parts:
+        return pd.DataFrame(columns=["country", "column", "start", "end"])
+    return pd.concat(parts, ignore_index=True)
+
+
+def incremental_update(snapshot: dict, new_raw: pd.DataFrame) -> tuple[dict, dict]:
+    """
+    Snapshot'i yeni ham veriye gore artimli olarak gunceller.
+
+    Donus: (yeni snapshot, rapor). Rapor: changes (ham farklar), spans (yeniden doldurulan
+    pencereler), changed_cells (doldurulmus panelde degisen hucreler), years (global ortalamasi
+    degisen yillar).
+    """
+    cols, extra_cols = snapshot["cols"], snapshot["extra_cols"]
+    old_raw, old_imp = snapshot["raw"], snapshot["imputed"]
+    new_raw = _sorted(new_raw[KEY + cols + [c for c in extra_cols if c in new_raw.columns]])
+
+    changes = diff_raw(old_raw, new_raw, cols + extra_cols)
+    spans = affected_spans(old_raw, new_raw, changes[changes["column"].isin(cols)], cols)
+
+    # 1) Satir iskeleti: yeni ham verinin anahtarlari; degismeyen hucreler eski panelden gelir
+    imputed = new_raw[KEY].merge(old_imp, on=KEY, how="left")
+    imputed[extra_cols] = new_raw[extra_cols].to_numpy()
+
+    # 2) Etkilenen pencereleri uzun formatta (ulke x sutun serisi) tek seferde yeniden doldur
+    if not spans.empty:
+        long_parts = []
+        for col, col_spans in spans.groupby("column", sort=False):
+            part = new_raw[KEY + [col]].merge(col_spans[["country", "start", "end"]], on="country")
+            part = part[(part["year"] >= part["start"]) & (part["year"] <= part["end"])]
+            long_parts.append(
+                pd.DataFrame({"series": part["country"].astype(str) + "\x1f" + col, "country": part["country"],
+                              "year": part["year"], "column": col, "value": part[col].to_numpy(dtype=np.float64)})
+            )
+        long = pd.concat(long_parts, ignore_index=True)
+        long = impute_by_group(long, ["value"], mode="both", group_col="series").reset_index(drop=True)
+
+        pos = pd.MultiIndex.from_frame(imputed[KEY]).get_indexer(pd.MultiIndex.from_frame(long[KEY]))
+        for col, part in long.groupby("column", sort=False):
+            values = imputed[col].to_numpy(dtype=np.float64, copy=True)
+            values[pos[part.index]] = part["value"].to_numpy()
+            imputed[col] = values
+
+    for col in cols:
+        imputed[col] = imputed[col].astype(old_imp[col].dtype, copy=False)
+
+    # 3) Doldurulmus panelde degisen hucreler (eklenen / silinen satirlar dahil)
+    changed_cells = diff_raw(old_imp, imputed, cols + extra_cols)
+
+    # 4) Global ortalama: degisen yillarin toplam / sayi degerleri guncellenir
+    year_sums, year_counts = snapshot["year_sums"].copy(), snapshot["year_counts"].copy()
+    years = sorted(set(changed_cells["year"].astype(int)))
+    if years:
+        touched = imputed[imputed["year"].isin(years)]
+        sums, counts = _year_sums(touched, cols)
+        year_sums = sums.combine_first(year_sums).loc[lambda d: d.index.isin(imputed["year"].unique())]
+        year_counts = counts.combine_first(year_counts).loc[lambda d: d.index.isin(imputed["year"].unique())]
+        year_counts = year_counts.astype(np.int64)
+
+    new_snapshot = {
+        "cols": cols,
+        "extra_cols": extra_cols,
+        "raw": new_raw,
+        "imputed": imputed,
+        "year_sums": year_sums.sort_index(),
+        "year_counts": year_counts.sort_index(),
+    }
+    report = {"changes": changes, "spans": spans, "changed_cells": changed_cells, "years": years}
+    return new_snapshot, report
+
+
+def invalidated_outputs(changed_cells: pd.DataFrame, output_inputs: dict) -> list[str]:
+    """
+    Degisen hucrelere gore gecersiz olan ciktilari dondurur.
+
+    output_inputs: {cikti: {"countries": [...] | None (tumu), "columns": [...], "years": (bas, son) | None}}
+                   (bas / son None olabilir: acik uclu aralik)
+    """
+    invalid = []
+    for output, spec in output_inputs.items():
+        cells = changed_cells[changed_cells["column"].isin(spec["columns"])]
+        if spec.get("countries") is not None:
+            cells = cells[cells["country"].isin(spec["countries"])]
+        if spec.get("years") is not None:
+            start, end = spec["years"]
+            if start is not None:
+                cells = cells[cells["year"] >= start]
+            if end is not None:
+                cells = cells[cells["year"] <= end]
+        if not cells.empty:
+            invalid.append(output)
+    return invalid
@@ -0,0 +1,326 @@
+"""
+Istege bagli (opt-in) zamanlama / profil katmani: rapor hattinin asamalari icin span'ler.
+
+    with span("load") as s:
+        data = ...
+        s.set(rows=len(data))
+
+    @instrumented("impute_by_group", rows=lambda data, *args, **kwargs: len(data))
+    def impute_by_group(data, ...): ...
+
+Her span duvar saati ve CPU suresini, islenen satir sayisini, RSS farkini ve (etkinse)
+tracemalloc tepe bellegini kaydeder; ic ice span'ler derinlik / ebeveyn bilgisi tasir.
+Sonuclar Chrome trace JSON'u (chrome://tracing, Perfetto) veya duz CSV olarak yazilir.
+
+- Kapaliyken (varsayilan) span() tek bir bayrak kontrolunden sonra paylasilan bos bir nesne
+  dondurur; instrumented fonksiyonlar dogrudan cagrilir.
+- kind="stage" span'leri (rapor gorevleri) icin istege bagli cProfile (.prof) ve tracemalloc
+  (en cok bellek ayiran satirlar, .txt) dokumu alinir.
+- Fork edilen worker'lar kendi span'lerini worker_spans() ile ana process'e gonderir;
+  ana process extend() ile birlestirir.
+"""
+
+import contextlib
+import csv
+import functools
+import json
+import os
+import threading
+import time
+
+# Etkin durum: enable() ile doldurulur
+_STATE = {"enabled": False, "pid": None, "profile_dir": None, "trace_memory": False}
+_SPANS: list = []
+_LOCAL = threading.local()
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+TRACEMALLOC_TOP = 25
+
+
+def _rss_bytes() -> int | None:
+    """Anlik RSS (Linux: /proc/self/statm); okunamazsa None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def enable(profile_dir: str | None = None, trace_memory: bool = False) -> None:
+    """
+    Kaydi baslatir (onceki span'ler silinir).
+
+    profile_dir  : verilirse her "stage" span'i icin cProfile cikisi (<ad>.prof) buraya yazilir
+    trace_memory : tracemalloc ile span basina Python tepe bellegi; stage'ler icin en cok
+                   bellek ayiran satirlar (profile_dir verildiyse <ad>.tracemalloc.txt)
+    """
+    _SPANS.clear()
+    _STATE.update(enabled=True, pid=os.getpid(), profile_dir=profile_dir, trace_memory=trace_memory)
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+    if trace_memory:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+def disable() -> None:
+    _STATE["enabled"] = False
+    if _STATE["trace_memory"]:
+        import tracemalloc
+
+        tracemalloc.stop()
+        _STATE["trace_memory"] = False
+
+
+def is_enabled() -> bool:
+    return _STATE["enabled"]
+
+
+def spans() -> list[dict]:
+    """Kaydedilen span'ler (baslangic zamanina gore sirali)."""
+    return sorted(_SPANS, key=lambda s: s["start_ns"])
+
+
+def worker_spans() -> list[dict]:
+    """
+    Fork edilmis bir worker'da: bu process'in kaydettigi span'leri dondurur ve tamponu
+    bosaltir. Kaydi baslatan process'te (seri calisma) bos liste doner; span'ler zaten oradadir.
+    """
+    if not _STATE["enabled"] or os.getpid() == _STATE["pid"]:
+        return []
+    own = [s for s in _SPANS if s["pid"] == os.getpid()]
+    _SPANS.clear()
+    return own
+
+
+def extend(records: list[dict]) -> None:
+    """Worker'lardan gelen span'leri ekler."""
+    if _STATE["enabled"] and records:
+        _SPANS.extend(records)
+
+
+class _NullSpan:
+    """Kapali moddaki span: hicbir sey kaydetmez."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "kind", "attrs", "_t0", "_cpu0", "_rss0", "_traced0", "_start_ns", "_profiler", "_parent", "_depth")
+
+    def __init__(self, name: str, kind: str, attrs: dict):
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs
+
+    def set(self, **attrs) -> None:
+        """Span'e ozellik ekler (ornegin rows=len(data)); sonuc bilindiginde cagrilir."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = getattr(_LOCAL, "stack", None)
+        if stack is None:
+            stack = _LOCAL.stack = []
+        self._parent = stack[-1].name if stack else None
+        self._depth = len(stack)
+        stack.append(self)
+
+        self._profiler = None
+        if self.kind == "stage" and _STATE["profile_dir"] and not getattr(_LOCAL, "profiling", False):
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            _LOCAL.profiling = True
+        if _STATE["trace_memory"]:
+            import tracemalloc
+
+            tracemalloc.reset_peak()
+            self._traced0 = tracemalloc.get_traced_memory()[0]
+
+        self._rss0 = _rss_bytes()
+        self._start_ns = time.time_ns()
+        self._cpu0 = time.process_time()
+        self._t0 = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profiler is not None:
+            self._profiler.disable()
+        wall = time.perf_counter() - self._t0
+        cpu = time.process_time() - self._cpu0
+        rss1 = _rss_bytes()
+        _LOCAL.stack.pop()
+
+        record = {
+            "name": self.name,
+            "kind": self.kind,
+            "parent": self._parent,
+            "depth": self._depth,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "start_ns": self._start_ns,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "rss_delta_mb": (rss1 - self._rss0) / 2**20 if rss1 is not None and self._rss0 is not None else None,
+            "rss_mb": rss1 / 2**20 if rss1 is not None else None,
+            "error": exc_type.__name__ if exc_type is not None else None,
+        }
+        if _STATE["trace_memory"]:
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            record["py_peak_mb"] = (peak - self._traced0) / 2**20
+            if self.kind == "stage" and _STATE["profile_dir"]:
+                _dump_tracemalloc(self.name, tracemalloc.take_snapshot())
+        if self._profiler is not None:
+            _LOCAL.profiling = False
+            self._profiler.dump_stats(os.path.join(_STATE["profile_dir"], f"{_safe_name(self.name)}.prof"))
+        record.update(self.attrs)
+        _SPANS.append(record)
+        return False
+
+
+def _safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+
+def _dump_tracemalloc(name: str, snapshot) -> None:
+    stats = snapshot.statistics("lineno")[:TRACEMALLOC_TOP]
+    with open(os.path.join(_STATE["profile_dir"], f"{_safe_name(name)}.tracemalloc.txt"), "w") as f:
+        for stat in stats:
+            f.write(f"{stat}\n")
+
+
+def span(name: str, kind: str = "span", **attrs):
+    """
+    Zamanlama span'i (context manager). Kapali modda paylasilan bos nesne dondurur.
+    kind="stage": profil / tracemalloc dokumu alinacak ust duzey asama.
+    """
+    if not _STATE["enabled"]:
+        return _NULL_SPAN
+    return _Span(name, kind, attrs)
+
+
+def instrumented(name: str | None = None, rows=None, kind: str = "span"):
+    """
+    Fonksiyonu span ile saran dekorator. rows: cagri argumanlarindan satir sayisini
+    hesaplayan fonksiyon (ornegin lambda data, *a, **k: len(data)).
+    """
+
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _STATE["enabled"]:
+                return fn(*args, **kwargs)
+            with _Span(label, kind, {"rows": rows(*args, **kwargs)} if rows is not None else {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+# --- disa aktarim -------------------------------------------------------------------------
+
+_CSV_FIELDS = ["name", "kind", "parent", "depth", "pid", "tid", "start_ns", "wall_s", "cpu_s", "rows", "rss_delta_mb", "rss_mb", "py_peak_mb", "error"]
+
+
+def export_chrome_trace(path: str, records: list[dict] | None = None) -> None:
+    """Chrome trace (Trace Event Format, "X" olaylari) JSON'u: chrome://tracing veya Perfetto."""
+    records = spans() if records is None else records
+    t0 = min((r["start_ns"] for r in records), default=0)
+    events = []
+    for r in records:
+        args = {k: v for k, v in r.items() if k not in ("name", "kind", "pid", "tid", "start_ns", "wall_s") and v is not None}
+        events.append(
+            {
+                "name": r["name"],
+                "cat": r["kind"],
+                "ph": "X",
+                "ts": (r["start_ns"] - t0) / 1000,
+                "dur": r["wall_s"] * 1e6,
+                "pid": r["pid"],
+                "tid": r["tid"],
+                "args": args,
+            }
+        )
+    _write_atomic(path, json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str))
+
+
+def export_csv(path: str, records: list[dict] | None = None) -> None:
+    """Duz CSV: span basina bir satir; ek ozellikler (attrs) sondaki sutunlardadir."""
+    records = spans() if records is None else records
+    extra = sorted({k for r in records for k in r} - set(_CSV_FIELDS))
+    buffer = _StringWriter()
+    writer = csv.DictWriter(buffer, fieldnames=_CSV_FIELDS + extra, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(records)
+    _write_atomic(path, buffer.getvalue())
+
+
+def export(path: str) -> None:
+    """Uzantiya gore disa aktarir: .csv -> duz CSV, diger -> Chrome trace JSON."""
+    if path.lower().endswith(".csv"):
+        export_csv(path)
+    else:
+        export_chrome_trace(path)
+
+
+def summary(records: list[dict] | None = None):
+    """Span adina gore ozet (DataFrame): adet, toplam / maksimum duvar saati, CPU, satir."""
+    import pandas as pd
+
+    frame = pd.DataFrame(spans() if records is None else records)
+    if frame.empty:
+        return frame
+    if "rows" not in frame.columns:
+        frame["rows"] = None
+    grouped = frame.groupby("name")
+    table = grouped.agg(count=("wall_s", "size"), wall_s=("wall_s", "sum"), max_wall_s=("wall_s", "max"), cpu_s=("cpu_s", "sum"), rows=("rows", "sum"))
+    return table.sort_values("wall_s", ascending=False)
+
+
+class _StringWriter(list):
+    def write(self, text: str) -> None:
+        self.append(text)
+
+    def getvalue(self) -> str:
+        return "".join(self)
+
+
+def _write_atomic(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", newline="") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+@contextlib.contextmanager
+def recording(path: str | None = None, profile_dir: str | None = None, trace_memory: bool = False):
+    """enable() ... disable() blogu; path verilirse cikista disa aktarir."""
+    enable(profile_dir=profile_dir, trace_memory=trace_memory)
+    try:
+        yield
+    finally:
+        if path:
+            export(path)
+        disable()
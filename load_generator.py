@@ -0,0 +1,173 @@
+"""
+analysis_service icin yuk uretici: es zamanli keep-alive baglantilar uzerinden istek karisimi
+gonderir; verim (istek/s) ve gecikme yuzdeliklerini (uc nokta bazinda) raporlar.
+
+Ilk tur (isinma) her URL'yi bir kez ister ve ayri raporlanir: onbellek bos iken (soguk)
+gecikme ile sonraki (onbellekten) gecikme ayri gorulur.
+
+Kullanim:
+    python load_generator.py --url http://127.0.0.1:8765 --concurrency 16 --duration 10
+    python load_generator.py --unix /tmp/co2.sock --requests 5000 --json
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+# Panonun (dashboard) tipik istek karisimi: (yol, agirlik)
+DEFAULT_MIX = [
+    ("/forecast", 4),
+    ("/forecast?country=China", 4),
+    ("/forecast?country=United%20States", 3),
+    ("/forecast?country=India", 3),
+    ("/forecast?country=Turkey", 2),
+    ("/correlation", 3),
+    ("/correlation?since=2000", 1),
+    ("/backtest", 1),
+    ("/globe?metric=co2", 1),
+    ("/globe?metric=co2_per_capita", 1),
+    ("/health", 1),
+]
+
+
+async def _open(host: str, port: int, unix: str | None):
+    if unix:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection(host, port)
+
+
+async def _request(reader, writer, host: str, path: str) -> tuple[int, int, str]:
+    """Tek GET istegi (keep-alive); (durum, govde boyutu, X-Cache) dondurur."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split(" ", 2)[1])
+    headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in head[1:] if line)}
+    length = int(headers.get("content-length", 0))
+    await reader.readexactly(length)
+    return status, length, headers.get("x-cache", "")
+
+
+def _summarize(samples: list[tuple[str, float, int, str]], elapsed: float | None = None) -> dict:
+    """(yol, gecikme s, durum, X-Cache) orneklerinden ozet: adet, hata, p50 / p90 / p99 / max (ms)."""
+
+    def stats(latencies: np.ndarray) -> dict:
+        ms = latencies * 1000
+        return {
+            "count": int(len(ms)),
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p90_ms": float(np.percentile(ms, 90)),
+            "p99_ms": float(np.percentile(ms, 99)),
+            "max_ms": float(ms.max()),
+        }
+
+    if not samples:
+        return {"count": 0}
+    paths = np.array([s[0] for s in samples], dtype=object)
+    latencies = np.array([s[1] for s in samples])
+    statuses = np.array([s[2] for s in samples])
+
+    summary = stats(latencies)
+    summary["errors"] = int((statuses >= 400).sum())
+    summary["cache"] = {c: sum(1 for s in samples if s[3] == c) for c in sorted({s[3] for s in samples})}
+    if elapsed is not None:
+        summary["seconds"] = elapsed
+        summary["requests_per_second"] = len(samples) / elapsed
+    summary["endpoints"] = {p: stats(latencies[paths == p]) for p in dict.fromkeys(paths)}
+    return summary
+
+
+async def run_load(
+    url: str = "http://127.0.0.1:8765",
+    unix: str | None = None,
+    mix=DEFAULT_MIX,
+    concurrency: int = 8,
+    duration: float | None = 10.0,
+    total: int | None = None,
+    seed: int = 0,
+) -> dict:
+    """
+    Yuk testini calistirir.
+
+    concurrency : es zamanli baglanti sayisi
+    duration    : test suresi (saniye); total verilirse toplam istek sayisi esas alinir
+
+    Donus: {"warmup": soguk istekler ozeti, "load": yuk ozeti}
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    paths = [p for p, _ in mix]
+    weights = np.array([w for _, w in mix], dtype=np.float64)
+    weights /= weights.sum()
+    rng = np.random.default_rng(seed)
+
+    # Isinma: her URL bir kez (soguk onbellek)
+    warmup = []
+    reader, writer = await _open(host, port, unix)
+    for path in paths:
+        t0 = time.perf_counter()
+        status, _, cache = await _request(reader, writer, host, path)
+        warmup.append((path, time.perf_counter() - t0, status, cache))
+    writer.close()
+
+    schedule = iter(rng.choice(len(paths), size=total, p=weights)) if total is not None else None
+    deadline = None if total is not None else time.perf_counter() + (duration or 10.0)
+    samples = []
+
+    def next_path() -> str | None:
+        if schedule is not None:
+            i = next(schedule, None)
+            return None if i is None else paths[i]
+        if time.perf_counter() >= deadline:
+            return None
+        return paths[rng.choice(len(paths), p=weights)]
+
+    async def worker():
+        reader, writer = await _open(host, port, unix)
+        try:
+            while (path := next_path()) is not None:
+                t0 = time.perf_counter()
+                status, _, cache = await _request(reader, writer, host, path)
+                samples.append((path, time.perf_counter() - t0, status, cache))
+        finally:
+            writer.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total or concurrency))))
+    elapsed = time.perf_counter() - t0
+    return {"warmup": _summarize(warmup), "load": _summarize(samples, elapsed)}
+
+
+def _print_report(result: dict, concurrency: int) -> None:
+    print("Soguk istekler (ilk cagri, onbellek bos):")
+    for path, s in result["warmup"]["endpoints"].items():
+        print(f"  {path:<36} {s['max_ms']:>10.1f} ms")
+
+    load = result["load"]
+    print(f"\nYuk: {load['count']} istek, {concurrency} baglanti, {load['seconds']:.1f}s -> {load['requests_per_second']:,.0f} istek/s")
+    print(f"Hatalar: {load['errors']}  X-Cache: {load['cache']}")
+    print(f"{'uc nokta':<36} {'adet':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  (ms)")
+    for path, s in load["endpoints"].items():
+        print(f"{path:<36} {s['count']:>7} {s['p50_ms']:>9.2f} {s['p90_ms']:>9.2f} {s['p99_ms']:>9.2f} {s['max_ms']:>9.2f}")
+    print(f"{'TOPLAM':<36} {load['count']:>7} {load['p50_ms']:>9.2f} {load['p90_ms']:>9.2f} {load['p99_ms']:>9.2f} {load['max_ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="load generator for analysis_service")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--unix", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="test duration in seconds")
+    parser.add_argument("--requests", type=int, default=None, help="total requests (overrides --duration)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load(args.url, args.unix, DEFAULT_MIX, args.concurrency, args.duration, args.requests))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_report(result, args.concurrency)
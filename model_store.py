@@ -0,0 +1,128 @@
+"""
+Fit edilmis modeller icin LRU onbellegi (istege bagli olarak diske kalici).
+
+Anahtar: (ulke, hedef sutun, derece, egitim penceresi, veri parmak izi, ...)
+Veri parmak izi, fit'e giren (yil, deger) ciftlerinin ozetidir; veri degismedikce ayni
+model tekrar fit edilmez. Boylece:
+- ayni calisma icinde (ornegin Bolum 11 ve 12'nin nufus modelleri) tekrar fit yapilmaz,
+- kalici dosya ile bir sonraki gece raporunda degismeyen ulkeler yeniden fit edilmez.
+
+Kullanim:
+    from model_store import MODEL_STORE
+    model = MODEL_STORE.get(key)
+    if model is None:
+        model = fit(...)
+        MODEL_STORE.put(key, model)
+"""
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_STORE_PATH = ".cache/models.pkl"
+
+
+def data_fingerprint(*arrays) -> str:
+    """Dizilerin icerik ozetini (dtype ve sekil dahil) dondurur."""
+    h = hashlib.blake2b(digest_size=16)
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr)
+        h.update(str(arr.dtype).encode())
+        h.update(str(arr.shape).encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+class ModelStore:
+    """
+    LRU tahliyeli, istege bagli diske kalici model onbellegi.
+    """
+
+    def __init__(self, max_entries: int = 8192, path: str | None = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._models: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def __contains__(self, key) -> bool:
+        return key in self._models
+
+    def keys(self) -> list:
+        return list(self._models)
+
+    def get(self, key):
+        """Modeli dondurur (yoksa None); bulunan anahtar en yeni olarak isaretlenir."""
+        model = self._models.get(key)
+        if model is None:
+            self.misses += 1
+            return None
+        self._models.move_to_end(key)
+        self.hits += 1
+        return model
+
+    def put(self, key, model) -> None:
+        self._models[key] = model
+        self._models.move_to_end(key)
+        while len(self._models) > self.max_entries:
+            self._models.popitem(last=False)
+
+    def get_or_fit(self, key, fit_fn):
+        """Onbellekte yoksa fit_fn() ile fit eder ve saklar."""
+        model = self.get(key)
+        if model is None:
+            model = fit_fn()
+            self.put(key, model)
+        return model
+
+    def update(self, models: dict) -> None:
+        """Baska bir onbellekten (ornegin worker process'lerinden) gelen modelleri ekler."""
+        for key, model in models.items():
+            self.put(key, model)
+
+    def export(self, exclude=()) -> dict:
+        """exclude icinde olmayan modelleri (LRU sirasiyla) dondurur."""
+        exclude = set(exclude)
+        return {key: model for key, model in self._models.items() if key not in exclude}
+
+    def clear(self) -> None:
+        self._models.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path: str | None = None) -> int:
+        """Kalici dosyadan modelleri yukler; yuklenen model sayisini dondurur."""
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "rb") as f:
+                models = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return 0
+        self.update(models)
+        return len(models)
+
+    def save(self, path: str | None = None) -> None:
+        """Modelleri (LRU sirasiyla) diske yazar."""
+        path = path or self.path
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(dict(self._models), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._models), "hits": self.hits, "misses": self.misses}
+
+
+# Script genelinde paylasilan varsayilan onbellek
+MODEL_STORE = ModelStore(path=DEFAULT_STORE_PATH)
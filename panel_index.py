@@ -0,0 +1,151 @@
+"""
+(country, year) paneli icin bir kez kurulan indeks: ulke ve yil dilimleri maske taramasi
+olmadan dogrudan ofsetlerden alinir.
+
+df[df["country"] == c] her cagrida tum satirlari tarar; ulke x yil donguleri icinde bu
+O(ulke x satir) maliyet demektir. PanelIndex veriyi bir kez (country, year) sirasina dizer
+ve her ulke icin [baslangic, bitis) ofsetlerini saklar; ayrica yil-ana sirada ikinci bir
+kopya tutarak yil dilimlerini de ardisik aralik olarak verir.
+
+- country(c) / year(y): ardisik iloc dilimleri (kopyasiz), maskeli filtre ile ayni satirlar,
+  ayni sira ve ayni indeks etiketleri
+- row(c, y) / values(countries, y, cols): ulke icinde searchsorted ile tekil hucre erisimi
+
+Kullanim:
+    panel = PanelIndex(df_eda)
+    china = panel.country("China", start=2000)
+    df_2024 = panel.year(2024)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class PanelIndex:
+    """
+    (group_col, time_col) sirasina dizilmis panel ve ulke / yil ofset tablolari.
+    """
+
+    def __init__(self, data: pd.DataFrame, group_col: str = "country", time_col: str = "year"):
+        self.group_col = group_col
+        self.time_col = time_col
+
+        if data[group_col].isna().any():
+            data = data[data[group_col].notna()]
+        keys = [group_col, time_col]
+        if not _is_sorted(data, keys):
+            data = data.sort_values(keys, kind="stable")
+        self.frame = data
+
+        groups = data[group_col].to_numpy()
+        self._times = data[time_col].to_numpy()
+        starts, self.countries = _run_starts(groups)
+        ends = np.append(starts[1:], len(data))
+        self._offsets = {c: (int(s), int(e)) for c, s, e in zip(self.countries, starts, ends)}
+        self._codes = np.repeat(np.arange(len(self.countries)), ends - starts)
+
+        # Yil-ana kopya: ayni yilin satirlari ardisik, yil icinde ulke sirasi korunur. Kopya ilk
+        # year() cagrisinda olusturulur; sadece ulke dilimleri kullanilirsa (ornegin diskten
+        # eslenmis panelde) frame kopyalanmaz.
+        order = np.argsort(self._times, kind="stable")
+        self._year_order = order
+        self._by_year = None
+        year_starts, self.years = _run_starts(self._times[order])
+        year_ends = np.append(year_starts[1:], len(data))
+        self._year_offsets = {y: (int(s), int(e)) for y, s, e in zip(self.years, year_starts, year_ends)}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, country) -> bool:
+        return country in self._offsets
+
+    def _span(self, country, start=None, end=None) -> tuple[int, int]:
+        lo, hi = self._offsets.get(country, (0, 0))
+        if start is not None or end is not None:
+            times = self._times[lo:hi]
+            a = lo + (np.searchsorted(times, start, side="left") if start is not None else 0)
+            b = lo + (np.searchsorted(times, end, side="right") if end is not None else hi - lo)
+            lo, hi = a, b
+        return lo, hi
+
+    def group_codes(self) -> np.ndarray:
+        """Her satirin ulke kodu (countries icindeki sira); frame koda gore siralidir."""
+        return self._codes
+
+    def bounds(self, country, start=None, end=None) -> tuple[int, int]:
+        """Ulke satirlarinin (istege bagli yil araligi) frame icindeki [baslangic, bitis) konumlari."""
+        return self._span(country, start, end)
+
+    def country(self, country, start=None, end=None) -> pd.DataFrame:
+        """Ulkenin satirlari (istege bagli olarak start <= yil <= end); bilinmeyen ulke -> bos."""
+        lo, hi = self._span(country, start, end)
+        return self.frame.iloc[lo:hi]
+
+    def country_values(self, country, col: str, start=None, end=None) -> np.ndarray:
+        """Ulkenin tek sutunu, numpy dizisi olarak."""
+        lo, hi = self._span(country, start, end)
+        return self.frame[col].to_numpy()[lo:hi]
+
+    def select(self, countries) -> pd.DataFrame:
+        """df[df[group_col].isin(countries)] karsiligi (panel sirasi korunur)."""
+        spans = sorted(self._offsets[c] for c in set(countries) if c in self._offsets)
+        if not spans:
+            return self.frame.iloc[0:0]
+        positions = np.concatenate([np.arange(lo, hi) for lo, hi in spans])
+        return self.frame.take(positions)
+
+    def year(self, year) -> pd.DataFrame:
+        """df[df[time_col] == year] karsiligi."""
+        lo, hi = self._year_offsets.get(year, (0, 0))
+        if self._by_year is None:
+            self._by_year = self.frame.take(self._year_order)
+        return self._by_year.iloc[lo:hi]
+
+    def row_position(self, country, year) -> int:
+        """(ulke, yil) satirinin frame icindeki konumu; yoksa -1."""
+        lo, hi = self._offsets.get(country, (0, 0))
+        i = lo + int(np.searchsorted(self._times[lo:hi], year))
+        return i if i < hi and self._times[i] == year else -1
+
+    def row(self, country, year) -> pd.Series | None:
+        """(ulke, yil) satiri; yoksa None."""
+        i = self.row_position(country, year)
+        return None if i < 0 else self.frame.iloc[i]
+
+    def values(self, countries, year, cols: list[str], fill=np.nan) -> np.ndarray:
+        """
+        (len(countries), len(cols)) deger tablosu; satiri olmayan ulkeler fill ile doldurulur.
+        """
+        positions = np.array([self.row_position(c, year) for c in countries], dtype=np.intp)
+        out = np.full((len(positions), len(cols)), fill, dtype=np.float64)
+        found = positions >= 0
+        out[found] = self.frame[cols].take(positions[found]).to_numpy(dtype=np.float64, na_value=np.nan)
+        return out
+
+
+def _is_sorted(data: pd.DataFrame, keys: list[str]) -> bool:
+    index = pd.MultiIndex.from_frame(data[keys])
+    return index.is_monotonic_increasing
+
+
+def _run_starts(values: np.ndarray) -> tuple[np.ndarray, list]:
+    """Sirali dizide her ardisik grubun baslangic konumu ve grup degerleri."""
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.intp), []
+    is_start = np.ones(len(values), dtype=bool)
+    is_start[1:] = values[1:] != values[:-1]
+    starts = np.flatnonzero(is_start)
+    return starts, list(values[starts])
+
+
+def as_panel(data) -> PanelIndex:
+    """
+    PanelIndex'i oldugu gibi dondurur; StoredPanel ise eslenmis panelin indeksini, DataFrame
+    ise indeksler.
+    """
+    from panel_store import StoredPanel
+
+    if isinstance(data, StoredPanel):
+        return data.panel()
+    return data if isinstance(data, PanelIndex) else PanelIndex(data)
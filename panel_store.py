@@ -0,0 +1,199 @@
+"""
+Diskte bellek eslemeli (memory-mapped) panel deposu: doldurulmus panel bir kez yazilir,
+process'ler salt-okunur ve kopyasiz olarak baglanir.
+
+Paralel rapor / tahmin isleri her process'te CSV'yi yeniden yukleyip dolduruyor ya da
+pickle edilmis DataFrame aliyordu. Burada panel icerik anahtarli bir dizine yazilir:
+
+- her sutun ayri bir .npy dosyasidir; sayisal sutunlar np.load(mmap_mode="r") ile eslenir
+  ve DataFrame bloklari bu dizileri kopyalamadan kullanir (sayfalar isletim sisteminin sayfa
+  onbelleginden tum process'lerce paylasilir, worker basina anonim bellek buyumez)
+- metin / kategorik sutunlar sozluk kodludur (kodlar .npy + kategoriler); object sutun
+  istenirse process basina yalnizca gosterici dizisi olusur
+- index.json yan dosyasi: satir sayisi, sutunlar ve dtype'lar, ulkeler ve her ulkenin
+  [baslangic, bitis) satir ofsetleri, yil araligi. Satirlar (group, time) sirasindadir.
+- yazim gecici dizine yapilir ve atomik olarak yerine tasinir; ayni anahtar ikinci kez
+  yazilmaz (es zamanli yazarlardan ilki kazanir)
+
+StoredPanel tutamaci pickle edildiginde sadece dizin yolu gider; frame() / panel() her
+process'te ilk cagride eslenir ve saklanir. PanelIndex bekleyen fonksiyonlar (as_panel)
+tutamaci dogrudan kabul eder.
+
+    store = PanelStore()
+    stored = store.get(key) or store.put(key, df_eda)
+    panel = stored.panel()               # PanelIndex, frame disktekine eslenmis
+
+Worker sayisina gore baslatma suresi ve worker basina bellek (pickle edilmis DataFrame /
+eslenmis panel):
+    python benchmarks.py --micro panel_store [--data owid-co2-data.csv]
+"""
+
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from panel_index import PanelIndex
+
+DEFAULT_STORE_DIR = ".cache/panels"
+INDEX_NAME = "index.json"
+
+# Process basina eslenmis paneller: dizin yolu -> (frame, PanelIndex | None)
+_ATTACHED: dict = {}
+
+
+def write_panel(data: pd.DataFrame, path: str, group_col: str = "country", time_col: str = "year") -> bool:
+    """
+    Paneli path dizinine yazar; path zaten varsa dokunmaz. Satir indeksi sayisal olmalidir.
+    Donus: bu cagri yazdiysa True.
+    """
+    if os.path.exists(os.path.join(path, INDEX_NAME)):
+        return False
+    if not pd.api.types.is_numeric_dtype(data.index.dtype):
+        raise ValueError(f"Sayisal olmayan satir indeksi desteklenmiyor: {data.index.dtype}")
+    panel = PanelIndex(data, group_col, time_col)
+    frame = panel.frame
+
+    tmp_path = path + f".tmp-{os.getpid()}"
+    os.makedirs(tmp_path, exist_ok=True)
+    columns = []
+    for i, col in enumerate(frame.columns):
+        series = frame[col]
+        entry = {"name": col, "file": str(i), "dtype": str(series.dtype)}
+        if pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype):
+            entry["kind"] = "numeric"
+            np.save(os.path.join(tmp_path, f"{i}.npy"), series.to_numpy())
+        else:
+            entry["kind"] = "category"
+            if isinstance(series.dtype, pd.CategoricalDtype):  # kategoriler (kullanilmayanlar dahil) korunur
+                codes, categories = series.cat.codes.to_numpy(), series.cat.categories
+            else:
+                codes, categories = pd.factorize(series, sort=True)
+            np.save(os.path.join(tmp_path, f"{i}.codes.npy"), codes.astype(np.int32))
+            np.save(os.path.join(tmp_path, f"{i}.categories.npy"), np.asarray(categories, dtype=str))
+        columns.append(entry)
+    np.save(os.path.join(tmp_path, "rowindex.npy"), frame.index.to_numpy())
+
+    starts = [panel.bounds(c)[0] for c in panel.countries]
+    ends = [panel.bounds(c)[1] for c in panel.countries]
+    index = {
+        "n_rows": len(frame),
+        "group_col": group_col,
+        "time_col": time_col,
+        "columns": columns,
+        "groups": [str(c) for c in panel.countries],
+        "offsets": [[int(s), int(e)] for s, e in zip(starts, ends)],
+        "years": [int(panel.years[0]), int(panel.years[-1])] if len(panel.years) else None,
+        "created": time.time(),
+    }
+    with open(os.path.join(tmp_path, INDEX_NAME), "w") as f:
+        json.dump(index, f)
+
+    try:
+        os.replace(tmp_path, path)
+    except OSError:  # baska bir process ayni anahtari once yazdi
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        return False
+    return True
+
+
+def read_index(path: str) -> dict:
+    """Panelin index.json yan dosyasi."""
+    with open(os.path.join(path, INDEX_NAME)) as f:
+        return json.load(f)
+
+
+def _attach_column(path: str, entry: dict) -> np.ndarray | pd.Categorical:
+    base = os.path.join(path, entry["file"])
+    if entry["kind"] == "numeric":
+        return np.load(base + ".npy", mmap_mode="r")
+    codes = np.load(base + ".codes.npy", mmap_mode="r")
+    categories = np.load(base + ".categories.npy")
+    if entry["dtype"] == "category":
+        return pd.Categorical.from_codes(codes, categories=categories)
+    values = categories.astype(object)[codes]
+    values[np.asarray(codes) < 0] = np.nan
+    return values
+
+
+def attach(path: str) -> pd.DataFrame:
+    """
+    Paneli salt-okunur baglar: sayisal sutunlar disktekine eslenmis dizilerdir (kopyasiz).
+    Ayni process'te tekrar cagrilar ayni DataFrame'i dondurur. Sutunlarin yerinde
+    degistirilmesi ValueError verir; yeni sutun eklemek serbesttir.
+    """
+    path = os.path.abspath(path)
+    if path not in _ATTACHED:
+        index = read_index(path)
+        columns = {entry["name"]: _attach_column(path, entry) for entry in index["columns"]}
+        row_index = pd.Index(np.load(os.path.join(path, "rowindex.npy"), mmap_mode="r"))
+        frame = pd.DataFrame(columns, index=row_index, copy=False)
+        _ATTACHED[path] = (frame, None)
+    return _ATTACHED[path][0]
+
+
+def attach_panel(path: str) -> PanelIndex:
+    """Eslenmis panelin PanelIndex'i (frame kopyalanmaz); process basina bir kez kurulur."""
+    path = os.path.abspath(path)
+    frame = attach(path)
+    if _ATTACHED[path][1] is None:
+        index = read_index(path)
+        _ATTACHED[path] = (frame, PanelIndex(frame, index["group_col"], index["time_col"]))
+    return _ATTACHED[path][1]
+
+
+class StoredPanel:
+    """
+    Diskteki panelin tutamaci. Pickle'da sadece yol tasinir; frame() / panel() her
+    process'te ilk cagride eslenir.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+
+    def __reduce__(self):
+        return (StoredPanel, (self.path,))
+
+    def __repr__(self) -> str:
+        return f"StoredPanel({self.path!r})"
+
+    @property
+    def index(self) -> dict:
+        return read_index(self.path)
+
+    def frame(self) -> pd.DataFrame:
+        return attach(self.path)
+
+    def panel(self) -> PanelIndex:
+        return attach_panel(self.path)
+
+    def nbytes(self) -> int:
+        """Dizindeki dosyalarin toplam boyutu."""
+        return sum(entry.stat().st_size for entry in os.scandir(self.path) if entry.is_file())
+
+
+class PanelStore:
+    """
+    Icerik anahtarli panel dizinleri (root/<anahtar>). Anahtari cagiran belirler (ornegin
+    artifact_cache.artifact_key ile kod surumu + girdi ozeti).
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def get(self, key: str) -> StoredPanel | None:
+        """Anahtarin paneli yazilmissa tutamaci, yoksa None."""
+        path = self.path(key)
+        return StoredPanel(path) if os.path.exists(os.path.join(path, INDEX_NAME)) else None
+
+    def put(self, key: str, data: pd.DataFrame, group_col: str = "country", time_col: str = "year") -> StoredPanel:
+        """Paneli (yoksa) yazar ve tutamacini dondurur."""
+        os.makedirs(self.root, exist_ok=True)
+        write_panel(data, self.path(key), group_col, time_col)
+        return StoredPanel(self.path(key))
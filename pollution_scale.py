@@ -0,0 +1,139 @@
+"""
+CO2 degerleri icin vektorel kirlilik olcegi: renk, unlem isareti (glyph) ve marker boyutu.
+
+Tum gorsellestirmeler ayni esleme tablosunu kullanir; degerler NumPy dizisi olarak verilir
+ve tek cagrida butun noktalar icin renk / glyph / boyut dizileri dondurulur.
+
+Renk gecisi (normalize deger n = (co2 - vmin) / (vmax - vmin), [0, 1] araligina kirpilir):
+- n < 0.25 : Yesil -> Sari-yesil
+- n < 0.50 : Sari
+- n < 0.75 : Sari -> Turuncu
+- diger    : Turuncu -> Kirmizi
+- co2 <= 0 : veri yok (yesil)
+
+vmin / vmax verilmezse veriden (pozitif degerlerin min / max'i) hesaplanir.
+
+Kullanim:
+    style = pollution_style(co2_values)
+    style["colors"], style["glyphs"], style["sizes"]
+"""
+
+import numpy as np
+
+DEFAULT_RANGE = (100.0, 12000.0)
+NO_DATA_COLOR = "rgb(100, 200, 100)"
+
+# Unlem isaretleri: esikleri asan her kademe bir "!" ekler (Mt CO2)
+GLYPH_THRESHOLDS = (4000.0, 8000.0)
+GLYPHS = ("!", "!!", "!!!")
+
+# Marker boyutu: co2 / SIZE_DIVISOR, SIZE_RANGE araligina kirpilir; veri yoksa en kucuk boyut
+SIZE_DIVISOR = 150.0
+SIZE_RANGE = (20.0, 60.0)
+
+LUT_SIZE = 256
+
+
+def data_range(co2_values, default=DEFAULT_RANGE) -> tuple[float, float]:
+    """
+    Veriye dayali renk araligi: pozitif ve sonlu degerlerin min / max'i.
+    Uygun deger yoksa (veya tek bir deger varsa) default dondurulur.
+    """
+    values = np.asarray(co2_values, dtype=np.float64)
+    values = values[np.isfinite(values) & (values > 0)]
+    if values.size == 0:
+        return default
+    vmin, vmax = float(values.min()), float(values.max())
+    if vmax <= vmin:
+        return default
+    return vmin, vmax
+
+
+def normalize(co2_values, vmin: float, vmax: float) -> np.ndarray:
+    """[0, 1] araligina kirpilmis normalize degerler (NaN -> 0)."""
+    values = np.asarray(co2_values, dtype=np.float64)
+    return np.nan_to_num(np.clip((values - vmin) / (vmax - vmin), 0, 1), nan=0.0)
+
+
+def _rgb_components(normalized: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Normalize degerlerden (r, g, b) tamsayi dizileri (renk gecisi, bkz. modul aciklamasi)."""
+    r = np.full(normalized.shape, 255, dtype=np.int64)
+    g = np.full(normalized.shape, 255, dtype=np.int64)
+    b = np.zeros(normalized.shape, dtype=np.int64)
+
+    # Yesil -> Sari-yesil
+    low = normalized < 0.25
+    r[low] = (100 + normalized[low] * 4 * 155).astype(np.int64)
+    g[low] = (200 + normalized[low] * 4 * 55).astype(np.int64)
+    b[low] = (100 - normalized[low] * 4 * 100).astype(np.int64)
+    # Sari -> Turuncu
+    mid = (normalized >= 0.5) & (normalized < 0.75)
+    g[mid] = (255 - (normalized[mid] - 0.5) * 4 * 130).astype(np.int64)
+    # Turuncu -> Kirmizi
+    high = normalized >= 0.75
+    g[high] = (125 - (normalized[high] - 0.75) * 4 * 125).astype(np.int64)
+    return r, g, b
+
+
+def _format_rgb(codes: np.ndarray) -> np.ndarray:
+    """Paketlenmis (r << 16 | g << 8 | b) kodlardan "rgb(r, g, b)" metinleri; her farkli renk bir kez."""
+    unique, inverse = np.unique(codes, return_inverse=True)
+    labels = np.array([f"rgb({c >> 16}, {(c >> 8) & 255}, {c & 255})" for c in unique], dtype=object)
+    return labels[inverse].reshape(codes.shape)
+
+
+def _build_lut(size: int = LUT_SIZE) -> np.ndarray:
+    r, g, b = _rgb_components(np.linspace(0.0, 1.0, size))
+    return _format_rgb((r << 16) | (g << 8) | b)
+
+
+# Onceden hesaplanmis renk tablosu: normalize deger LUT_SIZE kademeye yuvarlanarak indekslenir
+COLOR_LUT = _build_lut()
+
+
+def pollution_colors(co2_values, vmin: float | None = None, vmax: float | None = None, lut: bool = False) -> np.ndarray:
+    """
+    CO2 degerlerine gore "rgb(r, g, b)" renk dizisi (object, girdiyle ayni sekil).
+
+    vmin, vmax : renk araligi (None -> data_range)
+    lut        : True ise renkler COLOR_LUT'tan (256 kademe) okunur; False ise birebir gecis
+    """
+    values = np.asarray(co2_values, dtype=np.float64)
+    if vmin is None or vmax is None:
+        vmin, vmax = data_range(values)
+    normalized = normalize(values, vmin, vmax)
+    no_data = values <= 0
+
+    if lut:
+        colors = COLOR_LUT[np.rint(normalized * (LUT_SIZE - 1)).astype(np.intp)]
+    else:
+        r, g, b = _rgb_components(normalized)
+        colors = _format_rgb((r << 16) | (g << 8) | b)
+    colors[no_data] = NO_DATA_COLOR
+    return colors
+
+
+def pollution_glyphs(co2_values, thresholds=GLYPH_THRESHOLDS) -> np.ndarray:
+    """Unlem isaretleri: "!" (dusuk), "!!" (orta), "!!!" (yuksek)."""
+    values = np.asarray(co2_values, dtype=np.float64)
+    level = (values[..., None] > np.asarray(thresholds)).sum(axis=-1)
+    return np.asarray(GLYPHS, dtype=object)[level]
+
+
+def marker_sizes(co2_values, divisor: float = SIZE_DIVISOR, size_range=SIZE_RANGE) -> np.ndarray:
+    """Marker boyutu: clip(co2 / divisor, *size_range); veri yoksa (co2 <= 0) en kucuk boyut."""
+    values = np.asarray(co2_values, dtype=np.float64)
+    return np.where(values > 0, np.clip(values / divisor, *size_range), size_range[0])
+
+
+def pollution_style(co2_values, vmin: float | None = None, vmax: float | None = None, lut: bool = False) -> dict:
+    """Renk, glyph ve boyut dizilerini tek cagrida dondurur."""
+    values = np.asarray(co2_values, dtype=np.float64)
+    if vmin is None or vmax is None:
+        vmin, vmax = data_range(values)
+    return {
+        "colors": pollution_colors(values, vmin, vmax, lut=lut),
+        "glyphs": pollution_glyphs(values),
+        "sizes": marker_sizes(values),
+        "range": (vmin, vmax),
+    }
@@ -0,0 +1,161 @@
+"""
+Buyume endeksleri ve azaltim senaryolari: tum ulkeler icin tek vektorel geciste.
+
+Rapor bolumleri her ulke icin paneli ayri ayri dilimleyip taban yili degerini, son gecerli
+degeri ve gereken yillik azaltim oranini tek tek hesapliyordu. Burada ulke kodlari
+(PanelIndex.group_codes) uzerinden grup baslangiclari bir kez bulunur; taban degerleri,
+endeksler ve (hedef yil x azaltim orani) izgarasi numpy yayinlama (broadcast) ile hesaplanir.
+Sonuclar duzenli (tidy) tablolar olarak doner, grafikler dogrudan bunlardan beslenir.
+
+    indices = growth_indices(df_eda, start=2004, end=2024)
+    table = reduction_scenarios(df_eda, target_years=(2040, 2050), reductions=(0.5, 0.9))
+"""
+
+import numpy as np
+import pandas as pd
+
+from panel_index import as_panel
+
+
+def _selected_rows(panel, keep: np.ndarray, countries) -> np.ndarray:
+    """
+    keep maskesindeki satir konumlari; countries verilirse sadece bu ulkeler, verilen sirada
+    (bilinmeyen ulkeler atlanir). Ayni ulkenin satirlari ardisik ve yil sirasindadir.
+    """
+    codes = panel.group_codes()
+    if countries is None:
+        return np.flatnonzero(keep)
+    code_of = {c: i for i, c in enumerate(panel.countries)}
+    rank = np.full(len(panel.countries), -1, dtype=np.intp)
+    for r, country in enumerate(dict.fromkeys(countries)):
+        if country in code_of:
+            rank[code_of[country]] = r
+    row_rank = rank[codes] if len(codes) else np.zeros(0, dtype=np.intp)
+    positions = np.flatnonzero(keep & (row_rank >= 0))
+    return positions[np.argsort(row_rank[positions], kind="stable")]
+
+
+def _group_bounds(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Ardisik kod dizisinde her grubun baslangic konumu ve uzunlugu."""
+    if len(codes) == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    is_start = np.ones(len(codes), dtype=bool)
+    is_start[1:] = codes[1:] != codes[:-1]
+    starts = np.flatnonzero(is_start)
+    return starts, np.diff(np.append(starts, len(codes)))
+
+
+def growth_indices(data, cols=("population", "co2"), start: int = 2004, end: int = 2024, countries=None) -> pd.DataFrame:
+    """
+    start <= yil <= end penceresinde her ulke icin taban yili (pencerenin ilk satiri) = 100
+    endeksleri.
+
+    data      : DataFrame veya PanelIndex
+    countries : None -> tum ulkeler; verilirse bu ulkeler bu sirada
+
+    Donus: country, year, <cols>, <col>_index ve base_valid (tum taban degerleri > 0) sutunlu
+    tablo; satirlar panelin indeks etiketlerini korur.
+    """
+    panel = as_panel(data)
+    cols = list(cols)
+    frame = panel.frame
+    times = frame[panel.time_col].to_numpy()
+    positions = _selected_rows(panel, (times >= start) & (times <= end), countries)
+
+    out = frame[[panel.group_col, panel.time_col] + cols].take(positions)
+    starts, lengths = _group_bounds(panel.group_codes()[positions])
+    base_valid = np.ones(len(starts), dtype=bool)
+    for col in cols:
+        values = out[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        base = values[starts]
+        out[f"{col}_index"] = (values / np.repeat(base, lengths)) * 100
+        base_valid &= base > 0
+    out["base_valid"] = np.repeat(base_valid, lengths)
+    return out
+
+
+def latest_values(data, col: str = "co2", year: int = 2024, countries=None) -> pd.DataFrame:
+    """
+    Her ulkenin year yilindaki degeri; o yilin satiri yoksa en son gecerli (NaN olmayan) degeri.
+    Satir varsa deger NaN olsa bile o satir kullanilir.
+
+    Donus: country, value, base_year, source ("year" | "last_valid") sutunlu tablo; hicbir
+    degeri olmayan ulkeler tabloda yer almaz.
+    """
+    panel = as_panel(data)
+    frame = panel.frame
+    times = frame[panel.time_col].to_numpy()
+    values = frame[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    codes = panel.group_codes()
+    n = len(panel.countries)
+
+    # Her ulke icin: year satiri (varsa) ve son gecerli satir; -1 = yok
+    exact = np.full(n, -1, dtype=np.intp)
+    hit = np.flatnonzero(times == year)
+    exact[codes[hit]] = hit
+    last_valid = np.full(n, -1, dtype=np.intp)
+    valid = np.flatnonzero(~np.isnan(values))
+    last_valid[codes[valid]] = valid  # ardisik atamada son yazilan (en son yil) kalir
+
+    chosen = np.where(exact >= 0, exact, last_valid)
+    source = np.where(exact >= 0, "year", "last_valid")
+    if countries is None:
+        order = np.arange(n)
+    else:
+        code_of = {c: i for i, c in enumerate(panel.countries)}
+        order = np.array([code_of[c] for c in dict.fromkeys(countries) if c in code_of], dtype=np.intp)
+    order = order[chosen[order] >= 0]
+    rows = chosen[order]
+    return pd.DataFrame(
+        {
+            "country": [panel.countries[i] for i in order],
+            "value": values[rows],
+            "base_year": times[rows],
+            "source": source[order],
+        }
+    )
+
+
+def reduction_scenarios(
+    data,
+    target_years=(2050,),
+    reductions=(0.5,),
+    current_year: int = 2024,
+    col: str = "co2",
+    countries=None,
+) -> pd.DataFrame:
+    """
+    Her ulke x hedef yil x azaltim orani icin gereken sabit yillik azaltim yuzdesi:
+    (1 - (hedef / mevcut) ** (1 / kalan yil)) * 100, mevcut = latest_values(current_year).
+
+    reductions : hedefe kadar toplam azaltim orani (0.5 -> emisyon yariya iner)
+
+    Donus: country, base_year, current, target_year, reduction, target_value, years_remaining,
+    annual_reduction_pct sutunlu tablo (ulke, hedef yil, oran sirasinda). Hedef yil
+    current_year'dan buyuk degilse oran NaN'dir.
+    """
+    latest = latest_values(data, col, current_year, countries)
+    current = latest["value"].to_numpy()[:, None, None]
+    targets = np.asarray(target_years, dtype=np.int64)
+    fractions = np.asarray(reductions, dtype=np.float64)
+
+    years_remaining = np.broadcast_to((targets - current_year)[None, :, None], (len(latest), len(targets), len(fractions)))
+    target_value = current * (1 - fractions)[None, None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exponent = np.where(years_remaining > 0, 1 / np.where(years_remaining > 0, years_remaining, 1), np.nan)
+        rate = (1 - (target_value / current) ** exponent) * 100
+
+    shape = rate.shape
+    country_idx, target_idx, fraction_idx = np.indices(shape).reshape(3, -1)
+    return pd.DataFrame(
+        {
+            "country": latest["country"].to_numpy()[country_idx],
+            "base_year": latest["base_year"].to_numpy()[country_idx],
+            "current": current.ravel()[country_idx],
+            "target_year": targets[target_idx],
+            "reduction": fractions[fraction_idx],
+            "target_value": np.broadcast_to(target_value, shape).ravel(),
+            "years_remaining": years_remaining.ravel(),
+            "annual_reduction_pct": rate.ravel(),
+        }
+    )
@@ -0,0 +1,64 @@
+"""
+Dosya adi Python modul adi olamayan betikleri (co2-data.py, "3D görselleştirme.py") modul
+olarak import etme.
+
+import_script modulu sys.modules'e kaydeder; boylece fonksiyonlari pickle ile process
+pool'lara gonderilebilir ve ikinci import ayni modulu dondurur. Betikler import edildiginde
+veri okumaz / dosya yazmaz; agir kutuphaneler (matplotlib, seaborn, sklearn, plotly) sadece
+kullanan fonksiyon cagrildiginda yuklenir.
+
+Kullanim:
+    report = import_script("co2-data.py")
+    report.run_report(report.load(columns=report.REPORT_COLUMNS), sections=["correlation"])
+
+    python benchmarks.py --micro imports --repeat 5      # import suresi (taze process'lerde)
+"""
+
+import importlib.util
+import os
+import sys
+
+# Modul adi -> betik dosyasi (bu dizine gore)
+SCRIPTS = {
+    "co2_data": "co2-data.py",
+    "globe_3d": "3D görselleştirme.py",
+    "gorsellestirme": "gorsellestirme.py",
+}
+
+# Import sirasinda yuklenmemesi gereken kutuphaneler
+HEAVY_MODULES = ("matplotlib", "seaborn", "sklearn", "plotly")
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _module_name(filename: str) -> str:
+    for name, script in SCRIPTS.items():
+        if script == filename:
+            return name
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return "".join(c if c.isalnum() else "_" for c in stem.lower())
+
+
+def import_script(filename: str, module_name: str | None = None):
+    """
+    Betigi (bu dizine gore yol veya mutlak yol) modul olarak import eder; daha once import
+    edildiyse sys.modules'teki modulu dondurur.
+    """
+    module_name = module_name or _module_name(filename)
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    path = filename if os.path.isabs(filename) else os.path.join(_HERE, filename)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None:
+        raise ImportError(f"Betik bulunamadi: {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    if _HERE not in sys.path:
+        sys.path.insert(0, _HERE)
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
@@ -0,0 +1,179 @@
+"""
+Bagimliliklari bildirilmis gorevler icin basit zamanlayici (process pool uzerinde).
+
+Her gorev bir sozluktur:
+    {"func": f, "inputs": [...], "outputs": [...], "local": False}
+
+- inputs / outputs: kaynak adlari (ornegin "df_eda") veya cikti dosyalari
+  (ornegin "img/global_co2_trend.png"). Bir gorev, girdilerinden birini cikti olarak
+  bildiren gorevlere baglidir.
+- local=True gorevler ana process'te calisir ve dondurdukleri sozluk (kaynak adi -> deger)
+  baglama (context) eklenir; veri hazirlama adimlari icindir. Diger gorevler worker'larda
+  calisir ve sadece dosya / stdout uretir.
+- Worker gorevlerinin stdout'u yakalanir ve kayit sirasina gore yazdirilir; boylece
+  paralel calismada da rapor metni seri calismayla aynidir.
+- Her gorev "task:<ad>" adli bir stage span'i icinde calisir (bkz. instrumentation; kayit
+  kapaliyken maliyeti yoktur).
+
+Kullanim:
+    run_tasks(TASKS, context, selected=["correlation"], max_workers=4)
+"""
+
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from instrumentation import span
+
+# Worker basina paylasilan durum (gorevler, baglam, kancalar)
+_WORKER_STATE: dict = {}
+
+
+def _producers(tasks: dict) -> dict:
+    """cikti/kaynak adi -> onu ureten gorev."""
+    producers = {}
+    for name, task in tasks.items():
+        for output in task.get("outputs", []):
+            producers[output] = name
+    return producers
+
+
+def dependencies(tasks: dict, available=()) -> dict:
+    """
+    Her gorevin bagli oldugu gorevler. available icindeki kaynaklar (baglamda hazir olanlar)
+    bagimlilik dogurmaz.
+    """
+    producers = _producers(tasks)
+    available = set(available)
+    return {
+        name: sorted({producers[i] for i in task.get("inputs", []) if i in producers and i not in available} - {name})
+        for name, task in tasks.items()
+    }
+
+
+def resolve(tasks: dict, selected=None, available=()) -> list[str]:
+    """
+    Secilen gorevleri bagimliliklariyla birlikte, kayit sirasinda (topolojik olarak gecerli)
+    dondurur. selected None ise tum gorevler.
+    """
+    unknown = [name for name in (selected or []) if name not in tasks]
+    if unknown:
+        raise ValueError(f"Bilinmeyen gorev(ler): {unknown} (mevcut: {list(tasks)})")
+
+    deps = dependencies(tasks, available)
+    needed, stack = set(), list(tasks if selected is None else selected)
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack.extend(deps[name])
+
+    order, done = [], set()
+    pending = [name for name in tasks if name in needed]
+    while pending:
+        ready = [name for name in pending if all(d in done for d in deps[name])]
+        if not ready:
+            raise ValueError(f"Dongusel bagimlilik: {pending}")
+        order.extend(ready)
+        done.update(ready)
+        pending = [name for name in pending if name not in done]
+    return order
+
+
+def _init_worker(tasks: dict, context: dict, worker_init, worker_finish) -> None:
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(tasks=tasks, context=context, finish=worker_finish)
+    if worker_init is not None:
+        worker_init()
+
+
+def _execute(name: str) -> tuple[str, str, float, object]:
+    """Gorevi calistirir; (ad, yakalanan stdout, sure, worker_finish sonucu) dondurur."""
+    task = _WORKER_STATE["tasks"][name]
+    buffer = io.StringIO()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(buffer), span(f"task:{name}", kind="stage"):
+        task["func"](_WORKER_STATE["context"])
+    elapsed = time.perf_counter() - t0
+    finish = _WORKER_STATE["finish"]
+    return name, buffer.getvalue(), elapsed, finish() if finish is not None else None
+
+
+def run_tasks(
+    tasks: dict,
+    context: dict,
+    selected=None,
+    max_workers: int | None = None,
+    worker_init=None,
+    worker_finish=None,
+    on_result=None,
+) -> dict:
+    """
+    Secilen gorevleri (ve bagimliliklarini) calistirir.
+
+    context       : gorevlere verilen baglam; local gorevlerin urettigi kaynaklar eklenir
+    max_workers   : worker sayisi (None -> CPU sayisi, 1 -> pool olmadan ayni process'te)
+    worker_init   : her worker'da bir kez cagrilir (ornegin matplotlib backend secimi)
+    worker_finish : her gorevden sonra worker'da cagrilir; sonucu on_result'a iletilir
+    on_result     : ana process'te on_result(ad, worker_finish sonucu) olarak cagrilir
+
+    Donus: gorev adi -> sure (saniye)
+    """
+    order = resolve(tasks, selected, available=context)
+    deps = dependencies(tasks, available=context)
+    timings: dict = {}
+    done: set = set()
+
+    # 1) Veri hazirlama (local) gorevleri ana process'te, sirayla
+    for name in order:
+        if tasks[name].get("local"):
+            t0 = time.perf_counter()
+            with span(f"task:{name}", kind="stage"):
+                context.update(tasks[name]["func"](context) or {})
+            timings[name] = time.perf_counter() - t0
+            done.add(name)
+
+    remote = [name for name in order if not tasks[name].get("local")]
+    if not remote:
+        return timings
+
+    # Stdout kayit sirasina gore yazdirilir: bir gorevin ciktisi, kendinden onceki tum
+    # gorevler bittiginde yazilir.
+    finished: dict = {}
+    next_print = 0
+
+    def flush():
+        nonlocal next_print
+        while next_print < len(remote) and remote[next_print] in finished:
+            print(finished.pop(remote[next_print]), end="")
+            next_print += 1
+
+    def record(result):
+        name, stdout, elapsed, payload = result
+        timings[name] = elapsed
+        finished[name] = stdout
+        done.add(name)
+        if on_result is not None:
+            on_result(name, payload)
+        flush()
+
+    if max_workers == 1:
+        _init_worker(tasks, context, worker_init, worker_finish)
+        for name in remote:
+            record(_execute(name))
+        return timings
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(remote))
+    initargs = (tasks, context, worker_init, worker_finish)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=initargs) as pool:
+        waiting, running = list(remote), set()
+        while waiting or running:
+            for name in [n for n in waiting if all(d in done for d in deps[n])]:
+                waiting.remove(name)
+                running.add(pool.submit(_execute, name))
+            completed, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in completed:
+                record(future.result())
+    return timings